@@ -1,4 +1,5 @@
 import sys
+import threading
 import uvicorn
 import logging
 from fastapi import FastAPI
@@ -37,7 +38,9 @@ def create_app() -> FastAPI:
         task_repo.add_from_dict(task)
 
     # 5) Create task executor
-    task_executor = TaskExecutor(task_repo, result_repo, di_container)
+    task_executor = TaskExecutor(task_repo, result_repo, di_container,
+                                 result_cache=di_container.get_result_cache(),
+                                 resource_accountant=di_container.get_resource_accountant())
 
     # 6) Create scheduler
     sched_conf = config.get("scheduler", {})
@@ -54,7 +57,14 @@ def create_app() -> FastAPI:
         poll_interval=sched_conf.get("poll_interval", 30),
         max_concurrent_jobs=sched_conf.get("concurrency", 5),
         coalesce=sched_conf.get("coalesce", False),
-        max_instances=sched_conf.get("max_instances", 5)
+        max_instances=sched_conf.get("max_instances", 5),
+        retry_max_delay=sched_conf.get("retry_max_delay", 3600),
+        retry_budget_ratio=sched_conf.get("retry_budget_ratio", 0.2),
+        retry_budget_min=sched_conf.get("retry_budget_min", 10),
+        circuit_breakers=di_container.get_circuit_breaker_registry(),
+        spread_enabled=sched_conf.get("spread", {}).get("enabled", False),
+        spread_window_seconds=sched_conf.get("spread", {}).get("window_seconds", 300),
+        state_store=di_container.get_scheduler_state_store()
     )
 
     @app.on_event("startup")
@@ -63,11 +73,16 @@ def create_app() -> FastAPI:
         # logging.info("Seeding demo data and starting scheduler.")
         scheduler_service.start()
         # No need to start the result_reporting_service separately as it's now handled by the scheduler service
+        if config.get("jira_field_cache", {}).get("warm_on_startup", False):
+            # Load the Jira field catalogue in the background so startup does not wait on Jira
+            threading.Thread(target=di_container.get_jira_service().warm_field_cache,
+                             name="JiraFieldCacheWarmup", daemon=True).start()
 
     @app.on_event("shutdown")
     async def on_shutdown():
         logging.info("Shutting down scheduler.")
         scheduler_service.shutdown()
+        di_container.get_result_outbox().shutdown()
 
     @app.get("/tasks", response_model=TaskListResponse)
     def list_tasks():
@@ -104,6 +119,74 @@ def create_app() -> FastAPI:
             data=tasks
         )
 
+    @app.get("/metrics/circuit_breakers")
+    def get_circuit_breaker_metrics():
+        """
+        Return circuit breaker state and counters per external endpoint,
+        plus how many tasks the scheduler deferred because of open breakers.
+        """
+        return scheduler_service.get_circuit_breaker_metrics()
+
+    @app.get("/metrics/cron_load_profile")
+    def get_cron_load_profile():
+        """
+        Return the per-second fire load of scheduled tasks with and without
+        the deterministic spread offsets, plus the built-in job offsets.
+        """
+        return scheduler_service.get_load_profile()
+
+    @app.get("/metrics/result_cache")
+    def get_result_cache_metrics():
+        """
+        Return hit/miss/shared counters and size of the idempotent handler result cache.
+        """
+        return task_executor.result_cache.get_stats()
+
+    @app.get("/metrics/jira_field_cache")
+    def get_jira_field_cache_metrics():
+        """
+        Return Jira field name -> id cache counters and per-environment catalogue size and age.
+        """
+        return di_container.get_jira_field_cache().get_stats()
+
+    @app.get("/metrics/jira_connections")
+    def get_jira_connection_metrics():
+        """
+        Return per-environment Jira client connection counters: requests, new and reused keep-alive connections.
+        """
+        return di_container.get_jira_client_pool().get_stats()
+
+    @app.get("/metrics/jira_issue_store")
+    def get_jira_issue_store_metrics():
+        """
+        Return local Jira issue store counters: local hits and misses, upserts, stored issues and complete scopes.
+        """
+        store = di_container.get_jira_issue_store()
+        return store.get_stats() if store is not None else {}
+
+    @app.get("/metrics/jira_rate_limits")
+    def get_jira_rate_limit_metrics():
+        """
+        Return per-environment Jira rate limiter state: current rate and concurrency limit, throttled calls and waits.
+        """
+        registry = di_container.get_jira_rate_limiter_registry()
+        return registry.get_metrics() if registry is not None else {}
+
+    @app.get("/metrics/result_outbox")
+    def get_result_outbox_metrics():
+        """
+        Return result outbox counters: queued, delivered, retried, failed and dropped results.
+        """
+        return di_container.get_result_outbox().get_stats()
+
+    @app.get("/metrics/task_writes")
+    def get_task_write_metrics():
+        """
+        Return task persistence write counters: total writes, skipped no-op
+        status changes and the average writes per finished task lifecycle.
+        """
+        return task_repo.get_write_stats()
+
     return app
 
 
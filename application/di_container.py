@@ -1,19 +1,32 @@
+import os
 from typing import Any
 from settings import Settings
 from domain.services.result_reporter import ResultReporter
 from integration.external_clients.confluence_service import ConfluenceService
 from integration.external_clients.jira_service import JiraService
+from integration.external_clients.jira_client_pool import JiraClientPool
+from integration.external_clients.jira_field_cache import JiraFieldCache
+from integration.external_clients.jira_permission_cache import ProjectPermissionCache
+from integration.external_clients.circuit_breaker import CircuitBreakerRegistry
+from integration.external_clients.rate_limiter import RateLimiterRegistry
 from domain.services.confluence_data_processor import ConfluenceDataProcessor
 from domain.services.jira_data_processor import JiraDataProcessor
 from domain.services.mattermost_data_processor import MattermostDataProcessor
 from application.error_handler import error_handler
 from application.services.result_reporting_service import ResultReportingService
+from application.services.result_outbox import ResultOutbox
+from application.use_cases.result_cache import ResultCache
 
 # Import new repositories
 from infrastructure.repositories.task_repository import TaskRepository
 from infrastructure.repositories.task_result_repository import TaskResultRepository
 from infrastructure.repositories.confluence_repository import ConfluenceRepository
 from infrastructure.persistence.persistence import TaskPersistenceManager
+from infrastructure.persistence.scheduler_state_store import SchedulerStateStore
+from infrastructure.persistence.bulk_checkpoint_store import BulkCheckpointStore
+from infrastructure.persistence.export_sync_store import ExportSyncStore
+from infrastructure.persistence.jira_issue_store import JiraIssueStore
+from infrastructure.monitoring.resource_accounting import ResourceAccountant
 
 class DIContainer:
     """Dependency Injection container to manage service initialization."""
@@ -25,25 +38,105 @@ class DIContainer:
     
     # Services
     
+    def get_circuit_breaker_registry(self) -> CircuitBreakerRegistry:
+        """Get the process-wide circuit breaker registry shared by clients and scheduler."""
+        if 'circuit_breaker_registry' not in self._services:
+            cb_config = self.settings.config_file.get('circuit_breaker', {})
+            self._services['circuit_breaker_registry'] = CircuitBreakerRegistry(
+                failure_threshold=cb_config.get('failure_threshold', 5),
+                recovery_timeout=cb_config.get('recovery_timeout', 30),
+                half_open_max_calls=cb_config.get('half_open_max_calls', 1),
+                probe_timeout=cb_config.get('probe_timeout', 5)
+            )
+        return self._services['circuit_breaker_registry']
+    
+    def get_jira_rate_limiter_registry(self) -> RateLimiterRegistry:
+        """Get the process-wide per-environment Jira rate limiters shared by all tasks (None when disabled)."""
+        if 'jira_rate_limiter_registry' not in self._services:
+            limit_config = dict(self.settings.config_file.get('jira_rate_limit', {}))
+            registry = None
+            if limit_config.pop('enabled', True):
+                limit_config.pop('throttle_retries', None)
+                registry = RateLimiterRegistry(overrides=limit_config.pop('environments', None), **limit_config)
+            self._services['jira_rate_limiter_registry'] = registry
+        return self._services['jira_rate_limiter_registry']
+    
+    def get_result_cache(self) -> ResultCache:
+        """Get the cache shared by idempotent task handlers."""
+        if 'result_cache' not in self._services:
+            cache_config = self.settings.config_file.get('result_cache', {})
+            self._services['result_cache'] = ResultCache(
+                ttl_seconds=cache_config.get('ttl_seconds', 300),
+                max_entries=cache_config.get('max_entries', 256),
+                max_bytes=cache_config.get('max_bytes', 64 * 1024 * 1024)
+            )
+        return self._services['result_cache']
+    
+    def get_resource_accountant(self) -> ResourceAccountant:
+        """Get the per-task resource accountant used by the task executor."""
+        if 'resource_accountant' not in self._services:
+            accounting_config = self.settings.config_file.get('resource_accounting', {})
+            self._services['resource_accountant'] = ResourceAccountant(
+                enabled=accounting_config.get('enabled', True),
+                memory_sample_rate=accounting_config.get('memory_sample_rate', 0.0)
+            )
+        return self._services['resource_accountant']
+    
     def get_confluence_service(self) -> ConfluenceService:
         if 'confluence_service' not in self._services:
             conf_config = self.settings.config_file.get('confluence', {})
             self._services['confluence_service'] = ConfluenceService(
                 url=conf_config.get('url'),
                 username=conf_config.get('username'),
-                password=conf_config.get('password')
+                password=conf_config.get('password'),
+                circuit_breakers=self.get_circuit_breaker_registry()
             )
         return self._services['confluence_service']
     
+    def get_jira_client_pool(self) -> JiraClientPool:
+        """Per-environment Jira clients with connection pools sized to the configured concurrency."""
+        if 'jira_client_pool' not in self._services:
+            config = self.settings.config_file
+            jira_config = config.get('jira', {})
+            page_workers = jira_config.get('page_workers', 4)
+            # Every concurrent export of an environment may fetch page_workers pages at once
+            default_pool_size = max(10, page_workers * config.get('jira_export', {}).get('max_concurrent_per_env', 2))
+            self._services['jira_client_pool'] = JiraClientPool(
+                default_config=jira_config,
+                environments=jira_config.get('environments'),
+                circuit_breakers=self.get_circuit_breaker_registry(),
+                field_cache=self.get_jira_field_cache(),
+                page_workers=page_workers,
+                permission_cache=self.get_jira_permission_cache(),
+                pool_maxsize=jira_config.get('pool_maxsize', default_pool_size),
+                rate_limiters=self.get_jira_rate_limiter_registry(),
+                throttle_retries=config.get('jira_rate_limit', {}).get('throttle_retries', 2),
+                issue_store=self.get_jira_issue_store(),
+                issue_max_age=config.get('jira_issue_store', {}).get('max_age_seconds', 300),
+                delete_check_max_age=config.get('jira_issue_store', {}).get('delete_check_max_age', 30)
+            )
+        return self._services['jira_client_pool']
+    
     def get_jira_service(self) -> JiraService:
-        if 'jira_service' not in self._services:
-            jira_config = self.settings.config_file.get('jira', {})
-            self._services['jira_service'] = JiraService(
-                url=jira_config.get('url'),
-                username=jira_config.get('username'),
-                password=jira_config.get('password')
+        """Client of the default Jira (the jira section's url)."""
+        return self.get_jira_client_pool().get()
+    
+    def get_jira_permission_cache(self) -> ProjectPermissionCache:
+        if 'jira_permission_cache' not in self._services:
+            cache_config = self.settings.config_file.get('jira_permission_cache', {})
+            self._services['jira_permission_cache'] = ProjectPermissionCache(
+                ttl_seconds=cache_config.get('ttl_seconds', 300)
+            )
+        return self._services['jira_permission_cache']
+    
+    def get_jira_field_cache(self) -> JiraFieldCache:
+        if 'jira_field_cache' not in self._services:
+            cache_config = self.settings.config_file.get('jira_field_cache', {})
+            self._services['jira_field_cache'] = JiraFieldCache(
+                ttl_seconds=cache_config.get('ttl_seconds', 3600),
+                min_refresh_interval=cache_config.get('min_refresh_interval', 60)
             )
-        return self._services['jira_service']
+        return self._services['jira_field_cache']
     
     def get_confluence_data_processor(self) -> ConfluenceDataProcessor:
         if 'confluence_data_processor' not in self._services:
@@ -54,11 +147,35 @@ class DIContainer:
     
     def get_jira_data_processor(self) -> JiraDataProcessor:
         if 'jira_data_processor' not in self._services:
+            export_config = self.settings.config_file.get('jira_export', {})
             self._services['jira_data_processor'] = JiraDataProcessor(
-                self.get_jira_service()
+                self.get_jira_service(),
+                env_fetch_timeout=export_config.get('env_fetch_timeout', 30),
+                max_concurrent_per_env=export_config.get('max_concurrent_per_env', 2),
+                fetch_workers=export_config.get('fetch_workers', 8),
+                report_dir=export_config.get('report_dir', 'jira_reports'),
+                report_compression=export_config.get('report_compression', 'zstd'),
+                report_columns=export_config.get('report_columns'),
+                bulk_create_chunk_size=self.settings.config_file.get('jira_bulk', {}).get('create_chunk_size', 50),
+                idempotency_labels=self.settings.config_file.get('jira_bulk', {}).get('idempotency_labels', False),
+                client_pool=self.get_jira_client_pool(),
+                **self._export_sync_options()
             )
         return self._services['jira_data_processor']
     
+    def _export_sync_options(self) -> dict:
+        """JiraDataProcessor arguments for incremental (watermark) export sync; empty when disabled."""
+        sync_config = self.settings.config_file.get('jira_export_sync', {})
+        if not sync_config.get('enabled', True):
+            return {}
+        return {
+            "sync_store": self.get_export_sync_store(),
+            "incremental_scheduled": sync_config.get('incremental_scheduled', True),
+            "full_resync_interval": sync_config.get('full_resync_interval', 86400),
+            "sync_overlap_seconds": sync_config.get('overlap_seconds', 120),
+            "jql_timezone": sync_config.get('jql_timezone', 'UTC')
+        }
+    
     def get_mattermost_data_processor(self) -> MattermostDataProcessor:
         if 'mattermost_data_processor' not in self._services:
             self._services['mattermost_data_processor'] = MattermostDataProcessor()
@@ -71,6 +188,21 @@ class DIContainer:
             )
         return self._services['result_reporter']
     
+    def get_result_outbox(self) -> ResultOutbox:
+        """Get the outbox that delivers task results to the ResultReporter off the task threads."""
+        if 'result_outbox' not in self._services:
+            outbox_config = self.settings.config_file.get('result_outbox', {})
+            self._services['result_outbox'] = ResultOutbox(
+                result_reporter=self.get_result_reporter(),
+                workers=outbox_config.get('workers', 1),
+                batch_size=outbox_config.get('batch_size', 20),
+                batch_wait=outbox_config.get('batch_wait', 0.2),
+                max_attempts=outbox_config.get('max_attempts', 3),
+                retry_backoff=outbox_config.get('retry_backoff', 1.0),
+                max_queue=outbox_config.get('max_queue', 10000)
+            )
+        return self._services['result_outbox']
+    
     def get_error_handler(self):
         """Get the global error handler."""
         return error_handler
@@ -97,6 +229,53 @@ class DIContainer:
             self._repositories['persistence_manager'] = TaskPersistenceManager(storage_path=storage_path)
         return self._repositories['persistence_manager']
     
+    def get_scheduler_state_store(self) -> SchedulerStateStore:
+        """Get or create the SQLite store for schedules, pending retries and queue contents."""
+        if 'scheduler_state_store' not in self._repositories:
+            storage_config = self.settings.config_file.get('storage', {})
+            db_path = storage_config.get(
+                'scheduler_state_db',
+                os.path.join(storage_config.get('path', 'task_storage'), 'scheduler_state.db')
+            )
+            self._repositories['scheduler_state_store'] = SchedulerStateStore(db_path=db_path)
+        return self._repositories['scheduler_state_store']
+    
+    def get_bulk_checkpoint_store(self) -> BulkCheckpointStore:
+        """Get or create the SQLite store for per-item progress of bulk Jira tasks."""
+        if 'bulk_checkpoint_store' not in self._repositories:
+            storage_config = self.settings.config_file.get('storage', {})
+            db_path = storage_config.get(
+                'bulk_checkpoint_db',
+                os.path.join(storage_config.get('path', 'task_storage'), 'bulk_checkpoints.db')
+            )
+            self._repositories['bulk_checkpoint_store'] = BulkCheckpointStore(db_path=db_path)
+        return self._repositories['bulk_checkpoint_store']
+    
+    def get_export_sync_store(self) -> ExportSyncStore:
+        """Get or create the SQLite store for watermarks and issue sets of incremental Jira exports."""
+        if 'export_sync_store' not in self._repositories:
+            storage_config = self.settings.config_file.get('storage', {})
+            db_path = storage_config.get(
+                'export_sync_db',
+                os.path.join(storage_config.get('path', 'task_storage'), 'export_sync.db')
+            )
+            self._repositories['export_sync_store'] = ExportSyncStore(db_path=db_path)
+        return self._repositories['export_sync_store']
+    
+    def get_jira_issue_store(self) -> JiraIssueStore:
+        """Get or create the local SQLite copy of Jira issues shared by all environments (None when disabled)."""
+        if 'jira_issue_store' not in self._repositories:
+            store = None
+            if self.settings.config_file.get('jira_issue_store', {}).get('enabled', True):
+                storage_config = self.settings.config_file.get('storage', {})
+                db_path = storage_config.get(
+                    'jira_issue_store_db',
+                    os.path.join(storage_config.get('path', 'task_storage'), 'jira_issues.db')
+                )
+                store = JiraIssueStore(db_path=db_path)
+            self._repositories['jira_issue_store'] = store
+        return self._repositories['jira_issue_store']
+    
     def get_task_repository(self) -> TaskRepository:
         """Get or create the task repository."""
         if 'task_repository' not in self._repositories:
@@ -17,7 +17,7 @@ class SchedulerConfig:
     # Polling intervals (seconds)
     poll_interval: int = 30
     queue_processing_interval: int = 1
-    retry_processing_interval: int = 30
+    retry_processing_interval: int = 1
     
     # Cron expressions
     read_data_cron: str = '* * * * *'  # Every minute
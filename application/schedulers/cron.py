@@ -0,0 +1,324 @@
+# scheduler/cron.py
+
+import bisect
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+MONTH_NAMES = {name: i for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+DAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# Due entries are popped and fired in batches so the first pushes are not
+# delayed by re-arming a large burst
+FIRE_BATCH_SIZE = 256
+
+# Give up searching for a matching time after this many years (e.g. "0 0 30 2 *")
+MAX_SEARCH_YEARS = 5
+
+def _parse_value(token: str, names: Dict[str, int]) -> int:
+    token = token.lower()
+    if token in names:
+        return names[token]
+    return int(token)
+
+def _parse_field(field: str, low: int, high: int, names: Dict[str, int] = None) -> Tuple[int, ...]:
+    """Parse one crontab field ("*", "*/5", "1-5", "mon-fri", "1,15/2" ...) into sorted values."""
+    names = names or {}
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_str = part.split('/', 1)
+            step = int(step_str)
+            if step <= 0:
+                raise ValueError(f"Invalid step in cron field '{field}'")
+
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_str, end_str = part.split('-', 1)
+            start, end = _parse_value(start_str, names), _parse_value(end_str, names)
+        else:
+            start = _parse_value(part, names)
+            # "a/n" means "from a to the end of the range every n"
+            end = high if step != 1 else start
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"Value out of range in cron field '{field}' ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return tuple(sorted(values))
+
+class CronExpression:
+    """
+    Compiled standard 5-field crontab expression (minute hour day month day_of_week).
+
+    Follows Vixie cron semantics: day_of_week 0 and 7 are Sunday, and when both
+    day fields are restricted a day matches if either of them matches.
+    Fire times are naive local datetimes with minute resolution.
+    """
+    def __init__(self, expr: str):
+        self.expr = expr
+        normalized = MACROS.get(expr.strip().lower(), expr)
+        fields = normalized.split()
+        if len(fields) != 5:
+            raise ValueError(f"Wrong number of fields in cron expression '{expr}': got {len(fields)}, expected 5")
+
+        minute, hour, dom, month, dow = fields
+        self.minutes = _parse_field(minute, 0, 59)
+        self.hours = _parse_field(hour, 0, 23)
+        self.days = frozenset(_parse_field(dom, 1, 31))
+        self.months = _parse_field(month, 1, 12, MONTH_NAMES)
+        self.weekdays = frozenset(d % 7 for d in _parse_field(dow, 0, 7, DAY_NAMES))
+        self.dom_restricted = not dom.startswith('*')
+        self.dow_restricted = not dow.startswith('*')
+
+        # One-entry memo: expressions shared by many tasks are asked for the same instant
+        self._memo: Optional[Tuple[datetime, datetime]] = None
+
+    def __repr__(self):
+        return f"CronExpression({self.expr!r})"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom_ok = dt.day in self.days
+        # datetime.weekday(): Monday=0 .. Sunday=6; crontab: Sunday=0
+        dow_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.dom_restricted and self.dow_restricted:
+            return dom_ok or dow_ok
+        return dom_ok and dow_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        """Return the first fire time strictly after dt."""
+        memo = self._memo
+        if memo is not None and memo[0] == dt:
+            return memo[1]
+
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit_year = candidate.year + MAX_SEARCH_YEARS
+        while candidate.year <= limit_year:
+            if candidate.month not in self.months:
+                i = bisect.bisect_right(self.months, candidate.month)
+                if i < len(self.months):
+                    candidate = candidate.replace(month=self.months[i], day=1, hour=0, minute=0)
+                else:
+                    candidate = candidate.replace(year=candidate.year + 1, month=self.months[0], day=1, hour=0, minute=0)
+                continue
+
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+
+            if candidate.hour not in self.hours:
+                i = bisect.bisect_right(self.hours, candidate.hour)
+                if i < len(self.hours):
+                    candidate = candidate.replace(hour=self.hours[i], minute=0)
+                else:
+                    candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+
+            if candidate.minute not in self.minutes:
+                i = bisect.bisect_right(self.minutes, candidate.minute)
+                if i < len(self.minutes):
+                    candidate = candidate.replace(minute=self.minutes[i])
+                else:
+                    candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+
+            self._memo = (dt, candidate)
+            return candidate
+
+        raise ValueError(f"Cron expression '{self.expr}' has no fire time within {MAX_SEARCH_YEARS} years")
+
+@lru_cache(maxsize=4096)
+def compile_cron(expr: str) -> CronExpression:
+    """Compile a crontab expression; compiled expressions are shared by expression string."""
+    return CronExpression(expr)
+
+class CronIndex:
+    """
+    Min-heap of next fire times for any number of cron schedules, served by a
+    single timer thread.
+
+    Each due entry is handed to on_fire(key, payload, scheduled_ts) and then
+    re-armed at its next fire time. Missed periods (e.g. after a long pause)
+    are coalesced into one fire. An entry may carry a fixed offset (seconds)
+    that is added to every cron fire time, see SpreadPolicy.
+    """
+    def __init__(self, on_fire: Callable[[Hashable, Any, float], None],
+                 clock: Callable[[], float] = time.time, name: str = "CronIndexTimer"):
+        self.on_fire = on_fire
+        self.clock = clock
+        self.name = name
+
+        self._heap = []  # (fire_ts, seq, key)
+        self._entries: Dict[Hashable, Tuple[int, CronExpression, Any, int]] = {}  # key -> (seq, expr, payload, offset)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Fire accuracy stats
+        self._fired = 0
+        self._max_lag = 0.0
+        self._total_lag = 0.0
+
+    def __len__(self):
+        with self._cond:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._cond:
+            return key in self._entries
+
+    def _next_fire_ts(self, expr: CronExpression, after_ts: float) -> float:
+        # Fire times have minute resolution, so flooring keeps the expression memo hot
+        after = datetime.fromtimestamp(after_ts).replace(second=0, microsecond=0)
+        return expr.next_after(after).timestamp()
+
+    def add(self, key: Hashable, cron_expr: str, payload: Any = None, offset: int = 0) -> float:
+        """Register or replace the schedule for key; returns its next fire timestamp."""
+        expr = compile_cron(cron_expr)
+        fire_ts = self._next_fire_ts(expr, self.clock() - offset) + offset
+        with self._cond:
+            seq = next(self._seq)
+            self._entries[key] = (seq, expr, payload, offset)
+            heapq.heappush(self._heap, (fire_ts, seq, key))
+            if self._heap[0][1] == seq:
+                self._cond.notify()  # new earliest entry, wake the timer
+        return fire_ts
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove the schedule for key; its heap item is discarded lazily."""
+        with self._cond:
+            return self._entries.pop(key, None) is not None
+
+    def next_fire_time(self, key: Hashable) -> Optional[float]:
+        """Next fire timestamp for key (O(n); for inspection and tests)."""
+        with self._cond:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return next((ts for ts, seq, k in self._heap if k == key and seq == entry[0]), None)
+
+    def fire_due(self) -> int:
+        """Fire every entry that is due now and re-arm it. Returns the number fired."""
+        fired = 0
+        while True:
+            count = self._fire_batch()
+            fired += count
+            if count < FIRE_BATCH_SIZE:
+                return fired
+
+    def _fire_batch(self) -> int:
+        """Pop and fire up to FIRE_BATCH_SIZE due entries."""
+        now = self.clock()
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now and len(due) < FIRE_BATCH_SIZE:
+                fire_ts, seq, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key)
+                if entry is None or entry[0] != seq:
+                    continue  # removed or replaced
+                _, expr, payload, offset = entry
+                next_ts = self._next_fire_ts(expr, fire_ts - offset) + offset
+                if next_ts <= now:
+                    next_ts = self._next_fire_ts(expr, now - offset) + offset  # coalesce missed periods
+                new_seq = next(self._seq)
+                self._entries[key] = (new_seq, expr, payload, offset)
+                heapq.heappush(self._heap, (next_ts, new_seq, key))
+                due.append((key, payload, fire_ts))
+
+        for key, payload, fire_ts in due:
+            try:
+                self.on_fire(key, payload, fire_ts)
+            except Exception as e:
+                logging.error(f"Cron fire callback failed for {key}: {e}")
+            lag = self.clock() - fire_ts
+            self._fired += 1
+            self._total_lag += lag
+            self._max_lag = max(self._max_lag, lag)
+        return len(due)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                timeout = None
+                if self._heap:
+                    timeout = self._heap[0][0] - self.clock()
+                if timeout is None or timeout > 0:
+                    # Cap the wait so wall-clock jumps are noticed within a minute
+                    self._cond.wait(timeout=min(timeout, 60) if timeout is not None else 60)
+                    continue
+            self.fire_due()
+
+    def start(self):
+        """Start the timer thread."""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        logging.info(f"{self.name} started with {len(self)} schedules")
+
+    def shutdown(self):
+        """Stop the timer thread."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get_load_profile(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Compare the per-second fire load of the next pending fires with and
+        without offsets: how many schedules would share the busiest cron
+        instant versus the busiest second after spreading.
+        """
+        with self._cond:
+            live = [(ts, self._entries[key][3]) for ts, seq, key in self._heap
+                    if key in self._entries and self._entries[key][0] == seq]
+        before = Counter(int(ts - offset) for ts, offset in live)
+        after = Counter(int(ts) for ts, _ in live)
+        return {
+            "schedules": len(live),
+            "spread_schedules": sum(1 for _, offset in live if offset),
+            "peak_per_second_before": max(before.values(), default=0),
+            "peak_per_second_after": max(after.values(), default=0),
+            "busiest_seconds": [
+                {"time": datetime.fromtimestamp(second).isoformat(), "fires": count}
+                for second, count in after.most_common(top)
+            ]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            schedules = len(self._entries)
+            next_ts = self._heap[0][0] if self._heap else None
+        return {
+            "schedules": schedules,
+            "next_fire_in": max(0.0, next_ts - self.clock()) if next_ts is not None else None,
+            "fired": self._fired,
+            "max_lag": self._max_lag,
+            "avg_lag": self._total_lag / self._fired if self._fired else 0.0,
+            "compiled_expressions": compile_cron.cache_info().currsize
+        }
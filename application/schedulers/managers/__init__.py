@@ -1,6 +1,6 @@
 from .task_queue_manager import TaskQueueManager
 from .dependency_manager import DependencyManager
-from .retry_manager import RetryManager
+from .retry_manager import RetryManager, RetryBudget
 from .timeout_manager import TimeoutManager
 from .scheduled_task_manager import ScheduledTaskManager
 
@@ -8,6 +8,7 @@ __all__ = [
     'TaskQueueManager',
     'DependencyManager',
     'RetryManager',
+    'RetryBudget',
     'TimeoutManager',
     'ScheduledTaskManager'
 ] 
\ No newline at end of file
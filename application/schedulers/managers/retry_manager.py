@@ -1,87 +1,247 @@
 # scheduler/managers/retry_manager.py
 
+import heapq
+import itertools
 import logging
-from typing import Callable, Dict
+import random
+import time
+from collections import deque
+from threading import Lock
+from typing import Callable, Dict, Tuple
 from uuid import UUID
 from datetime import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.date import DateTrigger
 
 from domain.entities.models import Task, TaskStatus, RetryPolicy
 
+class RetryBudget:
+    """
+    Global retry budget over a sliding time window.
+
+    Retries are allowed while the number of retries in the window stays below
+    max(min_retries_per_window, ratio * dispatches in the window), so a failing
+    dependency cannot turn every dispatch into an extra retry.
+    """
+    def __init__(self, ratio: float = 0.2, min_retries_per_window: int = 10,
+                 window_seconds: float = 60, clock: Callable[[], float] = time.monotonic):
+        self.ratio = ratio
+        self.min_retries_per_window = min_retries_per_window
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self._dispatches = deque()
+        self._retries = deque()
+        self._rejected = 0
+        self._lock = Lock()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._dispatches and self._dispatches[0] <= cutoff:
+            self._dispatches.popleft()
+        while self._retries and self._retries[0] <= cutoff:
+            self._retries.popleft()
+
+    def _allowance(self) -> float:
+        return max(self.min_retries_per_window, self.ratio * len(self._dispatches))
+
+    def record_dispatch(self) -> None:
+        """Record one task dispatch to the worker pool."""
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            self._dispatches.append(now)
+
+    def try_acquire(self) -> bool:
+        """Consume one retry from the budget, returning False if it is exhausted."""
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            if len(self._retries) >= self._allowance():
+                self._rejected += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return the current window counters."""
+        with self._lock:
+            self._expire(self.clock())
+            return {
+                "dispatches": len(self._dispatches),
+                "retries": len(self._retries),
+                "allowance": self._allowance(),
+                "rejected_total": self._rejected
+            }
+
 class RetryManager:
     """
     Manages the retry mechanism for failed tasks, handling retry policy,
     scheduling retries, and tracking retry attempts.
+
+    Pending retries are kept in an in-process min-heap ordered by due time.
+    Delays use exponential backoff with full jitter, capped at max_delay, and
+    every retry has to fit into the global RetryBudget. Entries are mirrored to
+    an optional SchedulerStateStore so they survive restarts.
     """
-    
-    def __init__(self, task_repository, scheduler: BackgroundScheduler):
+    RETRY = "retry"
+    DEFER = "defer"
+
+    def __init__(self, task_repository, max_delay: float = 3600, budget: RetryBudget = None,
+                 rng: random.Random = None, clock: Callable[[], float] = time.time, state_store=None):
         self.task_repository = task_repository
-        self.scheduler = scheduler
+        self.state_store = state_store
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.rng = rng or random.Random()
+        self.clock = clock
         self.retry_callbacks: Dict[UUID, Callable] = {}  # Callbacks for retry scheduling
-    
+
+        self._heap = []  # (due_ts, seq, task_id)
+        self._entries: Dict[UUID, Tuple[int, Callable]] = {}  # task_id -> (seq, callback) of the live entry
+        self._seq = itertools.count()
+        self._lock = Lock()
+
     def register_retry_callback(self, task_id: UUID, callback: Callable) -> None:
         """Register a callback function for task retry."""
         self.retry_callbacks[task_id] = callback
-    
+
     def should_retry(self, task: Task) -> bool:
         """Check if a task should be retried based on its retry policy."""
         if not task.retry_policy:
             return False
-            
+
         return (task.retry_policy.current_retries < task.retry_policy.max_retries)
-    
-    def schedule_retry(self, task: Task, on_retry_callback):
+
+    def record_dispatch(self) -> None:
+        """Record a task dispatch so the retry budget can scale with throughput."""
+        self.budget.record_dispatch()
+
+    def compute_delay(self, task: Task) -> float:
+        """Full-jitter delay: uniform(0, min(max_delay, exponential backoff))."""
+        return self.rng.uniform(0, min(self.max_delay, task.get_retry_delay()))
+
+    def schedule_retry(self, task: Task, on_retry_callback, min_delay: float = 0) -> bool:
         """
         Schedule a retry for the failed task based on its retry policy.
-        
+
         Args:
             task: The task to retry
             on_retry_callback: Callback function to execute when a retry is triggered
+            min_delay: Lower bound for the delay, e.g. until an open circuit breaker recovers
+
+        Returns:
+            True if a retry was queued, False if the task has no policy or the
+            retry budget is exhausted
         """
         if not task.retry_policy:
             logging.info(f"Task {task.id} has no retry policy, not scheduling retry")
-            return
-            
+            return False
+
+        if not self.budget.try_acquire():
+            logging.warning(f"Retry budget exhausted, not retrying task {task.id}")
+            return False
+
         task.increment_retry_counter()
-        next_retry_time = task.get_next_retry_time()
-        
+        delay = max(min_delay, self.compute_delay(task))
+
         # Update task status to RETRY
         self.task_repository.update_task_status(task.id, TaskStatus.RETRY)
-        
-        # Schedule the retry with a date trigger
-        retry_job_id = f"retry_task_{task.id}_{task.retry_policy.current_retries}"
-        
-        self.scheduler.add_job(
-            func=on_retry_callback,
-            trigger=DateTrigger(run_date=next_retry_time),
-            args=[task.id],
-            id=retry_job_id
-        )
-        
+
+        due_ts = self._push(task.id, self.clock() + delay, on_retry_callback, self.RETRY)
+
         logging.info(f"Scheduled retry {task.retry_policy.current_retries}/{task.retry_policy.max_retries} "
-                    f"for task {task.id} at {next_retry_time}")
-    
+                    f"for task {task.id} at {datetime.fromtimestamp(due_ts)} (delay {delay:.1f}s)")
+        return True
+
+    def defer(self, task_id: UUID, delay: float, callback: Callable) -> None:
+        """
+        Put a task back into the delay queue without consuming a retry attempt
+        or retry budget (used when its dependencies are temporarily unavailable).
+        """
+        self._push(task_id, self.clock() + delay, callback, self.DEFER)
+        logging.info(f"Deferred task {task_id} for {delay:.1f}s")
+
+    def restore(self, task_id: UUID, due_ts: float, callback: Callable, kind: str) -> None:
+        """Re-insert a persisted entry with its original due time (overdue entries fire on the next drain)."""
+        self._push(task_id, due_ts, callback, kind)
+
+    def _push(self, task_id: UUID, due_ts: float, callback: Callable, kind: str) -> float:
+        """Insert or replace the pending entry for task_id; returns its due timestamp."""
+        with self._lock:
+            seq = next(self._seq)
+            # A newer entry supersedes any older one; the stale heap item is skipped on drain
+            self._entries[task_id] = (seq, callback)
+            heapq.heappush(self._heap, (due_ts, seq, task_id))
+        if self.state_store:
+            self.state_store.save_retry(task_id, due_ts, kind)
+        return due_ts
+
+    def is_pending(self, task_id: UUID) -> bool:
+        """Check whether a task has a live entry in the delay queue."""
+        with self._lock:
+            return task_id in self._entries
+
     def reset_retry_counter(self, task_id: UUID) -> None:
         """Reset retry counter for a task."""
         task = self.task_repository.get_by_id(task_id)
         if task and task.retry_policy:
             task.retry_policy.current_retries = 0
             self.task_repository.update(task)
-    
+
     def cleanup_retry(self, task_id: UUID) -> None:
-        """Clean up retry resources for a task."""
+        """Clean up retry resources for a task, cancelling any pending retry."""
         if task_id in self.retry_callbacks:
             del self.retry_callbacks[task_id]
-    
-    def process_retries(self):
+        with self._lock:
+            removed = self._entries.pop(task_id, None)
+        if removed and self.state_store:
+            self.state_store.delete_retry(task_id)
+
+    def pending_count(self) -> int:
+        """Number of live pending retries."""
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return delay queue and retry budget statistics."""
+        with self._lock:
+            pending = len(self._entries)
+            next_due = self._heap[0][0] if self._heap else None
+        return {
+            "pending": pending,
+            "next_due_in": max(0.0, next_due - self.clock()) if next_due is not None else None,
+            "budget": self.budget.get_stats()
+        }
+
+    def process_retries(self) -> int:
         """
-        Process tasks that are due for retry.
-        This method can be used for additional retry management logic.
+        Drain every retry that is due and invoke its callback.
+
+        Only the heap head is inspected, so the cost is O(k log n) for k due
+        entries; nothing is scanned when no retry is due.
+
+        Returns:
+            Number of retries fired
         """
-        # This is a placeholder that could be expanded with more complex retry logic
-        # such as checking for stuck retries or implementing escalation policies
-        retry_tasks = self.task_repository.get_by_status(TaskStatus.RETRY)
-        if retry_tasks:
-            logging.info(f"Found {len(retry_tasks)} tasks in RETRY status")
-            # Additional logic could be added here
\ No newline at end of file
+        now = self.clock()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, seq, task_id = heapq.heappop(self._heap)
+                entry = self._entries.get(task_id)
+                if entry is None or entry[0] != seq:
+                    continue  # cancelled or superseded
+                del self._entries[task_id]
+                due.append((task_id, entry[1]))
+
+        if self.state_store:
+            for task_id, _ in due:
+                self.state_store.delete_retry(task_id)
+
+        for task_id, callback in due:
+            try:
+                callback(task_id)
+            except Exception as e:
+                logging.error(f"Retry callback for task {task_id} failed: {e}")
+
+        if due:
+            logging.info(f"Fired {len(due)} due retries")
+        return len(due)
@@ -1,54 +1,98 @@
 import logging
-from uuid import UUID
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
 from domain.entities.models import TaskPriority, TaskStatus
+from ..cron import CronIndex
+from ..spreading import SpreadPolicy
 
 class ScheduledTaskManager:
     """
-    Manages scheduled tasks using APScheduler, handling the scheduling, 
-    execution, and management of tasks with cron expressions.
+    Manages scheduled tasks with a native cron index: compiled expressions are
+    shared by expression string, next fire times live in a single min-heap and
+    one timer thread pushes due tasks straight into the TaskQueueManager.
+    An optional SpreadPolicy shifts each task by a deterministic offset, and an
+    optional SchedulerStateStore persists schedules so they survive restarts.
     """
-    def __init__(self, scheduler: BackgroundScheduler, task_repository):
-        self.scheduler = scheduler
+    def __init__(self, task_repository, task_queue_manager, spread_policy: SpreadPolicy = None,
+                 clock=None, state_store=None):
         self.task_repository = task_repository
-    
-    def schedule_task(self, task_id, cron_expr, priority=TaskPriority.MEDIUM, on_trigger_callback=None):
+        self.state_store = state_store
+        self.task_queue_manager = task_queue_manager
+        self.spread_policy = spread_policy or SpreadPolicy()
+        kwargs = {"clock": clock} if clock else {}
+        self.cron_index = CronIndex(on_fire=self._on_fire, **kwargs)
+
+    def start(self):
+        """Start the cron timer."""
+        self.cron_index.start()
+
+    def shutdown(self):
+        """Stop the cron timer."""
+        self.cron_index.shutdown()
+
+    def schedule_task(self, task_id, cron_expr, priority=TaskPriority.MEDIUM, tolerance=None):
         """
         Schedule a task with the given cron expression.
-        
+
         Args:
             task_id: ID of the task to schedule
             cron_expr: Cron expression for scheduling
             priority: Priority level for the task
-            on_trigger_callback: Callback to execute when the task is triggered
+            tolerance: Max seconds the task may fire after its cron time (caps the spread offset)
         """
-        job_id = f"task_{str(task_id)}"  # Convert UUID to string for job_id
-        
-        # Create the cron trigger
-        cron_trigger = CronTrigger.from_crontab(cron_expr)
-        
-        # Add the job to the scheduler
-        self.scheduler.add_job(
-            func=on_trigger_callback,
-            trigger=cron_trigger,
-            args=[task_id, priority],
-            id=job_id,
-            replace_existing=True
-        )
-        
+        offset = self.spread_policy.offset_for(task_id, tolerance)
+        self.cron_index.add(task_id, cron_expr, priority, offset=offset)
+        if self.state_store:
+            self.state_store.save_schedule(task_id, cron_expr, priority, offset)
+
         # Update task status
         self.task_repository.update_task_status(task_id, TaskStatus.SCHEDULED)
-        
-        logging.info(f"Scheduled recurring job for task_id={task_id}, cron={cron_expr}, priority={priority}")
-    
-    def remove_scheduled_task(self, task_id):
-        """Remove a scheduled task from the scheduler."""
-        job_id = f"task_{str(task_id)}"
+
+        logging.info(f"Scheduled recurring job for task_id={task_id}, cron={cron_expr}, "
+                     f"priority={priority}, offset={offset}s")
+
+    def _on_fire(self, task_id, priority, scheduled_ts):
+        """Timer callback: enqueue the due task."""
         try:
-            self.scheduler.remove_job(job_id)
+            task = self.task_repository.get_by_id(task_id)
+            if task.status == TaskStatus.QUEUED:
+                logging.info(f"Scheduled task {task_id} is still queued, skipping this run")
+                return
+            if not task.can_transition_to(TaskStatus.QUEUED):
+                # e.g. the previous run is still RUNNING or waiting for a retry
+                logging.warning(f"Scheduled task {task_id} is {task.status}, skipping this run")
+                return
+            self.task_repository.update_task_status(task_id, TaskStatus.QUEUED)
+        except Exception as e:
+            logging.warning(f"Scheduled task {task_id} could not be marked QUEUED, unscheduling: {e}")
+            self.remove_scheduled_task(task_id)
+            return
+        self.task_queue_manager.add_task(task_id, priority)
+        logging.info(f"Scheduled task {task_id} triggered and added to queue")
+
+    def restore_schedule(self, task_id, cron_expr, priority, offset=0):
+        """Re-register a persisted schedule without touching the task's status."""
+        self.cron_index.add(task_id, cron_expr, priority, offset=offset)
+
+    def is_scheduled(self, task_id) -> bool:
+        """Check whether a task currently has a cron schedule."""
+        return task_id in self.cron_index
+
+    def remove_scheduled_task(self, task_id):
+        """Remove a scheduled task from the cron index."""
+        if self.cron_index.remove(task_id):
+            if self.state_store:
+                self.state_store.delete_schedule(task_id)
             logging.info(f"Removed scheduled job for task_id={task_id}")
             return True
-        except Exception as e:
-            logging.warning(f"Error removing scheduled job for task_id={task_id}: {e}")
-            return False 
\ No newline at end of file
+        logging.warning(f"No scheduled job found for task_id={task_id}")
+        return False
+
+    def get_stats(self):
+        """Return cron index statistics (schedule count, fire lag)."""
+        return self.cron_index.get_stats()
+
+    def get_load_profile(self):
+        """Return the fire load profile with and without spreading."""
+        profile = self.cron_index.get_load_profile()
+        profile["spread_enabled"] = self.spread_policy.enabled
+        profile["window_seconds"] = self.spread_policy.window_seconds
+        return profile
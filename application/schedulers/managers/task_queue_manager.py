@@ -13,8 +13,9 @@ class TaskQueueManager:
     Manages a priority queue for tasks, providing thread-safe operations
     for adding, retrieving, and manipulating tasks in the queue.
     """
-    def __init__(self):
+    def __init__(self, state_store=None):
         self.task_queue = PriorityQueue()
+        self.state_store = state_store  # Optional SchedulerStateStore mirroring queue contents
         self.queue_lock = Lock()
         self.running_tasks = set()
         self.futures: Dict[UUID, Any] = {}  # Store futures for running tasks
@@ -24,6 +25,8 @@ class TaskQueueManager:
         with self.queue_lock:
             priority_value = self.get_priority_value(priority)
             self.task_queue.put((priority_value, task_id))
+            if self.state_store:
+                self.state_store.save_queued(task_id, priority)
             logging.info(f"Added task {task_id} to queue with priority {priority}")
     
     def get_next_tasks(self, max_tasks):
@@ -45,6 +48,8 @@ class TaskQueueManager:
                     
                 priority, task_id = self.task_queue.get()
                 self.running_tasks.add(task_id)
+                if self.state_store:
+                    self.state_store.delete_queued(task_id)
                 tasks_to_execute.append((priority, task_id))
                 
         return tasks_to_execute
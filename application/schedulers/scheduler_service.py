@@ -1,6 +1,7 @@
 # scheduler/scheduler_service.py
 
 import logging
+import time
 import concurrent.futures
 from uuid import UUID
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -11,12 +12,16 @@ from domain.entities.models import TaskStatus, TaskScheduleType, TaskPriority, T
 
 from .managers.task_queue_manager import TaskQueueManager
 from .managers.dependency_manager import DependencyManager
-from .managers.retry_manager import RetryManager
+from .managers.retry_manager import RetryManager, RetryBudget
 from .managers.timeout_manager import TimeoutManager
 from .managers.scheduled_task_manager import ScheduledTaskManager
+from .spreading import SpreadPolicy, OffsetTrigger
 from ..use_cases.fetch_service import ExternalTaskFetcher
 from ..services.result_reporting_service import ResultReportingService
 
+# Max seconds a built-in every-minute job may be shifted by the spread policy
+BUILTIN_JOB_TOLERANCE = 59
+
 class SchedulerService:
     """
     Orchestrates task scheduling and execution by coordinating various managers.
@@ -30,7 +35,14 @@ class SchedulerService:
                  poll_interval=30,
                  max_concurrent_jobs=5,
                  coalesce=False,
-                 max_instances=5):
+                 max_instances=5,
+                 retry_max_delay=3600,
+                 retry_budget_ratio=0.2,
+                 retry_budget_min=10,
+                 circuit_breakers=None,
+                 spread_enabled=False,
+                 spread_window_seconds=300,
+                 state_store=None):
         self.task_repository = task_repository
         self.task_executor = task_executor
         self.task_result_repo = task_result_repo
@@ -38,6 +50,9 @@ class SchedulerService:
 
         self.poll_interval = poll_interval
         self.max_concurrent_jobs = max_concurrent_jobs
+        self.circuit_breakers = circuit_breakers
+        self.state_store = state_store
+        self.deferred_task_count = 0
         
         # Setup executor
         self.executor = concurrent.futures.ThreadPoolExecutor(
@@ -60,11 +75,20 @@ class SchedulerService:
         )
         
         # Initialize managers
-        self.task_queue_manager = TaskQueueManager()
+        self.task_queue_manager = TaskQueueManager(state_store=state_store)
         self.dependency_manager = DependencyManager(task_repository)
-        self.retry_manager = RetryManager(task_repository, self.scheduler)
+        self.retry_manager = RetryManager(
+            task_repository,
+            max_delay=retry_max_delay,
+            budget=RetryBudget(ratio=retry_budget_ratio, min_retries_per_window=retry_budget_min),
+            state_store=state_store
+        )
         self.timeout_manager = TimeoutManager()
-        self.scheduled_task_manager = ScheduledTaskManager(self.scheduler, task_repository)
+        self.spread_policy = SpreadPolicy(enabled=spread_enabled, window_seconds=spread_window_seconds)
+        self.scheduled_task_manager = ScheduledTaskManager(
+            task_repository, self.task_queue_manager, spread_policy=self.spread_policy,
+            state_store=state_store
+        )
         
         # Initialize result reporting service
         self.result_reporting_service = ResultReportingService(
@@ -75,6 +99,7 @@ class SchedulerService:
         
         # Tracking futures for task execution
         self.futures = {}
+        self.builtin_job_offsets = {}
 
     def start(self):
         logging.info("Starting Scheduler Service with poll_interval=%s", self.poll_interval)
@@ -82,6 +107,9 @@ class SchedulerService:
         # Initialize dependency map from existing tasks
         self.dependency_manager.initialize_from_existing_tasks()
         
+        # Restore schedules, retries and queue contents from the previous run
+        self.restore_state()
+        
         # 1) Poll for new tasks
         self.scheduler.add_job(
             func=self.poll_db_for_new_tasks,
@@ -103,31 +131,126 @@ class SchedulerService:
         # 3) Read data task
         self.scheduler.add_job(
             func=self.task_executor.read_data,
-            trigger=CronTrigger.from_crontab('* * * * *'),
+            trigger=self._builtin_cron_trigger('read_data_cron', '* * * * *'),
             id='read_data_cron'
         )
 
         # 4) Fetch tasks from Confluence
         self.scheduler.add_job(
             func=self.fetcher.fetch_from_confluence,
-            trigger=CronTrigger.from_crontab('* * * * *'),
+            trigger=self._builtin_cron_trigger('fetch_confluence_job', '* * * * *'),
             id='fetch_confluence_job'
         )
         
-        # 5) Check and process retries
+        # 5) Drain due retries (only peeks the delay queue head when nothing is due)
         self.scheduler.add_job(
             func=self.retry_manager.process_retries,
             trigger='interval',
-            seconds=30,  # Check for retries every 30 seconds
+            seconds=1,
             id='process_retries_job'
         )
         
         # 6) Start the result reporting service with our scheduler
         self.result_reporting_service.start(scheduler=self.scheduler)
 
+        # 7) Start the cron index timer for scheduled tasks
+        self.scheduled_task_manager.start()
+        
+        # 8) Persist scheduler state changes in batches
+        if self.state_store:
+            self.scheduler.add_job(
+                func=self.state_store.flush,
+                trigger='interval',
+                seconds=1,
+                id='flush_scheduler_state_job',
+                replace_existing=True
+            )
+
         self.scheduler.start()
         logging.info("Scheduler started.")
 
+    def _builtin_cron_trigger(self, job_id, cron_expr):
+        """Cron trigger for a built-in job, shifted by its spread offset when spreading is enabled."""
+        trigger = CronTrigger.from_crontab(cron_expr)
+        # Built-in jobs run every minute, so their offset must stay inside that period
+        offset = self.spread_policy.offset_for(job_id, tolerance=BUILTIN_JOB_TOLERANCE)
+        self.builtin_job_offsets[job_id] = offset
+        if offset:
+            return OffsetTrigger(trigger, offset)
+        return trigger
+
+    def get_load_profile(self):
+        """Report the cron fire load profile produced by the spread policy."""
+        profile = self.scheduled_task_manager.get_load_profile()
+        profile["builtin_job_offsets"] = dict(self.builtin_job_offsets)
+        return profile
+
+    def restore_state(self):
+        """
+        Restore scheduler state on startup without re-registering every task:
+        persisted schedules, retries and queue contents are loaded in bulk,
+        then task statuses are reconciled for anything the store missed
+        (e.g. changes made after the last flush before a crash).
+        """
+        if not self.state_store:
+            return
+        
+        started = time.perf_counter()
+        tasks = {str(task.id): task for task in self.task_repository.get_all()}
+        state = self.state_store.load_state()
+        retry_callbacks = {
+            RetryManager.RETRY: self._retry_task,
+            RetryManager.DEFER: self._requeue_deferred_task
+        }
+        
+        scheduled = 0
+        for row in state["scheduled"]:
+            task = tasks.get(row["task_id"])
+            if not task or task.status == TaskStatus.PENDING or not task.cron_expr:
+                self.state_store.delete_schedule(row["task_id"])
+                continue
+            self.scheduled_task_manager.restore_schedule(task.id, row["cron_expr"], task.priority, row["offset"])
+            scheduled += 1
+        
+        retries = 0
+        for row in state["retries"]:
+            task = tasks.get(row["task_id"])
+            if not task or task.status not in (TaskStatus.RETRY, TaskStatus.QUEUED):
+                self.state_store.delete_retry(row["task_id"])
+                continue
+            self.retry_manager.restore(task.id, row["due_ts"], retry_callbacks.get(row["kind"], self._retry_task), row["kind"])
+            retries += 1
+        
+        queued_ids = set()
+        for row in state["queued"]:
+            task = tasks.get(row["task_id"])
+            if not task or task.status != TaskStatus.QUEUED or self.retry_manager.is_pending(task.id):
+                self.state_store.delete_queued(row["task_id"])
+                continue
+            self.task_queue_manager.add_task(task.id, task.priority)
+            queued_ids.add(task.id)
+        
+        # Reconcile statuses the store did not capture
+        reconciled = 0
+        for task in tasks.values():
+            if task.status == TaskStatus.SCHEDULED and task.cron_expr \
+                    and not self.scheduled_task_manager.is_scheduled(task.id):
+                self.scheduled_task_manager.schedule_task(
+                    task.id, task.cron_expr, task.priority, tolerance=task.schedule_tolerance_seconds
+                )
+                reconciled += 1
+            elif task.status == TaskStatus.QUEUED and task.id not in queued_ids \
+                    and not self.retry_manager.is_pending(task.id):
+                self.task_queue_manager.add_task(task.id, task.priority)
+                reconciled += 1
+            elif task.status == TaskStatus.RETRY and not self.retry_manager.is_pending(task.id):
+                self.retry_manager.restore(task.id, time.time(), self._retry_task, RetryManager.RETRY)
+                reconciled += 1
+        
+        self.state_store.flush()
+        logging.info(f"Restored scheduler state in {time.perf_counter() - started:.2f}s: "
+                     f"{scheduled} schedules, {retries} retries, {len(queued_ids)} queued, {reconciled} reconciled")
+
     def poll_db_for_new_tasks(self):
         """Poll for new tasks and add to queue, respecting dependencies."""
         logging.debug("Polling DB for new tasks.")
@@ -152,7 +275,7 @@ class SchedulerService:
                     task.id, 
                     task.cron_expr, 
                     task.priority,
-                    self._scheduled_task_wrapper
+                    tolerance=task.schedule_tolerance_seconds
                 )
             
             elif task.task_type == TaskScheduleType.IMMEDIATE:
@@ -173,9 +296,14 @@ class SchedulerService:
                 self.task_queue_manager.mark_task_completed(task_id)
                 continue
             
+            # Do not spend a worker slot on a task whose endpoints are known to be down
+            if self._defer_if_circuit_open(task):
+                continue
+            
             # Submit task to thread pool
             future = self.executor.submit(self._execute_and_track, task_id)
             self.futures[task_id] = future
+            self.retry_manager.record_dispatch()
             
             # Set up timeout if needed
             if task.timeout_seconds:
@@ -190,11 +318,53 @@ class SchedulerService:
             
             logging.info(f"Started execution of task {task_id} with priority value {priority}")
 
+    def _breaker_delay(self, task) -> float:
+        """Seconds until every circuit breaker the task depends on lets calls through."""
+        if not self.circuit_breakers:
+            return 0.0
+        endpoints = self.task_executor.get_required_endpoints(task)
+        return self.circuit_breakers.remaining_open_time(endpoints)
+
+    def _defer_if_circuit_open(self, task) -> bool:
+        """Defer a dequeued task until its open circuit breakers recover."""
+        delay = self._breaker_delay(task)
+        if delay <= 0:
+            return False
+        
+        # Release the slot reserved by get_next_tasks; the task stays QUEUED
+        self.task_queue_manager.mark_task_completed(task.id)
+        self.retry_manager.defer(task.id, delay, self._requeue_deferred_task)
+        self.deferred_task_count += 1
+        logging.info(f"Circuit open for task {task.id} endpoints, deferred for {delay:.1f}s")
+        return True
+
+    def _requeue_deferred_task(self, task_id):
+        """Put a deferred task back into the queue once its breakers may have recovered."""
+        task = self.task_repository.get_by_id(task_id)
+        if not task:
+            logging.warning(f"Deferred task {task_id} not found")
+            return
+        self.task_queue_manager.add_task(task_id, task.priority)
+
+    def get_circuit_breaker_metrics(self):
+        """Return breaker state per endpoint and the number of tasks deferred so far."""
+        return {
+            "breakers": self.circuit_breakers.get_metrics() if self.circuit_breakers else {},
+            "deferred_tasks": self.deferred_task_count
+        }
+
     def _handle_task_timeout(self, task_id):
         """Handle a task timeout by cancelling it and updating status."""
         if task_id in self.futures:
-            # Cancel the future if still running
+            # Cancel the future if still running; a worker that keeps running no longer owns the task
             self.futures[task_id].cancel()
+            self.task_executor.revoke_attempt(task_id)
+            
+            task = self.task_repository.get_by_id(task_id)
+            if task and not task.can_transition_to(TaskStatus.TIMEOUT):
+                # The worker finished just before the timer fired
+                logging.info(f"Task {task_id} already {task.status.value}, ignoring timeout")
+                return
             
             # Update task status to TIMEOUT
             self.task_repository.update_task_status(task_id, TaskStatus.TIMEOUT)
@@ -207,30 +377,38 @@ class SchedulerService:
             logging.warning(f"Task {task_id} timed out after configured timeout period")
             
             # Check if the task should be retried
-            task = self.task_repository.get_by_id(task_id)
-            if task and task.should_retry():
-                self.retry_manager.schedule_retry(task, self._retry_task)
+            if task:
+                self._retry_or_discard(task)
 
     def _execute_and_track(self, task_id):
-        """Execute task and track status."""
+        """Execute task and track status; failed tasks are retried per their retry policy."""
         try:
-            self.task_repository.update_task_status(task_id, TaskStatus.RUNNING)
-            result = self.task_executor.execute_task(task_id)
-            
-            # Clean up timeout timer if it exists
-            self.timeout_manager.cancel_timeout(task_id)
-                
-            return result
+            # execute_task marks the task RUNNING itself and re-raises failures for the retry below
+            return self.task_executor.execute_task(task_id, raise_on_failure=True)
         except Exception as e:
             logging.error(f"Error executing task {task_id}: {e}")
-            self.task_repository.update_task_status(task_id, TaskStatus.FAILED)
             
-            # Check if task should be retried
+            # After a timeout the task was moved on (TIMEOUT/RETRY); the late failure is not ours to record
             task = self.task_repository.get_by_id(task_id)
-            if task and task.should_retry():
-                self.retry_manager.schedule_retry(task, self._retry_task)
+            if task and task.status in (TaskStatus.QUEUED, TaskStatus.RUNNING, TaskStatus.FAILED):
+                self.task_repository.update_task_status(task_id, TaskStatus.FAILED)
+                
+                # Check if task should be retried
+                self._retry_or_discard(task)
+            else:
+                logging.warning(f"Task {task_id} is {task.status.value if task else 'gone'}, not marking it FAILED")
                 
             raise
+        finally:
+            # Clean up timeout timer if it exists
+            self.timeout_manager.cancel_timeout(task_id)
+
+    def _retry_or_discard(self, task):
+        """Schedule a retry of a failed task; if none is scheduled, drop its resumable progress."""
+        if task.should_retry() and self.retry_manager.schedule_retry(
+                task, self._retry_task, min_delay=self._breaker_delay(task)):
+            return
+        self.task_executor.discard_progress(task)
 
     def _task_completed(self, task_id):
         """Clean up after task completion and check dependents."""
@@ -254,7 +432,7 @@ class SchedulerService:
                     dep_task.id,
                     dep_task.cron_expr,
                     dep_task.priority,
-                    self._scheduled_task_wrapper
+                    tolerance=dep_task.schedule_tolerance_seconds
                 )
             else:
                 # Add to queue
@@ -264,12 +442,6 @@ class SchedulerService:
                 
         logging.info(f"Task {task_id} completed and removed from tracking")
 
-    def _scheduled_task_wrapper(self, task_id, priority):
-        """Wrapper for scheduled tasks to add them to the queue."""
-        self.task_queue_manager.add_task(task_id, priority)
-        self.task_repository.update_task_status(task_id, TaskStatus.QUEUED)
-        logging.info(f"Scheduled task {task_id} triggered and added to queue")
-
     def _retry_task(self, task_id):
         """Handle task retry by adding it back to the queue."""
         task = self.task_repository.get_by_id(task_id)
@@ -277,12 +449,9 @@ class SchedulerService:
             logging.warning(f"Retry task {task_id} not found")
             return
             
-        # Reset task status to PENDING
-        self.task_repository.update_task_status(task_id, TaskStatus.PENDING)
-        
-        # Add back to queue with original priority
-        self.task_queue_manager.add_task(task_id, task.priority)
+        # RETRY -> QUEUED in a single write, then add back to queue with original priority
         self.task_repository.update_task_status(task_id, TaskStatus.QUEUED)
+        self.task_queue_manager.add_task(task_id, task.priority)
         logging.info(f"Retrying task {task_id}, attempt {task.retry_policy.current_retries}")
 
     def shutdown(self):
@@ -296,10 +465,17 @@ class SchedulerService:
         # Cancel all timeout timers
         self.timeout_manager.shutdown()
         
+        # Stop firing scheduled tasks
+        self.scheduled_task_manager.shutdown()
+        
         # Shutdown result reporting service
         self.result_reporting_service.shutdown()
         
         # Shutdown thread pool and scheduler
         self.executor.shutdown(wait=True)
         self.scheduler.shutdown()
+        
+        # Write out the final scheduler state
+        if self.state_store:
+            self.state_store.close()
         logging.info("Scheduler Service shutdown complete.")
\ No newline at end of file
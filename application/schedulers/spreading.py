@@ -0,0 +1,56 @@
+# scheduler/spreading.py
+
+import hashlib
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Hashable, Optional
+
+from apscheduler.triggers.base import BaseTrigger
+
+@dataclass
+class SpreadPolicy:
+    """
+    Opt-in policy that spreads cron-triggered work over a window instead of
+    firing everything at the exact cron instant.
+
+    Each task gets a deterministic offset derived from a hash of its id, so the
+    same task always fires at the same second of the window (stable across
+    restarts and processes). A task's tolerance caps its offset.
+    """
+    enabled: bool = False
+    window_seconds: int = 300
+
+    def offset_for(self, key: Hashable, tolerance: Optional[int] = None) -> int:
+        """Return the offset in seconds for key, within [0, min(window, tolerance)]."""
+        if not self.enabled:
+            return 0
+        window = self.window_seconds
+        if tolerance is not None:
+            window = min(window, tolerance)
+        if window <= 0:
+            return 0
+        digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') % (window + 1)
+
+class OffsetTrigger(BaseTrigger):
+    """
+    APScheduler trigger that shifts every fire time of a wrapped trigger by a
+    fixed offset; used to spread the built-in cron jobs.
+    """
+    def __init__(self, trigger: BaseTrigger, offset_seconds: int):
+        self.trigger = trigger
+        self.offset = timedelta(seconds=offset_seconds)
+
+    def get_next_fire_time(self, previous_fire_time, now):
+        if previous_fire_time is not None:
+            previous_fire_time = previous_fire_time - self.offset
+        next_fire_time = self.trigger.get_next_fire_time(previous_fire_time, now - self.offset)
+        if next_fire_time is None:
+            return None
+        return next_fire_time + self.offset
+
+    def __str__(self):
+        return f"offset[{self.trigger}, +{int(self.offset.total_seconds())}s]"
+
+    def __repr__(self):
+        return f"<OffsetTrigger ({self.trigger!r}, offset={int(self.offset.total_seconds())}s)>"
@@ -1,3 +1,4 @@
 from .result_reporting_service import ResultReportingService
+from .result_outbox import ResultOutbox
 
-__all__ = ['ResultReportingService'] 
\ No newline at end of file
+__all__ = ['ResultReportingService', 'ResultOutbox']
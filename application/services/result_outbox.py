@@ -0,0 +1,149 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+class ResultOutbox:
+    """
+    In-process outbox for task result notifications.
+
+    Task workers only enqueue (task, result_item); dedicated reporter threads
+    drain the queue in batches and hand each batch to
+    ResultReporter.handle_task_results, retrying failed batches with
+    exponential backoff. Task worker slots are therefore released as soon as
+    the task's own work is done.
+    """
+    def __init__(self, result_reporter, workers: int = 1, batch_size: int = 20, batch_wait: float = 0.2,
+                 max_attempts: int = 3, retry_backoff: float = 1.0, max_queue: int = 10000):
+        """
+        Args:
+            result_reporter: ResultReporter used to deliver batches
+            workers: Number of reporter threads
+            batch_size: Max results delivered in one call
+            batch_wait: Seconds to wait for more results after the first one of a batch
+            max_attempts: Delivery attempts per batch before it is dropped
+            retry_backoff: Initial delay between attempts (doubled each time)
+            max_queue: Queue bound; results beyond it are dropped and counted
+        """
+        self.result_reporter = result_reporter
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+
+        self._queue: "queue.Queue[Optional[Tuple[Any, Dict[str, Any]]]]" = queue.Queue(maxsize=max_queue)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+        self._stats = {
+            "enqueued": 0,
+            "delivered": 0,
+            "batches": 0,
+            "retries": 0,
+            "failed": 0,
+            "dropped": 0
+        }
+
+    def start(self):
+        """Start the reporter threads (no-op if already running)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"ResultOutbox-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logging.info(f"ResultOutbox started with {self.workers} reporter thread(s)")
+
+    def submit(self, task, result_item: Dict[str, Any]) -> bool:
+        """Enqueue a result for reporting. Returns False if the outbox is full."""
+        if not self._threads:
+            self.start()
+        try:
+            self._queue.put_nowait((task, result_item))
+        except queue.Full:
+            self._count("dropped")
+            logging.error(f"ResultOutbox full, dropping result of task {getattr(task, 'id', None)}")
+            return False
+        self._count("enqueued")
+        return True
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    def _next_batch(self) -> Optional[List[Tuple[Any, Dict[str, Any]]]]:
+        """Block for the first item, then collect more for up to batch_wait. None means stop."""
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the stop marker back for this worker's next loop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._deliver(batch)
+
+    def _deliver(self, batch: List[Tuple[Any, Dict[str, Any]]]):
+        delay = self.retry_backoff
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.result_reporter.handle_task_results(batch)
+                self._count("batches")
+                self._count("delivered", len(batch))
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self._count("failed", len(batch))
+                    logging.error(f"ResultOutbox giving up on {len(batch)} result(s) after {attempt} attempts: {e}")
+                    return
+                self._count("retries")
+                logging.warning(f"ResultOutbox delivery attempt {attempt} failed, retrying in {delay:.1f}s: {e}")
+                # During shutdown retry without sleeping
+                if not self._stopping.wait(delay):
+                    delay *= 2
+
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self.pending_count()
+        return stats
+
+    def shutdown(self, timeout: float = 10.0):
+        """Deliver what is already queued, then stop the reporter threads."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+        # Stop backoff sleeps; queued results ahead of the stop markers are still delivered
+        self._stopping.set()
+        for _ in threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        logging.info(f"ResultOutbox stopped, {self.pending_count()} result(s) left undelivered")
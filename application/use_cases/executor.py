@@ -6,22 +6,116 @@ Contains logic for executing different types of tasks with multi-threading suppo
 import logging
 import time
 import concurrent.futures
+import contextvars
+import threading
 from datetime import datetime
 
-from domain.services.jira_data_processor import JiraDataProcessor
-from domain.services.mattermost_data_processor import MattermostDataProcessor
-from domain.services.confluence_data_processor import ConfluenceDataProcessor
-from domain.entities.models import TaskStatus, TaskScheduleType
+from domain.entities.models import TaskStatus
+from domain.exceptions import InvalidStatusTransition
+from application.use_cases.handler_registry import HandlerRegistry, default_handler_registry
+from application.use_cases.result_cache import ResultCache
+from infrastructure.monitoring.resource_accounting import ResourceAccountant
+
+# Attempt run by the current worker thread, set for the duration of execute_task
+_current_attempt = contextvars.ContextVar("task_attempt", default=None)
 
 class TaskExecutor:
     """
     Contains the logic for executing tasks with multi-threading support.
+    Tagged tasks are dispatched through a HandlerRegistry; tasks without a
+    registered tag run the default Jira -> Mattermost/Confluence flow.
     """
-    def __init__(self, task_repository, task_result_repo, di_container, max_task_threads=3):
+    def __init__(self, task_repository, task_result_repo, di_container, max_task_threads=3,
+                 handler_registry: HandlerRegistry = None, result_cache: ResultCache = None,
+                 resource_accountant: ResourceAccountant = None):
         self.task_repository = task_repository
         self.task_result_repo = task_result_repo
         self.di_container = di_container
         self.max_task_threads = max_task_threads
+        self.handler_registry = handler_registry or default_handler_registry()
+        self.result_cache = result_cache or ResultCache()
+        self.resource_accountant = resource_accountant or ResourceAccountant()
+
+        # task_id -> attempt currently allowed to write the task's final status
+        self._attempts = {}
+        self._attempts_lock = threading.Lock()
+
+    def _start_attempt(self, task_id):
+        """Make the calling worker the owner of task_id, replacing any older attempt."""
+        attempt = object()
+        with self._attempts_lock:
+            self._attempts[task_id] = attempt
+        return _current_attempt.set((task_id, attempt))
+
+    def _end_attempt(self, attempt_token):
+        task_id, attempt = _current_attempt.get()
+        _current_attempt.reset(attempt_token)
+        with self._attempts_lock:
+            if self._attempts.get(task_id) is attempt:
+                del self._attempts[task_id]
+
+    def revoke_attempt(self, task_id):
+        """
+        Take task_id away from the worker running it (e.g. on timeout), so its
+        late DONE/FAILED no longer overwrites the status the scheduler sets.
+        """
+        with self._attempts_lock:
+            self._attempts.pop(task_id, None)
+
+    def finish_task(self, task_id, new_status) -> bool:
+        """
+        Write the final status of the attempt running in this worker. It is a
+        logged no-op if the attempt no longer owns the task (timed out, or a
+        newer attempt started) or the task is no longer RUNNING.
+
+        Returns True if the status was written.
+        """
+        current = _current_attempt.get()
+        with self._attempts_lock:
+            if current is None or current[0] != task_id or self._attempts.get(task_id) is not current[1]:
+                logging.warning(f"Ignoring {new_status} for task {task_id}: this attempt no longer owns it")
+                return False
+            task = self.task_repository.get_by_id(task_id)
+            if task is None or task.status != TaskStatus.RUNNING:
+                logging.warning(f"Ignoring {new_status} for task {task_id}: task is no longer running")
+                return False
+            try:
+                self.task_repository.update_task_status(task_id, new_status)
+            except InvalidStatusTransition as e:
+                logging.warning(f"Ignoring {new_status} for task {task_id}: {e}")
+                return False
+        return True
+
+    def discard_progress(self, task):
+        """
+        Drop the resumable progress of a task that will not be retried, so its
+        next scheduled run starts over instead of skipping finished items.
+        """
+        if "BULK_JIRA_TASK" in task.tags:
+            self.di_container.get_bulk_checkpoint_store().clear(task.id)
+
+    def get_handler_spec(self, task):
+        """Return the HandlerSpec that will run task, or None for the default flow."""
+        return self.handler_registry.spec_for(task.tags)
+
+    def run_idempotent(self, tag, parameters, compute):
+        """
+        Run compute() through the result cache if the handler for tag is
+        idempotent. Cache hits and shared in-flight runs are marked in the
+        returned result (which ends up in execution_details).
+        """
+        spec = self.handler_registry.get_spec(tag)
+        if spec is None or not spec.idempotent:
+            return compute()
+
+        key = ResultCache.make_key(tag, parameters, spec.cache_exclude)
+        result, status, age = self.result_cache.get_or_compute(key, compute)
+        if status == "miss":
+            return result
+        logging.info(f"{tag} result served from cache ({status}, age {age:.1f}s)")
+        result = dict(result)
+        result["cache"] = {"status": status, "age_seconds": round(age, 3)}
+        return result
 
     def read_data(self):
         """
@@ -32,46 +126,51 @@ class TaskExecutor:
         time.sleep(2)  # Simulate I/O or network call
         print("Sample Data read from external source.")
 
-    def execute_task(self, task_id):
+    def get_required_endpoints(self, task):
+        """
+        Return the external endpoints (Jira environments, Confluence base URL)
+        the task will call, so the scheduler can hold it back while one of
+        their circuit breakers is open.
+        """
+        config = self.di_container.settings.config_file
+        jira_url = config.get('jira', {}).get('url')
+        confluence_url = config.get('confluence', {}).get('url')
+
+        if "JIRA_TASK_EXP" in task.tags:
+            # Each environment is called through its pooled client, whose URL keys the breaker
+            client_pool = self.di_container.get_jira_client_pool()
+            endpoints = (client_pool.endpoint_for(env) for env in task.parameters.get('jira_envs', []))
+            return list(dict.fromkeys(url for url in endpoints if url))
+        elif "BULK_JIRA_TASK" in task.tags:
+            return [jira_url] if jira_url else []
+        return [url for url in (jira_url, confluence_url) if url]
+
+    def execute_task(self, task_id, raise_on_failure=False):
         """
         Execute a task with support for internal parallel processing.
         Returns a result dictionary that can be saved to task_result_repo.
+        With raise_on_failure, an exception that marked the task FAILED is
+        re-raised once the result is saved, so the scheduler can retry it.
         """
-        # Mark the task as RUNNING
-        self.task_repository.update_task_status(task_id, TaskStatus.RUNNING)
         task = self.task_repository.get_by_id(task_id)
         if not task:
             logging.warning(f"Task with id={task_id} not found.")
             return {"success": False, "error": "Task not found"}
 
         logging.info(f"[{datetime.now()}] Executing task: id={task.id}, name={task.name}, type={task.task_type}...")
+        attempt_token = self._start_attempt(task_id)
+        accounting = self.resource_accountant.start()
+        result = {"success": False, "error": "Task did not run"}
         try:
-            # 检查任务标签，处理JIRA_TASK_EXP标签
-            if "JIRA_TASK_EXP" in task.tags:
-                jira_processor = self.di_container.get_jira_data_processor()
-                
-                # 构造任务参数
-                jira_task_params = {
-                    "jira_envs": task.parameters.get('jira_envs', []),
-                    "key_type": task.parameters.get('key_type'),  # "root_ticket" 或 "project"
-                    "key_value": task.parameters.get('key_value'),
-                    "user": task.parameters.get('user'),
-                    "is_scheduled": task.task_type == TaskScheduleType.SCHEDULED
-                }
-                
-                # 调用处理方法
-                result = jira_processor.process_jira_task_exp(jira_task_params)
-                logging.info(f"JIRA_TASK_EXP processing result: {result}")
-                
-                # 任务完成，标记为DONE
-                self.task_repository.update_task_status(task_id, TaskStatus.DONE)
-                logging.info(f"Task {task.id} completed successfully.")
+            # Mark the task as RUNNING; if it can no longer run, the failure is still recorded below
+            self.task_repository.update_task_status(task_id, TaskStatus.RUNNING)
+
+            spec = self.handler_registry.spec_for(task.tags)
+            if spec is not None:
+                handler = self.handler_registry.resolve(spec.tag)
+                result = handler(self, task)
                 return result
-                
-            # 处理批量Jira任务
-            elif "BULK_JIRA_TASK" in task.tags:
-                return self.execute_bulk_jira_task(task_id)
-                
+
             # For this specific task create a thread pool
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_task_threads, 
                                                      thread_name_prefix=f"Task{task_id}Worker") as task_executor:
@@ -90,9 +189,9 @@ class TaskExecutor:
                 if need_post_process:
                     logging.info("JIRA check indicates we need to proceed with post-processing...")
                     
-                    # Submit two follow-up tasks in parallel
-                    future_mattermost = task_executor.submit(self._process_mattermost)
-                    future_confluence = task_executor.submit(self._process_confluence)
+                    # Submit two follow-up tasks in parallel (in this task's context so their calls are accounted)
+                    future_mattermost = task_executor.submit(contextvars.copy_context().run, self._process_mattermost)
+                    future_confluence = task_executor.submit(contextvars.copy_context().run, self._process_confluence)
                     
                     # Wait for both tasks to complete
                     mattermost_result = future_mattermost.result()
@@ -101,36 +200,43 @@ class TaskExecutor:
                     logging.info(f"Parallel processing results - Mattermost: {mattermost_result}, Confluence: {confluence_result}")
 
             # Task completed, mark as DONE
-            self.task_repository.update_task_status(task_id, TaskStatus.DONE)
+            self.finish_task(task_id, TaskStatus.DONE)
             logging.info(f"Task {task.id} completed successfully.")
             result = {"success": True}
 
         except Exception as e:
             # If exception occurs, mark as FAILED
-            self.task_repository.update_task_status(task_id, TaskStatus.FAILED)
             logging.error(f"Task {task.id} failed with error: {e}")
             result = {"success": False, "error": str(e)}
+            # A timed-out attempt no longer owns the task and leaves the retry to the timeout
+            if self.finish_task(task_id, TaskStatus.FAILED) and raise_on_failure:
+                raise
         
         finally:
+            self._end_attempt(attempt_token)
+
             # Save the result regardless of success or failure
+            execution_details = result
+            if accounting is not None:
+                # Copy: the handler's result may be shared (e.g. held by the result cache)
+                execution_details = dict(result, resources=accounting.stop())
             taskDto = self.task_repository.get_by_id(task_id)
             result_item = {
                 "task_id": task_id,
                 "result_value": f"processed_{task_id}",
                 "result_status_value": f"{taskDto}",
                 "timestamp": time.time(),
-                "execution_details": result
+                "execution_details": execution_details
             }
             self.task_result_repo.add(result_item)
             logging.info(f"execute_task({task_id}) done, result saved.")
 
             # [新增] 使用外部注入类对结果进行后续处理（发送到 Mattermost 等）
             if taskDto:
-                # 从 DIContainer 获取我们注册的 ResultReporter
-                result_reporter = self.di_container.get_result_reporter()
-                result_reporter.handle_task_result(taskDto, result_item)
-            
-            return result
+                # 结果放入 outbox，由独立的 reporter 线程批量发送，不占用任务线程
+                self.di_container.get_result_outbox().submit(taskDto, result_item)
+
+        return result
 
     def _process_mattermost(self):
         """Process Mattermost operations as a parallelizable sub-task"""
@@ -154,92 +260,28 @@ class TaskExecutor:
             logging.error(f"Confluence processing error: {e}")
             return {"confluence_success": False, "error": str(e)}
 
-    def execute_bulk_jira_task(self, task_id):
+    def execute_bulk_jira_task(self, task_id, raise_on_failure=False):
         """
         执行批量Jira tickets创建或更新的任务
-        
+
         :param task_id: 任务ID
+        :param raise_on_failure: 任务因异常标记为FAILED后重新抛出，交给调度器重试
         :return: 包含处理结果的字典
         """
-        # 标记任务为运行中
-        self.task_repository.update_task_status(task_id, TaskStatus.RUNNING)
         task = self.task_repository.get_by_id(task_id)
-        
+
         if not task:
             logging.warning(f"Task with id={task_id} not found.")
             return {"success": False, "error": "Task not found"}
-            
-        logging.info(f"执行批量Jira任务: id={task.id}, name={task.name}")
-        
+
+        attempt_token = self._start_attempt(task_id)
         try:
-            # 检查任务是否有BULK_JIRA_TASK标签
-            if "BULK_JIRA_TASK" not in task.tags:
-                error_msg = "任务不包含BULK_JIRA_TASK标签"
-                logging.error(error_msg)
-                self.task_repository.update_task_status(task_id, TaskStatus.FAILED)
-                return {"success": False, "error": error_msg}
-                
-            # 获取任务参数
-            operation_type = task.parameters.get('operation_type', 'create')  # 默认为创建
-            max_workers = task.parameters.get('max_workers', 5)  # 默认为5个线程
-            tickets_data = task.parameters.get('tickets_data', [])
-            is_linked = task.parameters.get('is_linked', False)  # 是否为有层级关系的tickets
-            
-            if not tickets_data:
-                error_msg = "任务参数中缺少tickets_data"
-                logging.error(error_msg)
-                self.task_repository.update_task_status(task_id, TaskStatus.FAILED)
-                return {"success": False, "error": error_msg}
-                
-            # 获取JiraDataProcessor
-            jira_processor = self.di_container.get_jira_data_processor()
-            
-            # 根据tickets是否有层级关系选择合适的处理方法
-            if is_linked:
-                result = jira_processor.process_linked_jira_operations(
-                    tickets_data, operation_type, max_workers
-                )
-            else:
-                result = jira_processor.process_bulk_jira_operations(
-                    tickets_data, operation_type, max_workers
-                )
-                
-            # 检查处理结果
-            if "error" in result and result.get("success") is False:
-                # 任务失败
-                self.task_repository.update_task_status(task_id, TaskStatus.FAILED)
-                logging.error(f"批量Jira任务{task.id}失败: {result['error']}")
-            else:
-                # 任务成功
-                self.task_repository.update_task_status(task_id, TaskStatus.DONE)
-                logging.info(f"批量Jira任务{task.id}完成，成功处理{result.get('success_count', 0)}个tickets")
-                
-            # 保存执行结果
-            result_item = {
-                "task_id": task_id,
-                "result_value": f"bulk_jira_task_{task_id}",
-                "result_status_value": f"{task}",
-                "timestamp": time.time(),
-                "execution_details": result
-            }
-            self.task_result_repo.add(result_item)
-            
-            return result
-            
+            # 标记任务为运行中
+            self.task_repository.update_task_status(task_id, TaskStatus.RUNNING)
+            return self.handler_registry.resolve("BULK_JIRA_TASK")(self, task)
         except Exception as e:
-            # 处理异常
-            error_msg = str(e)
-            logging.error(f"执行批量Jira任务{task.id}时发生错误: {error_msg}")
-            self.task_repository.update_task_status(task_id, TaskStatus.FAILED)
-            
-            # 保存执行结果
-            result_item = {
-                "task_id": task_id,
-                "result_value": f"bulk_jira_task_{task_id}_error",
-                "result_status_value": f"{task}",
-                "timestamp": time.time(),
-                "execution_details": {"success": False, "error": error_msg}
-            }
-            self.task_result_repo.add(result_item)
-            
-            return {"success": False, "error": error_msg}
\ No newline at end of file
+            if self.finish_task(task_id, TaskStatus.FAILED) and raise_on_failure:
+                raise
+            return {"success": False, "error": str(e)}
+        finally:
+            self._end_attempt(attempt_token)
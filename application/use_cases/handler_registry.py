@@ -0,0 +1,112 @@
+"""
+handler_registry.py
+Maps task tags to their handlers. Handlers are referenced by dotted path and
+their modules are imported only the first time a task with that tag runs, so
+heavy dependencies of unused handlers are never loaded.
+"""
+
+import importlib
+import logging
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+class ResourceClass(Enum):
+    IO = "IO"     # dominated by network calls to Jira/Confluence
+    CPU = "CPU"   # dominated by local processing (DataFrames, report generation)
+
+@dataclass(frozen=True)
+class HandlerSpec:
+    """
+    Declaration of a tag handler.
+
+    target is "package.module:function"; the function is called as
+    handler(executor, task) and returns the task's result dictionary.
+    Results of idempotent handlers may be memoized; cache_exclude lists task
+    parameters that do not affect the result (e.g. the requesting user).
+    """
+    tag: str
+    target: str
+    resource_class: ResourceClass = ResourceClass.IO
+    batchable: bool = False
+    idempotent: bool = False
+    cache_exclude: Tuple[str, ...] = ()
+
+class HandlerRegistry:
+    """
+    Tag -> handler registry with O(1) lookup per tag and lazy handler import.
+    """
+    def __init__(self, specs: Iterable[HandlerSpec] = ()):
+        self._specs: Dict[str, HandlerSpec] = {}
+        self._handlers: Dict[str, Callable[[Any, Any], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: HandlerSpec) -> None:
+        """Register (or replace) the handler for spec.tag."""
+        with self._lock:
+            self._specs[spec.tag] = spec
+            self._handlers.pop(spec.tag, None)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self._specs
+
+    def get_spec(self, tag: str) -> Optional[HandlerSpec]:
+        return self._specs.get(tag)
+
+    def spec_for(self, tags: Iterable[str]) -> Optional[HandlerSpec]:
+        """Return the spec of the first tag that has a registered handler."""
+        for tag in tags:
+            spec = self._specs.get(tag)
+            if spec is not None:
+                return spec
+        return None
+
+    def resolve(self, tag: str) -> Callable[[Any, Any], Dict[str, Any]]:
+        """Return the handler callable for tag, importing its module on first use."""
+        handler = self._handlers.get(tag)
+        if handler is not None:
+            return handler
+
+        spec = self._specs.get(tag)
+        if spec is None:
+            raise KeyError(f"No handler registered for tag '{tag}'")
+
+        with self._lock:
+            handler = self._handlers.get(tag)
+            if handler is None:
+                module_name, _, attr = spec.target.partition(':')
+                module = importlib.import_module(module_name)
+                handler = getattr(module, attr)
+                self._handlers[tag] = handler
+                logging.info(f"Loaded handler for tag {tag}: {spec.target}")
+        return handler
+
+    def loaded_tags(self):
+        """Tags whose handler modules have been imported."""
+        return sorted(self._handlers)
+
+DEFAULT_HANDLERS = (
+    HandlerSpec(
+        tag="JIRA_TASK_EXP",
+        target="application.use_cases.handlers.jira_task_exp:handle",
+        resource_class=ResourceClass.CPU,
+        batchable=False,
+        idempotent=True,
+        # Permission is checked per user before the cached export is used
+        cache_exclude=("user",),
+    ),
+    HandlerSpec(
+        tag="BULK_JIRA_TASK",
+        target="application.use_cases.handlers.bulk_jira_task:handle",
+        resource_class=ResourceClass.IO,
+        batchable=True,
+        idempotent=False,
+    ),
+)
+
+def default_handler_registry() -> HandlerRegistry:
+    """Registry with the built-in tag handlers."""
+    return HandlerRegistry(DEFAULT_HANDLERS)
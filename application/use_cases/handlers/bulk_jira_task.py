@@ -0,0 +1,108 @@
+"""
+bulk_jira_task.py
+Handler for tasks tagged BULK_JIRA_TASK: create or update Jira tickets in bulk.
+"""
+
+import logging
+import time
+
+from domain.entities.models import TaskStatus
+from domain.exceptions import IntegrationException
+
+def handle(executor, task):
+    """
+    执行批量Jira tickets创建或更新的任务
+
+    :param executor: TaskExecutor
+    :param task: 任务
+    :return: 包含处理结果的字典
+    """
+    task_id = task.id
+    logging.info(f"执行批量Jira任务: id={task.id}, name={task.name}")
+
+    try:
+        # 检查任务是否有BULK_JIRA_TASK标签
+        if "BULK_JIRA_TASK" not in task.tags:
+            error_msg = "任务不包含BULK_JIRA_TASK标签"
+            logging.error(error_msg)
+            executor.finish_task(task_id, TaskStatus.FAILED)
+            return {"success": False, "error": error_msg}
+
+        # 获取任务参数
+        operation_type = task.parameters.get('operation_type', 'create')  # 默认为创建
+        max_workers = task.parameters.get('max_workers', 5)  # 默认为5个线程
+        tickets_data = task.parameters.get('tickets_data', [])
+        is_linked = task.parameters.get('is_linked', False)  # 是否为有层级关系的tickets
+        idempotency_labels = task.parameters.get('idempotency_labels')  # None: 按配置 jira_bulk.idempotency_labels
+
+        if not tickets_data:
+            error_msg = "任务参数中缺少tickets_data"
+            logging.error(error_msg)
+            executor.finish_task(task_id, TaskStatus.FAILED)
+            return {"success": False, "error": error_msg}
+
+        # 获取JiraDataProcessor
+        jira_processor = executor.di_container.get_jira_data_processor()
+
+        # 按ticket记录进度，重试或重启恢复后只处理未完成的ticket
+        checkpoint = executor.di_container.get_bulk_checkpoint_store().for_task(task_id)
+
+        # 根据tickets是否有层级关系选择合适的处理方法
+        if is_linked:
+            result = jira_processor.process_linked_jira_operations(
+                tickets_data, operation_type, max_workers, checkpoint=checkpoint,
+                idempotency_labels=idempotency_labels
+            )
+        else:
+            result = jira_processor.process_bulk_jira_operations(
+                tickets_data, operation_type, max_workers, checkpoint=checkpoint,
+                idempotency_labels=idempotency_labels
+            )
+
+        # 保存执行结果
+        result_item = {
+            "task_id": task_id,
+            "result_value": f"bulk_jira_task_{task_id}",
+            "result_status_value": f"{task}",
+            "timestamp": time.time(),
+            "execution_details": result
+        }
+        executor.task_result_repo.add(result_item)
+
+        # 检查处理结果
+        if result.get("success") is not False and not result.get("failed_count"):
+            # 任务成功
+            executor.finish_task(task_id, TaskStatus.DONE)
+            logging.info(f"批量Jira任务{task.id}完成，成功处理{result.get('success_count', 0)}个tickets")
+            checkpoint.clear()
+            return result
+
+    except Exception as e:
+        # 处理异常
+        error_msg = str(e)
+        logging.error(f"执行批量Jira任务{task.id}时发生错误: {error_msg}")
+
+        # 保存执行结果
+        result_item = {
+            "task_id": task_id,
+            "result_value": f"bulk_jira_task_{task_id}_error",
+            "result_status_value": f"{task}",
+            "timestamp": time.time(),
+            "execution_details": {"success": False, "error": error_msg}
+        }
+        executor.task_result_repo.add(result_item)
+
+        # 由executor标记FAILED，并交给调度器按重试策略重试（已完成的ticket由checkpoint跳过）
+        raise
+
+    # 任务失败（部分或全部ticket失败）
+    error_msg = result.get("error") or f"{result['failed_count']}个ticket失败"
+    logging.error(f"批量Jira任务{task.id}失败: {error_msg}")
+    if task.should_retry():
+        # 保留checkpoint：由executor标记FAILED并交给调度器重试，重试时只处理未完成的ticket
+        raise IntegrationException(error_msg, code="BULK_JIRA_TASK_FAILED", details=result)
+
+    # 不再重试：清除checkpoint，避免下一次定时运行把之前完成的ticket当作已恢复而跳过
+    checkpoint.clear()
+    executor.finish_task(task_id, TaskStatus.FAILED)
+    return result
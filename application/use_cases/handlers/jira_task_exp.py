@@ -0,0 +1,59 @@
+"""
+jira_task_exp.py
+Handler for tasks tagged JIRA_TASK_EXP: export Jira issues of a root ticket
+or project to a report (xlsx, csv, parquet or arrow).
+"""
+
+import logging
+
+from domain.entities.models import TaskStatus, TaskScheduleType
+from domain.exceptions import IntegrationException
+
+TAG = "JIRA_TASK_EXP"
+
+def handle(executor, task):
+    jira_processor = executor.di_container.get_jira_data_processor()
+
+    # 构造任务参数
+    jira_task_params = {
+        "jira_envs": task.parameters.get('jira_envs', []),
+        "key_type": task.parameters.get('key_type'),  # "root_ticket" 或 "project"
+        "key_value": task.parameters.get('key_value'),
+        "user": task.parameters.get('user'),
+        "is_scheduled": task.task_type == TaskScheduleType.SCHEDULED,
+        "output_format": task.parameters.get('output_format') or 'xlsx',  # xlsx / csv / parquet / arrow
+        "incremental": task.parameters.get('incremental')  # None: scheduled exports sync incrementally
+    }
+    logging.info(f"Processing JIRA_TASK_EXP task with params: {jira_task_params}")
+
+    if not jira_task_params["jira_envs"] or not jira_task_params["key_type"] or not jira_task_params["key_value"]:
+        result = {"success": False, "error": "Missing required parameters"}
+    elif not jira_processor.check_user_permission(
+            jira_task_params["key_type"], jira_task_params["key_value"], jira_task_params["user"],
+            jira_task_params["jira_envs"]):
+        # 权限按用户检查，不走缓存
+        result = {"success": False, "error": f"User {jira_task_params['user']} does not have permission"}
+    else:
+        # 相同参数（不含user）的导出结果可在TTL内复用；导出失败抛出异常，由executor标记FAILED并交给调度器重试
+        result = executor.run_idempotent(TAG, jira_task_params, lambda: _export(jira_processor, jira_task_params))
+    logging.info(f"JIRA_TASK_EXP processing result: {result}")
+
+    if result.get("success"):
+        # 任务完成，标记为DONE
+        executor.finish_task(task.id, TaskStatus.DONE)
+        logging.info(f"Task {task.id} completed successfully.")
+    else:
+        # 参数缺失或无权限：重试也不会成功，直接标记为FAILED
+        executor.finish_task(task.id, TaskStatus.FAILED)
+    return result
+
+def _export(jira_processor, params):
+    result = jira_processor.export_issues(
+        params["jira_envs"], params["key_type"], params["key_value"], params["is_scheduled"],
+        params["output_format"], params["incremental"]
+    )
+    if not result.get("success"):
+        # 所有环境都获取失败或超时（如 Jira 不可用）
+        raise IntegrationException(result.get("error", "JIRA export failed"), code="JIRA_EXPORT_FAILED",
+                                   details=result)
+    return result
@@ -0,0 +1,153 @@
+"""
+result_cache.py
+TTL/LRU memoization of idempotent handler results with single-flight
+de-duplication: concurrent runs with the same key share one computation.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+MISS = "miss"      # computed by this call
+HIT = "hit"        # served from the cache
+SHARED = "shared"  # waited for an identical run that was already in flight
+
+def estimate_size(result: Any) -> int:
+    """Approximate memory held by a result: the length of its JSON encoding."""
+    return len(json.dumps(result, separators=(',', ':'), default=str))
+
+class ResultCache:
+    """
+    In-memory result cache bounded by entry count and by the approximate size
+    of the stored results (least recently used entries are evicted first),
+    with a per-entry TTL. Only complete successful results (result["success"]
+    truthy, result["partial"] not set) no larger than max_bytes are stored.
+    """
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+
+        # key -> (stored_at, result, estimated size)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any], int]]" = OrderedDict()
+        self._bytes = 0
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._shared = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(tag: str, parameters: Dict[str, Any], exclude: Iterable[str] = ()) -> str:
+        """Key for tag + parameters, independent of dict ordering; excluded parameters are ignored."""
+        excluded = set(exclude)
+        canonical = json.dumps(
+            {k: v for k, v in parameters.items() if k not in excluded},
+            sort_keys=True, separators=(',', ':'), default=str
+        )
+        digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        return f"{tag}:{digest}"
+
+    def _get_fresh(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Return a live entry and mark it recently used; drop it if expired. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.clock() - entry[0] > self.ttl_seconds:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str) -> bool:
+        """Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
+
+    def _store(self, key: str, result: Dict[str, Any], size: int) -> None:
+        """Caller holds the lock."""
+        self._remove(key)
+        self._entries[key] = (self.clock(), result, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], str, float]:
+        """
+        Return (result, status, age_seconds) for key, running compute() only
+        if there is neither a fresh cached result nor an identical run in flight.
+        Exceptions raised by compute() propagate to every caller sharing the run.
+        """
+        with self._lock:
+            entry = self._get_fresh(key)
+            if entry is not None:
+                self._hits += 1
+                return entry[1], HIT, self.clock() - entry[0]
+
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self._misses += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            return future.result(), SHARED, 0.0
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        cacheable = isinstance(result, dict) and result.get("success") and not result.get("partial")
+        # Estimated outside the lock; results larger than the whole budget are never stored
+        size = estimate_size(result) if cacheable else 0
+        with self._lock:
+            if cacheable and size <= self.max_bytes:
+                self._store(key, result, size)
+            del self._in_flight[key]
+        future.set_result(result)
+        return result, MISS, 0.0
+
+    def invalidate(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses + self._shared
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "shared": self._shared,
+                "evictions": self._evictions,
+                "in_flight": len(self._in_flight),
+                "hit_ratio": (self._hits + self._shared) / lookups if lookups else 0.0
+            }
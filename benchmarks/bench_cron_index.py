@@ -0,0 +1,97 @@
+"""
+benchmarks/bench_cron_index.py
+
+Registration time and fire accuracy of the native cron index at 100k
+scheduled tasks.
+
+    python -m benchmarks.bench_cron_index [--schedules 100000] [--apscheduler 10000]
+
+The index clock is shifted so the next minute boundary is a couple of
+seconds away; every "* * * * *" schedule then fires in one burst and the
+lag between each task's scheduled time and its push into the
+TaskQueueManager is reported.
+"""
+import argparse
+import statistics
+import threading
+import time
+from uuid import uuid4
+
+from application.schedulers.cron import CronIndex, compile_cron
+from application.schedulers.managers.task_queue_manager import TaskQueueManager
+from domain.entities.models import TaskPriority
+
+EXPRESSIONS = ["0 0 * * *", "*/5 * * * *", "30 2 * * mon-fri", "0 */6 * * *", "15 8 1 * *"]
+
+def bench_registration(n: int) -> None:
+    index = CronIndex(on_fire=lambda *_: None)
+    compile_cron.cache_clear()
+    start = time.perf_counter()
+    for i in range(n):
+        index.add(uuid4(), EXPRESSIONS[i % len(EXPRESSIONS)], TaskPriority.MEDIUM)
+    elapsed = time.perf_counter() - start
+    print(f"register {n} schedules ({len(EXPRESSIONS)} distinct expressions): "
+          f"{elapsed:.3f}s ({elapsed / n * 1e6:.1f} us/schedule), "
+          f"compiled={compile_cron.cache_info().currsize}")
+
+def bench_fire_accuracy(n: int, lead_seconds: float = 2.0) -> None:
+    real_now = time.time()
+    next_minute = (int(real_now) // 60 + 1) * 60
+    # Shift the clock so the next minute boundary is lead_seconds away
+    offset = next_minute - lead_seconds - real_now
+    clock = lambda: time.time() + offset
+
+    queue_manager = TaskQueueManager()
+    lags = []
+    done = threading.Event()
+
+    def on_fire(task_id, priority, scheduled_ts):
+        queue_manager.add_task(task_id, priority)
+        lags.append(clock() - scheduled_ts)
+        if len(lags) == n:
+            done.set()
+
+    index = CronIndex(on_fire=on_fire, clock=clock)
+    for _ in range(n):
+        index.add(uuid4(), "* * * * *", TaskPriority.MEDIUM)
+    index.start()
+    finished = done.wait(timeout=lead_seconds + 120)
+    index.shutdown()
+
+    if not finished:
+        print(f"fire accuracy: only {len(lags)}/{n} schedules fired")
+        return
+    lags.sort()
+    print(f"fire {n} due schedules into TaskQueueManager: "
+          f"first={lags[0] * 1000:.1f}ms p50={statistics.median(lags) * 1000:.1f}ms "
+          f"p99={lags[int(n * 0.99) - 1] * 1000:.1f}ms last={lags[-1] * 1000:.1f}ms")
+
+def bench_apscheduler_registration(n: int) -> None:
+    """Baseline: one APScheduler cron job per task on a running BackgroundScheduler."""
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.cron import CronTrigger
+
+    scheduler = BackgroundScheduler()
+    scheduler.start(paused=True)
+    start = time.perf_counter()
+    for i in range(n):
+        scheduler.add_job(func=print, trigger=CronTrigger.from_crontab(EXPRESSIONS[i % len(EXPRESSIONS)]),
+                          id=f"task_{i}")
+    elapsed = time.perf_counter() - start
+    scheduler.shutdown(wait=False)
+    print(f"apscheduler baseline: register {n} jobs: {elapsed:.3f}s ({elapsed / n * 1e6:.1f} us/job)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schedules", type=int, default=100_000)
+    parser.add_argument("--apscheduler", type=int, default=0,
+                        help="also time APScheduler job registration for this many jobs")
+    args = parser.parse_args()
+
+    bench_registration(args.schedules)
+    bench_fire_accuracy(args.schedules)
+    if args.apscheduler:
+        bench_apscheduler_registration(args.apscheduler)
+
+if __name__ == "__main__":
+    main()
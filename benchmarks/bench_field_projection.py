@@ -0,0 +1,104 @@
+"""
+benchmarks/bench_field_projection.py
+
+Response bytes per query with fields="*all" against the minimal
+fields=/expand= derived by JiraDataProcessor.field_planner, for every
+declared operation. A local fake Jira serves issues shaped like a large
+instance (comments, attachments, worklog, ~150 custom fields; changelog and
+renderedFields on expand) and honours the fields= and expand= parameters.
+
+    python -m benchmarks.bench_field_projection [--page-size 100] [--custom-fields 150]
+
+Bytes are counted by the resource accounting response hook, i.e. what a
+task would report in execution_details["resources"].
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+from domain.services.jira_data_processor import JiraDataProcessor
+from infrastructure.monitoring.resource_accounting import ResourceAccountant
+from integration.external_clients.jira_service import JiraService
+
+def make_issue(i: int, custom_fields: int) -> dict:
+    fields = {
+        "summary": f"Issue {i} summary text",
+        "description": "Lorem ipsum dolor sit amet. " * 20,
+        "status": {"name": "In Progress", "id": "3", "statusCategory": {"key": "indeterminate", "name": "In Progress"}},
+        "issuetype": {"name": "Task", "id": "10002", "subtask": False, "iconUrl": "https://jira/icon.png"},
+        "parent": {"key": f"BENCH-{i - i % 10}"} if i % 10 else None,
+        "labels": ["backend", "q3"],
+        "priority": {"name": "Major", "id": "3"},
+        "assignee": {"name": "dev", "displayName": "Developer", "emailAddress": "dev@example.com"},
+        "reporter": {"name": "pm", "displayName": "Product Manager", "emailAddress": "pm@example.com"},
+        "comment": {"comments": [{"author": {"name": "dev"}, "body": "Comment text " * 25} for _ in range(10)]},
+        "attachment": [{"filename": f"log{n}.txt", "size": 1024, "content": "https://jira/att"} for n in range(3)],
+        "worklog": {"worklogs": [{"timeSpent": "1h", "comment": "work " * 10} for _ in range(5)]},
+    }
+    for n in range(custom_fields):
+        fields[f"customfield_{10000 + n}"] = {"value": f"option {n % 7}", "id": str(n)} if n % 3 else None
+    return {"id": str(i), "key": f"BENCH-{i}", "self": f"https://jira/rest/api/2/issue/{i}", "fields": fields}
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    custom_fields = 150
+    total = 1000
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        start = int(params.get("startAt", ["0"])[0])
+        limit = int(params.get("maxResults", ["50"])[0])
+        requested = params.get("fields", ["*all"])[0].split(",")
+        expand = set(params.get("expand", [""])[0].split(",")) - {""}
+
+        issues = []
+        for i in range(start, min(start + limit, self.total)):
+            issue = make_issue(i, self.custom_fields)
+            if "*all" not in requested:
+                issue["fields"] = {k: v for k, v in issue["fields"].items() if k in requested}
+            if "changelog" in expand:
+                issue["changelog"] = {"histories": [{"items": [{"field": "status", "toString": "Done"}]}] * 15}
+            if "renderedFields" in expand:
+                issue["renderedFields"] = {k: f"<p>{v}</p>" for k, v in issue["fields"].items() if v}
+            issues.append(issue)
+        body = json.dumps({"startAt": start, "maxResults": limit, "total": self.total, "issues": issues}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def measure(service: JiraService, fields: str, expand, page_size: int) -> int:
+    scope = ResourceAccountant().start()
+    service.search_issues("project = BENCH", fields=fields, expand=expand, limit=page_size)
+    return scope.stop()["bytes_received"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--custom-fields", type=int, default=150)
+    args = parser.parse_args()
+
+    FakeJiraHandler.custom_fields = args.custom_fields
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeJiraHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        service = JiraService(f"http://127.0.0.1:{server.server_address[1]}", "bench", "bench")
+        planner = JiraDataProcessor(Mock()).field_planner
+        baseline = measure(service, "*all", None, args.page_size)
+        print(f"{args.page_size} issues per query, {args.custom_fields} custom fields")
+        print(f"{'operation':<28} {'fields=':<40} {'bytes':>10} {'*all bytes':>11} {'saved':>7}")
+        for operation, params in planner.get_plans().items():
+            planned = measure(service, params["fields"], params["expand"], args.page_size)
+            saved = 1 - planned / baseline
+            print(f"{operation:<28} {params['fields'][:40]:<40} {planned:>10} {baseline:>11} {saved:>6.1%}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
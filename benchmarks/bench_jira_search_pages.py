@@ -0,0 +1,82 @@
+"""
+benchmarks/bench_jira_search_pages.py
+
+JiraService.search_issues(fetch_all=True) against a local fake Jira
+(/rest/api/2/search) that sleeps a configurable latency per request, with
+sequential paging (page_workers=1) against concurrent paging.
+
+    python -m benchmarks.bench_jira_search_pages [--issues 5000] [--page-size 100]
+        [--latency-ms 100] [--workers 1 4 8]
+
+Circuit breakers are not configured, so only pagination is measured.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from integration.external_clients.jira_service import JiraService
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    total = 0
+    latency = 0.0
+    server_max_results = 1000
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/rest/api/2/search"):
+            self.send_error(404)
+            return
+        params = parse_qs(url.query)
+        start = int(params.get("startAt", ["0"])[0])
+        limit = min(int(params.get("maxResults", ["50"])[0]), self.server_max_results)
+        time.sleep(self.latency)
+        issues = [
+            {"id": str(i), "key": f"BENCH-{i}",
+             "fields": {"summary": f"Issue {i}", "status": {"name": "Open"}, "issuetype": {"name": "Task"}}}
+            for i in range(start, min(start + limit, self.total))
+        ]
+        body = json.dumps({"startAt": start, "maxResults": limit, "total": self.total, "issues": issues}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_fake_jira(total: int, latency: float) -> ThreadingHTTPServer:
+    FakeJiraHandler.total = total
+    FakeJiraHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeJiraHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    server = start_fake_jira(args.issues, args.latency_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    pages = -(-args.issues // args.page_size)
+    print(f"{args.issues} issues, {pages} pages of {args.page_size}, {args.latency_ms:.0f}ms per request")
+    try:
+        for workers in args.workers:
+            service = JiraService(url, "bench", "bench", page_workers=workers)
+            start = time.perf_counter()
+            issues = service.search_issues("project = BENCH", limit=args.page_size, fetch_all=True)
+            elapsed = time.perf_counter() - start
+            in_order = all(issue["key"] == f"BENCH-{i}" for i, issue in enumerate(issues))
+            print(f"page_workers={workers:<3} {elapsed:7.2f}s  issues={len(issues)} in_order={in_order}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+benchmarks/bench_report_export.py
+
+Export time, peak RSS and output size of the JIRA_TASK_EXP report at
+10k/100k/500k issues for each streaming output format (xlsx, csv, parquet,
+arrow; rows written as pages arrive), plus the previous Excel path (all
+issues in memory -> pandas DataFrames -> pd.ExcelWriter) as "pandas".
+
+    python -m benchmarks.bench_report_export [--sizes 10000 100000 500000]
+        [--impl xlsx csv parquet arrow pandas] [--compression zstd]
+
+Every (implementation, size) pair runs in its own subprocess so peak RSS is
+not inherited from an earlier run. "rss_delta" is the peak minus the RSS
+after imports, i.e. the memory used by the export itself. Output size is the
+total of all files a format produces (root + child).
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PAGE_SIZE = 100
+
+def generate_issues(n: int):
+    """Issues in Jira pagination order; every tenth one is a root, the rest are its children."""
+    for i in range(n):
+        parent = None if i % 10 == 0 else {"key": f"BENCH-{i - i % 10}"}
+        yield {
+            "key": f"BENCH-{i}",
+            "jira_environment": "env1.jira.com",
+            "fields": {
+                "summary": f"Benchmark issue {i} with a realistic length summary",
+                "status": {"name": "In Progress"},
+                "issuetype": {"name": "Task" if parent else "Epic"},
+                "parent": parent,
+            },
+        }
+
+def pages(n: int):
+    page = []
+    for issue in generate_issues(n):
+        page.append(issue)
+        if len(page) == PAGE_SIZE:
+            yield page
+            page = []
+    if page:
+        yield page
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def export_streaming(output_format: str, n: int, base_path: str, compression: str) -> list:
+    from domain.services.report_writers import create_report_writer
+
+    writer = create_report_writer(output_format, base_path, compression=compression)
+    for page in pages(n):
+        writer.write_issues(page)
+    return writer.close()
+
+def export_pandas(n: int, base_path: str) -> list:
+    """The pre-streaming implementation of _generate_excel_data + _save_excel."""
+    import pandas as pd
+
+    path = f"{base_path}.xlsx"
+    issues = [issue for page in pages(n) for issue in page]
+    root_data, child_data = [], []
+    for issue in issues:
+        fields = issue['fields']
+        row = {'Key': issue['key'], 'Summary': fields['summary'], 'Status': fields['status']['name'],
+               'Type': fields['issuetype']['name'], 'Environment': issue.get('jira_environment', '')}
+        if fields.get('parent'):
+            child_data.append({'Key': row['Key'], 'Parent Key': fields['parent']['key'],
+                               **{k: v for k, v in row.items() if k != 'Key'}})
+        else:
+            root_data.append(row)
+    excel_data = {'Root Issues': pd.DataFrame(root_data), 'Child Issues': pd.DataFrame(child_data)}
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet_name, df in excel_data.items():
+            if not df.empty:
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+    return [path]
+
+FORMATS = ["xlsx", "csv", "parquet", "arrow"]
+IMPLEMENTATIONS = FORMATS + ["pandas"]
+
+def run_one(impl: str, n: int, compression: str) -> dict:
+    """Executed inside the child process."""
+    # Import everything up front so the baseline RSS includes the libraries
+    import openpyxl  # noqa: F401
+    if impl == "pandas":
+        import pandas  # noqa: F401
+    if impl in ("parquet", "arrow"):
+        import pyarrow.parquet  # noqa: F401
+        import pyarrow.ipc  # noqa: F401
+    import domain.services.report_writers  # noqa: F401
+
+    baseline = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = os.path.join(tmp, "report")
+        start = time.perf_counter()
+        if impl == "pandas":
+            paths = export_pandas(n, base_path)
+        else:
+            paths = export_streaming(impl, n, base_path, compression)
+        elapsed = time.perf_counter() - start
+        size_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+    peak = peak_rss_mb()
+    return {"impl": impl, "issues": n, "seconds": elapsed, "peak_rss_mb": peak,
+            "rss_delta_mb": peak - baseline, "file_mb": size_mb}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--impl", nargs="+", choices=IMPLEMENTATIONS, default=IMPLEMENTATIONS)
+    parser.add_argument("--compression", default="zstd", help="parquet/arrow compression")
+    parser.add_argument("--child", nargs=2, metavar=("IMPL", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(args.child[0], int(args.child[1]), args.compression)))
+        return
+
+    print(f"{'impl':<10} {'issues':>8} {'time':>9} {'peak RSS':>10} {'RSS delta':>10} {'file':>8}")
+    for n in args.sizes:
+        for impl in args.impl:
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_report_export", "--child", impl, str(n),
+                 "--compression", args.compression],
+                capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                print(f"{impl:<10} {n:>8} failed (exit {proc.returncode}): {proc.stderr.strip()[-200:]}")
+                continue
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{r['impl']:<10} {r['issues']:>8} {r['seconds']:>8.2f}s {r['peak_rss_mb']:>8.1f}MB "
+                  f"{r['rss_delta_mb']:>8.1f}MB {r['file_mb']:>6.1f}MB")
+
+if __name__ == "__main__":
+    main()
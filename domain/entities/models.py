@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, FrozenSet
 from pydantic import BaseModel, Field
 from uuid import UUID, uuid4
 
+from domain.exceptions import InvalidStatusTransition
+
 # Task tags is been used to identify the task type
 class TaskTags:
     JIRA_TASK_EXP = "JIRA_TASK_EXP"  # task export service type
@@ -23,6 +25,21 @@ class TaskStatus(str, Enum):
     RETRY = 'RETRY'  # New status for retry mechanism
     TIMEOUT = 'TIMEOUT'  # New status for timeout
 
+# Allowed status changes; setting a task to the status it already has is always a no-op.
+# TIMEOUT can still be followed by DONE/FAILED because the worker thread cannot be killed
+# and reports its outcome late.
+TASK_STATUS_TRANSITIONS: Dict[TaskStatus, FrozenSet[TaskStatus]] = {
+    TaskStatus.PENDING: frozenset({TaskStatus.QUEUED, TaskStatus.SCHEDULED, TaskStatus.RUNNING, TaskStatus.FAILED}),
+    TaskStatus.SCHEDULED: frozenset({TaskStatus.QUEUED, TaskStatus.RUNNING, TaskStatus.FAILED}),
+    TaskStatus.QUEUED: frozenset({TaskStatus.RUNNING, TaskStatus.TIMEOUT, TaskStatus.FAILED}),
+    TaskStatus.RUNNING: frozenset({TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.TIMEOUT}),
+    TaskStatus.RETRY: frozenset({TaskStatus.QUEUED, TaskStatus.FAILED}),
+    TaskStatus.DONE: frozenset({TaskStatus.QUEUED, TaskStatus.SCHEDULED}),
+    TaskStatus.FAILED: frozenset({TaskStatus.RETRY, TaskStatus.QUEUED, TaskStatus.SCHEDULED}),
+    TaskStatus.TIMEOUT: frozenset({TaskStatus.RETRY, TaskStatus.QUEUED, TaskStatus.SCHEDULED,
+                                   TaskStatus.DONE, TaskStatus.FAILED}),
+}
+
 class TaskPriority(str, Enum):
     HIGH = 'HIGH'
     MEDIUM = 'MEDIUM'
@@ -52,12 +69,27 @@ class Task(BaseModel):
     # Update dependencies to use UUID instead of int
     dependencies: List[UUID] = Field(default_factory=list)
     timeout_seconds: Optional[int] = None
+    schedule_tolerance_seconds: Optional[int] = None  # Max delay after the cron time a scheduled run may start
     retry_policy: Optional[RetryPolicy] = None
     parameters: Dict[str, Any] = Field(default_factory=dict)
     
-    def update_status(self, new_status: TaskStatus):
+    def can_transition_to(self, new_status: TaskStatus) -> bool:
+        """Check whether the task may move from its current status to new_status."""
+        return new_status == self.status or new_status in TASK_STATUS_TRANSITIONS.get(self.status, frozenset())
+
+    def update_status(self, new_status: TaskStatus) -> bool:
+        """
+        Move the task to new_status. Returns False (and changes nothing) if the
+        task already has that status; raises InvalidStatusTransition if the
+        transition is not allowed.
+        """
+        if new_status == self.status:
+            return False
+        if not self.can_transition_to(new_status):
+            raise InvalidStatusTransition(self.id, self.status, new_status)
         self.status = new_status
         self.updated_at = datetime.now()
+        return True
         
     def should_retry(self) -> bool:
         """Check if the task should be retried based on retry policy."""
@@ -71,9 +103,20 @@ class Task(BaseModel):
         if self.retry_policy:
             self.retry_policy.current_retries += 1
             
+    def get_retry_delay(self) -> float:
+        """
+        Exponential backoff delay (seconds) for the current retry attempt:
+        retry_delay * backoff_factor ** (current_retries - 1).
+        """
+        if not self.retry_policy:
+            return 0.0
+
+        attempt = max(self.retry_policy.current_retries, 1)
+        return self.retry_policy.retry_delay * (self.retry_policy.backoff_factor ** (attempt - 1))
+
     def get_next_retry_time(self) -> datetime:
         """Calculate the next retry time based on retry policy."""
         if not self.retry_policy:
             return datetime.now()
             
-        return datetime.now() + timedelta(seconds=self.retry_policy.retry_delay)
\ No newline at end of file
+        return datetime.now() + timedelta(seconds=self.get_retry_delay())
\ No newline at end of file
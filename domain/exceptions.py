@@ -52,6 +52,22 @@ class ApiResponseError(IntegrationException):
             details=error_details
         )
 
+class CircuitOpenError(IntegrationException):
+    """Raised when a call is rejected because the endpoint's circuit breaker is open."""
+    def __init__(self, endpoint: str, retry_after: Optional[float] = None, details: Optional[Dict[str, Any]] = None):
+        error_details = details or {}
+        error_details["endpoint"] = endpoint
+        if retry_after is not None:
+            error_details["retry_after"] = retry_after
+        
+        super().__init__(
+            message=f"Circuit breaker open for {endpoint}",
+            code="CIRCUIT_OPEN",
+            details=error_details
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
 # Domain Layer Exceptions
 class DomainException(BaseAppException):
     """Base exception for all domain layer errors."""
@@ -81,6 +97,24 @@ class BusinessRuleViolation(DomainException):
             details=details
         )
 
+class InvalidStatusTransition(DomainException):
+    """Raised when a task is moved to a status its current status cannot lead to."""
+    def __init__(self, task_id: Any, current_status: Any, new_status: Any, details: Optional[Dict[str, Any]] = None):
+        error_details = details or {}
+        error_details.update({
+            "task_id": str(task_id),
+            "current_status": str(getattr(current_status, "value", current_status)),
+            "new_status": str(getattr(new_status, "value", new_status))
+        })
+        
+        super().__init__(
+            message=f"Task {task_id} cannot move from {error_details['current_status']} to {error_details['new_status']}",
+            code="INVALID_STATUS_TRANSITION",
+            details=error_details
+        )
+        self.current_status = current_status
+        self.new_status = new_status
+
 # Repository Layer Exceptions
 class RepositoryException(BaseAppException):
     """Base exception for all repository layer errors."""
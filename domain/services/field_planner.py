@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+# Jira 总是返回 id/key；请求一个不存在的字段名即可得到不含其他字段的最小响应
+NO_FIELDS = "key"
+# issue JSON 顶层（不在 "fields" 下）的属性，不需要通过 fields= 请求
+TOP_LEVEL_ATTRIBUTES = {"id", "key", "self", "expand", "jira_environment"}
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """一次Jira查询需要的最小 fields= / expand= 参数"""
+    fields: Tuple[str, ...] = ()
+    expand: Tuple[str, ...] = ()
+
+    @property
+    def fields_param(self) -> str:
+        return ",".join(self.fields) if self.fields else NO_FIELDS
+
+    @property
+    def expand_param(self) -> Optional[str]:
+        return ",".join(self.expand) if self.expand else None
+
+def fields_from_paths(paths: Iterable[str]) -> Tuple[str, ...]:
+    """
+    由issue中的点分路径推导需要请求的Jira字段，
+    如 "fields.customfield_10010.value" -> "customfield_10010"；顶层属性（key、id等）不需要请求。
+    """
+    fields = []
+    for path in paths:
+        parts = path.split('.')
+        if parts[0] == 'fields' and len(parts) > 1:
+            fields.append(parts[1])
+        elif parts[0] not in TOP_LEVEL_ATTRIBUTES:
+            fields.append(parts[0])
+    return tuple(dict.fromkeys(fields))
+
+class FieldPlanner:
+    """
+    各操作声明自己读取的Jira字段和expand，查询时由planner给出最小的 fields= / expand=，
+    避免用 "*all" 下载评论、changelog和所有自定义字段。
+    """
+    def __init__(self):
+        self._plans: Dict[str, QueryPlan] = {}
+
+    def declare(self, operation: str, fields: Iterable[str] = (), expand: Iterable[str] = ()) -> QueryPlan:
+        """声明（或替换）某个操作读取的字段"""
+        plan = QueryPlan(tuple(dict.fromkeys(fields)), tuple(dict.fromkeys(expand)))
+        self._plans[operation] = plan
+        return plan
+
+    def plan(self, operation: str, extra_fields: Iterable[str] = (), extra_expand: Iterable[str] = ()) -> QueryPlan:
+        """
+        某个操作的查询计划；extra_* 用于只在本次请求中额外需要的字段
+
+        :raises KeyError: 操作没有声明过字段
+        """
+        declared = self._plans[operation]
+        extra_fields = tuple(extra_fields)
+        extra_expand = tuple(extra_expand)
+        if not extra_fields and not extra_expand:
+            return declared
+        return QueryPlan(tuple(dict.fromkeys(declared.fields + extra_fields)),
+                         tuple(dict.fromkeys(declared.expand + extra_expand)))
+
+    def get_plans(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """所有操作的 fields= / expand= 参数（用于排查和展示）"""
+        return {
+            operation: {"fields": plan.fields_param, "expand": plan.expand_param}
+            for operation, plan in self._plans.items()
+        }
@@ -2,20 +2,85 @@ import logging
 import os
 import time
 import concurrent.futures
+import contextvars
 import threading
+from datetime import timezone
+from zoneinfo import ZoneInfo
 
-import pandas as pd
-from integration.external_clients.jira_service import JiraService
+from integration.external_clients.jira_service import (
+    BULK_CREATE_MAX, JiraService, format_jql_datetime, parse_jira_datetime
+)
+from domain.services.report_writers import PARENT_PATH, FieldMapping, create_report_writer
+from domain.services.field_planner import FieldPlanner, fields_from_paths
+
+# 不使用幂等label时，按summary查找中断前可能已创建的issue：created 从started记录时间往前放宽这么多秒（时钟误差）
+CREATED_LOOKUP_SLACK_SECONDS = 300
 
 class JiraDataProcessor:
     """
     Contains business logic to interpret and respond to JIRA data.
     Delegates real JIRA calls to JiraService (integration).
     """
-    def __init__(self, jira_service: JiraService):
+    def __init__(self, jira_service: JiraService, env_fetch_timeout: float = 30,
+                 max_concurrent_per_env: int = 2, fetch_workers: int = 8,
+                 report_dir: str = "jira_reports", report_compression: str = "zstd",
+                 report_columns: dict = None, bulk_create_chunk_size: int = 0, client_pool=None,
+                 sync_store=None, incremental_scheduled: bool = True, full_resync_interval: float = 86400,
+                 sync_overlap_seconds: float = 120, jql_timezone: str = "UTC", idempotency_labels: bool = False):
+        """
+        :param jira_service: JiraService
+        :param env_fetch_timeout: 多环境导出时每个环境的截止时间（秒），超时的环境在结果中标记
+        :param max_concurrent_per_env: 每个JIRA环境同时进行的导出请求上限（所有任务共享）
+        :param fetch_workers: 多环境并行获取使用的线程数
+        :param report_dir: 报表输出目录
+        :param report_compression: parquet/arrow 报表的压缩算法
+        :param report_columns: 报表列 -> issue中的点分路径（如 "fields.customfield_10010.value"），默认Key/Summary/Status/Type/Environment
+        :param bulk_create_chunk_size: 大于0时批量创建使用 /rest/api/2/issue/bulk，每个请求最多创建这么多tickets（上限50）；0表示逐个创建
+        :param client_pool: 可选的 JiraClientPool；多环境导出时每个环境使用各自的客户端，未提供时都使用 jira_service
+        :param sync_store: 可选的 ExportSyncStore；提供时导出可增量同步（只获取上次之后更新的issues并合并到本地issue集合）
+        :param incremental_scheduled: 定时导出默认使用增量同步（任务参数 incremental 可覆盖）
+        :param full_resync_interval: 增量同步的范围每隔这么多秒做一次全量同步，以去掉Jira中已删除或移出的issues
+        :param sync_overlap_seconds: 增量查询的起点比水位线提前的秒数（JQL只有分钟精度，并覆盖时钟误差）
+        :param jql_timezone: Jira账号的时区（JQL日期时间按该时区解释），如 "UTC"、"Asia/Shanghai"
+        :param idempotency_labels: 批量创建时给每个ticket添加 bulk-<key> label，用于确认中断前是否已创建（会写入Jira数据，
+                                   创建界面没有Labels字段的项目会创建失败）；关闭时按project+summary查找
+        """
         self.jira_service = jira_service
+        self.client_pool = client_pool
+        self.report_dir = report_dir
+        self.report_compression = report_compression
+        self.field_mapping = FieldMapping(report_columns)
+        self.bulk_create_chunk_size = min(bulk_create_chunk_size, BULK_CREATE_MAX)
+        self.idempotency_labels = idempotency_labels
+        
+        # 每个操作只请求自己读取的字段（不使用 "*all"）
+        self.field_planner = FieldPlanner()
+        self.field_planner.declare("check_and_process_tickets", fields=["description"])
+        self.field_planner.declare("export_issues", fields=fields_from_paths(self.field_mapping.paths + [PARENT_PATH]))
+        # 增量同步另需 updated 推进水位线
+        self.field_planner.declare(
+            "export_issues_sync", fields=self.field_planner.plan("export_issues").fields + ("updated",)
+        )
+        self.field_planner.declare("find_created_issue")
+        self.field_planner.declare("find_created_issue_by_summary", fields=["summary"])
         # 添加线程锁，用于保护共享资源在多线程环境下的访问
         self._lock = threading.Lock()
+        
+        self.env_fetch_timeout = env_fetch_timeout
+        self.max_concurrent_per_env = max_concurrent_per_env
+        self._env_semaphores = {}
+        self._fetch_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=fetch_workers, thread_name_prefix="JiraEnvFetch"
+        )
+        
+        self.sync_store = sync_store
+        self.incremental_scheduled = incremental_scheduled
+        self.full_resync_interval = full_resync_interval
+        self.sync_overlap_seconds = sync_overlap_seconds
+        if jql_timezone in (None, "UTC"):
+            self.jql_timezone = timezone.utc
+        else:
+            self.jql_timezone = ZoneInfo(jql_timezone)
 
     def check_and_process_tickets(self, jql: str) -> bool:
         """
@@ -23,19 +88,23 @@ class JiraDataProcessor:
         and decide if further action is needed.
         """
         logging.info("Checking JIRA tickets with JQL: %s", jql)
-        issues = self.jira_service.search_issues(jql, fetch_all=True)
+        # 逐页获取，找到标记后立即停止翻页
+        scanned = 0
+        plan = self.field_planner.plan("check_and_process_tickets")
+        for issue in self.jira_service.search_issues_iter(jql, fields=plan.fields_param, expand=plan.expand_param):
+            if scanned == 0:
+                time.sleep(0.5)  # domain-level logic or transformations
+            scanned += 1
+            # Suppose we find we need post-processing if any issue has a special marker
+            if "SPECIAL_MARKER" in (issue.get('fields', {}).get('description') or ''):
+                logging.info("Found SPECIAL_MARKER after scanning %d issues", scanned)
+                return True
 
-        if not issues:
+        if not scanned:
             logging.info("No matching issues for JQL: %s", jql)
-            return False
-
-        logging.info("Found %d issues. Checking last comments...", len(issues))
-        time.sleep(0.5)  # domain-level logic or transformations
-
-        # Suppose we find we need post-processing if any issue has a special marker
-        need_post_process = any("SPECIAL_MARKER" in i.get('fields', {}).get('description', '')
-                                for i in issues)
-        return need_post_process
+        else:
+            logging.info("Scanned %d issues, no SPECIAL_MARKER found", scanned)
+        return False
 
     
     def process_jira_task_exp(self, task_params):
@@ -48,7 +117,9 @@ class JiraDataProcessor:
             - key_value: 根据key_type，可能是root-ticket key或project key
             - user: 用户名，用于权限检查
             - is_scheduled: 是否为定时任务
-        :return: 包含处理结果的字典，包括success标志和可能的excel文件路径
+            - output_format: 可选，报表格式 xlsx（默认）/ csv / parquet / arrow
+            - incremental: 可选，是否增量同步；默认定时任务增量、手动任务全量
+        :return: 包含处理结果的字典，包括success标志和可能的报表文件路径
         """
         logging.info(f"Processing JIRA_TASK_EXP task with params: {task_params}")
         
@@ -59,133 +130,231 @@ class JiraDataProcessor:
             key_value = task_params.get('key_value')
             user = task_params.get('user')
             is_scheduled = task_params.get('is_scheduled', False)
+            output_format = task_params.get('output_format') or 'xlsx'
+            incremental = task_params.get('incremental')
             
             if not jira_envs or not key_type or not key_value:
                 return {"success": False, "error": "Missing required parameters"}
             
             # 2. 检查用户权限
-            if key_type == "root_ticket":
-                has_permission = self.jira_service.check_project_permission_mock(
-                    key_value.split('-')[0], user
-                )
-            else:  # project key
-                has_permission = self.jira_service.check_project_permission_mock(
-                    key_value, user
-                )
-                
-            if not has_permission:
+            if not self.check_user_permission(key_type, key_value, user, jira_envs):
                 return {"success": False, "error": f"User {user} does not have permission"}
             
-            # 3. 获取JIRA数据
-            all_issues = []
-            for jira_env in jira_envs:
-                if key_type == "root_ticket":
-                    issues_data = self.jira_service.get_issues_by_root_ticket(
-                        jira_env, key_value
-                    )
-                else:  # project key
-                    issues_data = self.jira_service.get_issues_by_project(
-                        jira_env, key_value
-                    )
-                
-                # 将环境信息添加到每个issue
-                for issue in issues_data.get('issues', []):
-                    issue['jira_environment'] = jira_env
-                    all_issues.append(issue)
-            
-            # 4. 生成Excel
-            excel_data = self._generate_excel_data(all_issues)
-            excel_path = self._save_excel(excel_data, key_value, is_scheduled)
-            
-            return {
-                "success": True, 
-                "excel_path": excel_path,
-                "issue_count": len(all_issues)
-            }
+            # 3. 获取JIRA数据并生成报表
+            return self.export_issues(jira_envs, key_type, key_value, is_scheduled, output_format, incremental)
             
         except Exception as e:
             logging.error(f"Error processing JIRA_TASK_EXP task: {e}")
             return {"success": False, "error": str(e)}
     
-    def _generate_excel_data(self, issues):
+    def check_user_permission(self, key_type, key_value, user, jira_envs=None):
         """
-        根据JIRA issues数据生成Excel数据，按照亲子关系组织
+        检查用户是否有权限访问root ticket所在项目或指定项目
         
-        :param issues: JIRA issues列表
-        :return: 包含DataFrame的字典，用于生成Excel工作簿
+        权限通过各环境客户端的 check_project_permission 检查（项目角色成员按环境和项目缓存）。
+        
+        :param key_type: "root_ticket" 或 "project"
+        :param key_value: root-ticket key或project key
+        :param user: 用户名
+        :param jira_envs: 可选，要导出的JIRA环境；用户需要在每个环境中都有权限。不提供时检查默认JIRA
+        :return: 有权限返回True
         """
-        # 创建根issue的DataFrame
-        root_issues = [i for i in issues if 'parent' not in i['fields'] or not i['fields']['parent']]
-        child_issues = [i for i in issues if 'parent' in i['fields'] and i['fields']['parent']]
-        
-        # 转换成DataFrame格式
-        root_data = []
-        for issue in root_issues:
-            root_data.append({
-                'Key': issue['key'],
-                'Summary': issue['fields']['summary'],
-                'Status': issue['fields']['status']['name'],
-                'Type': issue['fields']['issuetype']['name'],
-                'Environment': issue.get('jira_environment', '')
-            })
+        project_key = key_value.split('-')[0] if key_type == "root_ticket" else key_value
+        clients = [self._client_for(env) for env in dict.fromkeys(jira_envs)] if jira_envs else [self.jira_service]
+        # 未单独配置的环境共用默认客户端，只检查一次
+        unique_clients = {id(client): client for client in clients}.values()
+        return all(client.check_project_permission(project_key, user) for client in unique_clients)
+    
+    def export_issues(self, jira_envs, key_type, key_value, is_scheduled, output_format='xlsx', incremental=None):
+        """
+        从各JIRA环境获取issues并流式写出报表（不做权限检查）
         
-        child_data = []
-        for issue in child_issues:
-            child_data.append({
-                'Key': issue['key'],
-                'Parent Key': issue['fields']['parent']['key'],
-                'Summary': issue['fields']['summary'],
-                'Status': issue['fields']['status']['name'],
-                'Type': issue['fields']['issuetype']['name'],
-                'Environment': issue.get('jira_environment', '')
-            })
+        每个环境的issues返回后立即写入报表并释放，不会把所有环境的issues同时保存在内存中。
+        xlsx的Root/Child两个sheet在csv/parquet/arrow格式中是两个单独的文件。
         
-        root_df = pd.DataFrame(root_data) if root_data else pd.DataFrame()
-        child_df = pd.DataFrame(child_data) if child_data else pd.DataFrame()
+        增量模式下每个环境只获取水位线之后更新的issues，合并到本地issue集合后再从该集合分批生成报表。
         
-        return {
-            'Root Issues': root_df,
-            'Child Issues': child_df
+        :param output_format: xlsx / csv / parquet / arrow
+        :param incremental: 是否增量同步；None表示定时任务按incremental_scheduled、手动任务全量。未配置sync_store时总是全量
+        :return: 包含success标志、报表文件路径和issue数量的字典；xlsx格式另含excel_path
+        """
+        if incremental is None:
+            incremental = is_scheduled and self.incremental_scheduled
+        incremental = incremental and self.sync_store is not None
+        writer = create_report_writer(output_format, self._report_path(key_value, is_scheduled),
+                                      compression=self.report_compression, field_mapping=self.field_mapping)
+        try:
+            if incremental:
+                fetched = self.sync_issues_from_envs(jira_envs, key_type, key_value)
+                # 报表只包含本次同步成功的环境，与全量导出一致
+                for env in fetched["ok_envs"]:
+                    for batch in self.sync_store.iter_issues(env, key_type, key_value):
+                        writer.write_issues(batch)
+            else:
+                fetched = self.fetch_issues_from_envs(
+                    jira_envs, key_type, key_value,
+                    on_env_issues=lambda env, issues: writer.write_issues(issues)
+                )
+            if not fetched["ok_envs"]:
+                writer.discard()
+                return {
+                    "success": False,
+                    "error": "所有JIRA环境获取失败或超时",
+                    "timed_out_envs": fetched["timed_out_envs"],
+                    "failed_envs": fetched["failed_envs"]
+                }
+            report_files = writer.close()
+        except Exception:
+            writer.discard()
+            raise
+        
+        result = {
+            "success": True, 
+            "output_format": output_format,
+            "report_files": report_files,
+            "issue_count": writer.issue_count
         }
+        if output_format == 'xlsx':
+            result["excel_path"] = report_files[0]
+        if incremental:
+            result.update({"incremental": True, "full_sync_envs": fetched["full_sync_envs"]})
+        if fetched["timed_out_envs"] or fetched["failed_envs"]:
+            # 部分环境缺失：报表只包含成功的环境
+            result.update({
+                "partial": True,
+                "timed_out_envs": fetched["timed_out_envs"],
+                "failed_envs": fetched["failed_envs"]
+            })
+        return result
     
-    def _save_excel(self, excel_data, key_value, is_scheduled):
+    def _report_path(self, key_value, is_scheduled):
         """
-        将数据保存为Excel文件
-        
-        :param excel_data: 包含DataFrame的字典
-        :param key_value: 用于生成文件名的键值
-        :param is_scheduled: 是否为定时任务
-        :return: 保存的Excel文件路径
+        报表文件路径（不含扩展名）；定时任务的文件名带时间戳
         """
-        # 创建输出目录
-        output_dir = "jira_reports"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # 文件名逻辑：如果是定时任务，加上时间戳
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        os.makedirs(self.report_dir, exist_ok=True)
         if is_scheduled:
-            filename = f"{key_value}_{timestamp}.xlsx"
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            filename = f"{key_value}_{timestamp}"
         else:
-            filename = f"{key_value}.xlsx"
+            filename = key_value
+        return os.path.join(self.report_dir, filename)
+    
+    def _env_semaphore(self, jira_env):
+        with self._lock:
+            semaphore = self._env_semaphores.get(jira_env)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_concurrent_per_env)
+                self._env_semaphores[jira_env] = semaphore
+            return semaphore
+    
+    def _client_for(self, jira_env):
+        """环境对应的JiraService"""
+        if self.client_pool is None:
+            return self.jira_service
+        return self.client_pool.get(jira_env)
+    
+    def _fetch_env(self, jira_env, key_type, key_value, operation="export_issues", updated_since=None):
+        """获取单个环境的issues；同一环境的并发请求数受信号量限制"""
+        fields = list(self.field_planner.plan(operation).fields)
+        jira_service = self._client_for(jira_env)
+        kwargs = {"fields": fields}
+        if updated_since:
+            kwargs["updated_since"] = updated_since
+        with self._env_semaphore(jira_env):
+            if key_type == "root_ticket":
+                issues_data = jira_service.get_issues_by_root_ticket(jira_env, key_value, **kwargs)
+            else:  # project key
+                issues_data = jira_service.get_issues_by_project(jira_env, key_value, **kwargs)
+        return issues_data.get('issues', [])
+    
+    def sync_issues_from_envs(self, jira_envs, key_type, key_value):
+        """
+        增量同步各环境的issues到 sync_store：
+        从未同步过、没有水位线或距上次全量同步超过 full_resync_interval 的环境做全量同步（替换本地集合），
+        其他环境只获取 updated >= 水位线 - sync_overlap_seconds 的issues并合并。
         
-        filepath = os.path.join(output_dir, filename)
+        :return: 同 fetch_issues_from_envs（issues为空），另含 full_sync_envs
+        """
+        envs = list(dict.fromkeys(jira_envs))
+        now = time.time()
+        updated_since = {}
+        full_envs = set()
+        for env in envs:
+            scope = self.sync_store.get_scope(env, key_type, key_value)
+            if (scope is None or scope["watermark"] is None or scope["last_full_sync"] is None
+                    or now - scope["last_full_sync"] >= self.full_resync_interval):
+                full_envs.add(env)
+            else:
+                updated_since[env] = format_jql_datetime(scope["watermark"] - self.sync_overlap_seconds,
+                                                         self.jql_timezone)
         
-        # 创建Excel writer
-        with pd.ExcelWriter(filepath) as writer:
-            for sheet_name, df in excel_data.items():
-                if not df.empty:
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+        def merge(env, issues):
+            updated = (parse_jira_datetime(issue.get('fields', {}).get('updated')) for issue in issues)
+            watermark = max((u for u in updated if u is not None), default=None)
+            self.sync_store.merge(env, key_type, key_value, issues, watermark=watermark, full=env in full_envs)
         
-        logging.info(f"Excel report saved to {filepath}")
-        return filepath
-
-    def process_bulk_jira_operations(self, tickets_data, operation_type="create", max_workers=5):
+        fetched = self.fetch_issues_from_envs(jira_envs, key_type, key_value, on_env_issues=merge,
+                                              operation="export_issues_sync", updated_since=updated_since)
+        fetched["full_sync_envs"] = [env for env in fetched["ok_envs"] if env in full_envs]
+        return fetched
+    
+    def fetch_issues_from_envs(self, jira_envs, key_type, key_value, on_env_issues=None,
+                               operation="export_issues", updated_since=None):
+        """
+        并行从多个JIRA环境获取issues（scatter-gather），总耗时接近最慢的单个环境。
+        
+        每个环境有独立的截止时间（env_fetch_timeout，从提交时开始计算，含排队等待）；
+        超时或出错的环境不影响其他环境的结果。超时的请求无法取消，会在后台完成并释放信号量。
+        
+        :param on_env_issues: 可选回调 (env, issues)，按环境顺序逐个交付结果；提供时issues不会累积在返回值中
+        :param operation: field_planner 中决定请求字段的操作名
+        :param updated_since: 可选 {env: JQL日期时间}，这些环境只获取此后更新过的issues
+        :return: {"issues": [...], "ok_envs": [...], "timed_out_envs": [...], "failed_envs": {env: error}}
+        """
+        envs = list(dict.fromkeys(jira_envs))  # 去重并保持顺序
+        deadline = time.monotonic() + self.env_fetch_timeout
+        futures = {
+            env: self._fetch_pool.submit(contextvars.copy_context().run, self._fetch_env, env, key_type, key_value,
+                                         operation, (updated_since or {}).get(env))
+            for env in envs
+        }
+        
+        fetched = {"issues": [], "ok_envs": [], "timed_out_envs": [], "failed_envs": {}}
+        for env in envs:
+            try:
+                issues = futures[env].result(timeout=max(0.0, deadline - time.monotonic()))
+            except concurrent.futures.TimeoutError:
+                logging.warning(f"JIRA环境 {env} 在{self.env_fetch_timeout}s内未返回，结果中将缺少该环境")
+                fetched["timed_out_envs"].append(env)
+                continue
+            except Exception as e:
+                logging.error(f"从JIRA环境 {env} 获取issues失败: {e}")
+                fetched["failed_envs"][env] = str(e)
+                continue
+            
+            # 将环境信息添加到每个issue
+            for issue in issues:
+                issue['jira_environment'] = env
+            if on_env_issues is not None:
+                on_env_issues(env, issues)
+            else:
+                fetched["issues"].extend(issues)
+            fetched["ok_envs"].append(env)
+        return fetched
+    
+    def process_bulk_jira_operations(self, tickets_data, operation_type="create", max_workers=5, checkpoint=None,
+                                     idempotency_labels=None):
         """
         使用多线程处理批量Jira tickets创建或更新操作
         
+        创建操作在 bulk_create_chunk_size > 0 时按块调用bulk接口（各块并发），
+        每个元素的错误映射回 success/failed 结果；更新操作逐个调用。
+        
         :param tickets_data: 要创建或更新的tickets数据列表，每个元素是一个包含ticket数据的字典
         :param operation_type: 操作类型，"create"或"update"
-        :param max_workers: 最大并发工作线程数
+        :param max_workers: 最大并发工作线程数（bulk创建时为并发的bulk请求数）
+        :param checkpoint: 可选的BulkCheckpoint，按ticket记录进度；重试时跳过已完成的ticket
+        :param idempotency_labels: 创建时是否添加幂等label；None表示使用处理器的配置
         :return: 包含处理结果的字典，包括成功和失败的ticket信息
         """
         logging.info(f"开始批量{operation_type} {len(tickets_data)}个Jira tickets，使用{max_workers}个线程")
@@ -196,7 +365,8 @@ class JiraDataProcessor:
             "failed": [],
             "total": len(tickets_data),
             "success_count": 0,
-            "failed_count": 0
+            "failed_count": 0,
+            "resumed_count": 0
         }
         
         # 选择合适的操作方法
@@ -207,48 +377,184 @@ class JiraDataProcessor:
         else:
             return {"success": False, "error": f"不支持的操作类型: {operation_type}"}
         
+        is_create = operation_type.lower() == "create"
+        use_labels = self.idempotency_labels if idempotency_labels is None else idempotency_labels
+        
+        # 根据checkpoint跳过已完成的ticket
+        pending = self._resume_from_checkpoint(tickets_data, operation_type, checkpoint, results, use_labels)
+        
+        def record_success(ticket_data, item_key, result_key):
+            if checkpoint and item_key:
+                checkpoint.done(item_key, result_key)
+            # 使用锁保护共享资源的访问
+            with self._lock:
+                results["success"].append({
+                    "key": result_key,
+                    "data": ticket_data
+                })
+                results["success_count"] += 1
+            logging.info(f"成功{operation_type} ticket: {result_key}")
+        
+        def record_failure(ticket_data, item_key, error_msg):
+            if checkpoint and item_key:
+                checkpoint.failed(item_key, error_msg)
+            # 使用锁保护共享资源的访问
+            with self._lock:
+                results["failed"].append({
+                    "data": ticket_data,
+                    "error": error_msg
+                })
+                results["failed_count"] += 1
+            logging.error(f"执行{operation_type}操作失败: {error_msg}")
+        
+        def build_payload(ticket_data, item_key):
+            payload = {k: v for k, v in ticket_data.items() if k != "idempotency_key"}
+            if is_create and item_key and use_labels:
+                payload = self._with_idempotency_label(payload, item_key)
+            if checkpoint and item_key:
+                checkpoint.started(item_key)
+            return payload
+        
         # 定义线程工作函数
-        def process_ticket(ticket_data):
+        def process_ticket(ticket_data, item_key):
             try:
                 ticket_id = ticket_data.get('key') if operation_type.lower() == "update" else None
-                response = operation_method(ticket_data, ticket_id)
-                
-                # 使用锁保护共享资源的访问
-                with self._lock:
-                    results["success"].append({
-                        "key": response.get("key", ticket_id),
-                        "data": ticket_data
-                    })
-                    results["success_count"] += 1
-                    
-                logging.info(f"成功{operation_type} ticket: {response.get('key', ticket_id)}")
+                response = operation_method(build_payload(ticket_data, item_key), ticket_id)
+                record_success(ticket_data, item_key, response.get("key", ticket_id))
                 return response
             except Exception as e:
                 error_msg = str(e)
-                
-                # 使用锁保护共享资源的访问
-                with self._lock:
-                    results["failed"].append({
-                        "data": ticket_data,
-                        "error": error_msg
-                    })
-                    results["failed_count"] += 1
-                    
-                logging.error(f"执行{operation_type}操作失败: {error_msg}")
+                record_failure(ticket_data, item_key, error_msg)
                 return {"error": error_msg, "data": ticket_data}
         
+        # 一个bulk请求创建一组tickets，逐个元素映射成功/失败
+        def process_chunk(chunk):
+            payloads = [build_payload(ticket_data, item_key) for ticket_data, item_key in chunk]
+            try:
+                responses = self.jira_service.create_issues_bulk(payloads)
+            except Exception as e:
+                error_msg = str(e)
+                for ticket_data, item_key in chunk:
+                    record_failure(ticket_data, item_key, error_msg)
+                return
+            for (ticket_data, item_key), response in zip(chunk, responses):
+                if "error" in response:
+                    record_failure(ticket_data, item_key, response["error"])
+                else:
+                    record_success(ticket_data, item_key, response.get("key"))
+        
+        use_bulk = is_create and self.bulk_create_chunk_size > 0
+        if use_bulk:
+            size = self.bulk_create_chunk_size
+            work = [(process_chunk, pending[i:i + size]) for i in range(0, len(pending), size)]
+            logging.info(f"使用bulk接口创建: {len(pending)}个tickets分为{len(work)}个请求")
+        else:
+            work = [(process_ticket, ticket_data, item_key) for ticket_data, item_key in pending]
+        
         # 使用线程池执行多线程操作
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             # 提交所有任务到线程池
-            futures = [executor.submit(process_ticket, ticket_data) for ticket_data in tickets_data]
+            # 每个线程在提交时的context中运行，保证调用统计计入当前任务
+            futures = [executor.submit(contextvars.copy_context().run, *item) for item in work]
             
             # 等待所有任务完成（可选：添加超时机制）
             concurrent.futures.wait(futures)
             
-        logging.info(f"批量{operation_type}操作完成: 成功={results['success_count']}, 失败={results['failed_count']}")
+        logging.info(f"批量{operation_type}操作完成: 成功={results['success_count']}, 失败={results['failed_count']}, "
+                     f"从checkpoint恢复={results['resumed_count']}")
         return results
 
-    def process_linked_jira_operations(self, tickets_hierarchy, operation_type="create", max_workers=5):
+    @staticmethod
+    def _idempotency_label(item_key):
+        # Jira labels不能包含空格
+        return f"bulk-{item_key}".replace(" ", "_")[:255]
+
+    def _with_idempotency_label(self, payload, item_key):
+        """为创建操作的ticket添加幂等label，便于确认中断前是否已创建"""
+        fields = dict(payload.get("fields", {}))
+        fields["labels"] = list(fields.get("labels", [])) + [self._idempotency_label(item_key)]
+        return dict(payload, fields=fields)
+
+    def _find_created_issue(self, item_key, ticket_data, state, use_labels):
+        """
+        查找中断前可能已创建的issue，返回其key；无法确认时返回None。
+        使用幂等label时按label查找，否则按project+summary（且created不早于started记录时间）查找唯一匹配。
+        """
+        try:
+            if use_labels:
+                plan = self.field_planner.plan("find_created_issue")
+                issues = self.jira_service.search_issues(
+                    f'labels = "{self._idempotency_label(item_key)}"', fields=plan.fields_param, limit=1
+                )
+                return issues[0].get("key") if issues else None
+
+            fields = ticket_data.get("fields", {})
+            project_key = (fields.get("project") or {}).get("key")
+            summary = fields.get("summary")
+            if not project_key or not summary:
+                logging.warning(f"ticket {item_key} 缺少project或summary，无法确认是否已创建")
+                return None
+            # summary ~ 是全文检索，先按短语查找，再精确比较summary
+            phrase = summary.replace("\\", " ").replace('"', " ")
+            created_since = format_jql_datetime((state.get("updated_at") or time.time()) - CREATED_LOOKUP_SLACK_SECONDS,
+                                                self.jql_timezone)
+            plan = self.field_planner.plan("find_created_issue_by_summary")
+            issues = self.jira_service.search_issues(
+                f'project = "{project_key}" AND summary ~ "\\"{phrase}\\"" AND created >= "{created_since}"',
+                fields=plan.fields_param, limit=10
+            )
+        except Exception as e:
+            logging.warning(f"无法确认ticket {item_key} 是否已创建: {e}")
+            return None
+        matches = [issue.get("key") for issue in issues if issue.get("fields", {}).get("summary") == summary]
+        if len(matches) > 1:
+            logging.warning(f"ticket {item_key} 按summary找到多个issue {matches}，无法确认是否已创建")
+            return None
+        return matches[0] if matches else None
+
+    def _checkpointed_result(self, checkpoint, item_key, state, operation_type, ticket_data, use_labels):
+        """
+        判断ticket在之前的运行中是否已完成，返回(是否完成, 结果key)。
+        创建操作中状态为started（调用中途中断）的ticket先确认是否已创建。
+        """
+        if not state:
+            return False, None
+        if state["status"] == "done":
+            return True, state["result_key"]
+        if state["status"] == "started" and operation_type.lower() == "create":
+            result_key = self._find_created_issue(item_key, ticket_data, state, use_labels)
+            if result_key:
+                checkpoint.done(item_key, result_key)
+                return True, result_key
+        return False, None
+
+    def _resume_from_checkpoint(self, tickets_data, operation_type, checkpoint, results, use_labels):
+        """
+        将checkpoint中已完成的ticket计入结果，返回仍需处理的(ticket_data, item_key)列表。
+        """
+        if not checkpoint:
+            return [(ticket_data, None) for ticket_data in tickets_data]
+        
+        keys = checkpoint.item_keys(tickets_data, operation_type)
+        previous = checkpoint.load()
+        pending = []
+        for ticket_data, item_key in zip(tickets_data, keys):
+            finished, result_key = self._checkpointed_result(
+                checkpoint, item_key, previous.get(item_key), operation_type, ticket_data, use_labels
+            )
+            if finished:
+                results["success"].append({"key": result_key, "data": ticket_data, "resumed": True})
+                results["success_count"] += 1
+                results["resumed_count"] += 1
+            else:
+                pending.append((ticket_data, item_key))
+        
+        if results["resumed_count"]:
+            logging.info(f"从checkpoint恢复{results['resumed_count']}个已完成的ticket，剩余{len(pending)}个")
+        return pending
+
+    def process_linked_jira_operations(self, tickets_hierarchy, operation_type="create", max_workers=5,
+                                       checkpoint=None, idempotency_labels=None):
         """
         使用多线程处理具有层级关系的Jira tickets批量创建或更新操作
         
@@ -256,9 +562,12 @@ class JiraDataProcessor:
                                  {"root": root_ticket, "children": [child1, child2, ...]}
         :param operation_type: 操作类型，"create"或"update"
         :param max_workers: 最大并发工作线程数
+        :param checkpoint: 可选的BulkCheckpoint，根ticket和子ticket均按ticket记录进度
+        :param idempotency_labels: 创建时是否添加幂等label；None表示使用处理器的配置
         :return: 包含处理结果的字典，包括层级信息
         """
         logging.info(f"开始处理层级{operation_type} Jira tickets")
+        use_labels = self.idempotency_labels if idempotency_labels is None else idempotency_labels
         
         results = {
             "root": None,
@@ -274,14 +583,33 @@ class JiraDataProcessor:
             return {"success": False, "error": "缺少根ticket数据"}
         
         try:
-            # 直接处理根ticket，不使用多线程
-            if operation_type.lower() == "create":
-                root_response = self.jira_service.create_issue(root_ticket)
-            else:
-                root_id = root_ticket.get('key')
-                if not root_id:
-                    return {"success": False, "error": "更新根ticket时缺少key"}
-                root_response = self.jira_service.update_issue(root_ticket, root_id)
+            # 直接处理根ticket，不使用多线程；已完成的根ticket从checkpoint恢复
+            root_item_key = None
+            root_response = None
+            if checkpoint:
+                root_item_key = "root-" + checkpoint.item_keys([root_ticket], operation_type)[0]
+                finished, root_key = self._checkpointed_result(
+                    checkpoint, root_item_key, checkpoint.load().get(root_item_key), operation_type,
+                    root_ticket, use_labels
+                )
+                if finished:
+                    root_response = {"key": root_key, "resumed": True}
+            
+            if root_response is None:
+                payload = {k: v for k, v in root_ticket.items() if k != "idempotency_key"}
+                if checkpoint:
+                    checkpoint.started(root_item_key)
+                if operation_type.lower() == "create":
+                    if root_item_key and use_labels:
+                        payload = self._with_idempotency_label(payload, root_item_key)
+                    root_response = self.jira_service.create_issue(payload)
+                else:
+                    root_id = root_ticket.get('key')
+                    if not root_id:
+                        return {"success": False, "error": "更新根ticket时缺少key"}
+                    root_response = self.jira_service.update_issue(payload, root_id)
+                if checkpoint:
+                    checkpoint.done(root_item_key, root_response.get("key", root_ticket.get('key')))
             
             results["root"] = root_response
             results["success_count"] += 1
@@ -300,7 +628,7 @@ class JiraDataProcessor:
             # 如果有子tickets，使用多线程处理
             if children:
                 child_results = self.process_bulk_jira_operations(
-                    children, operation_type, max_workers
+                    children, operation_type, max_workers, checkpoint=checkpoint, idempotency_labels=use_labels
                 )
                 
                 results["children"] = child_results["success"]
@@ -0,0 +1,378 @@
+import csv
+import json
+import logging
+import os
+import shutil
+import tempfile
+from itertools import islice
+
+ROOT_SHEET = 'Root Issues'
+CHILD_SHEET = 'Child Issues'
+SHEETS = (ROOT_SHEET, CHILD_SHEET)
+# 多文件格式中每个sheet对应的文件名后缀
+SHEET_FILE_SUFFIX = {ROOT_SHEET: 'root', CHILD_SHEET: 'child'}
+
+# 报表列 -> issue JSON中的点分路径（数字段表示列表下标）
+DEFAULT_COLUMNS = {
+    'Key': 'key',
+    'Summary': 'fields.summary',
+    'Status': 'fields.status.name',
+    'Type': 'fields.issuetype.name',
+    'Environment': 'jira_environment',
+}
+PARENT_COLUMN = 'Parent Key'
+PARENT_PATH = 'fields.parent.key'
+
+def compile_path(path):
+    """
+    把点分路径编译成取值函数，如 "fields.customfield_10010.value"、"fields.components.0.name"。
+    路径中任一层缺失或为None时取值为None；dict/list 值序列化为JSON字符串。
+    """
+    keys = tuple(int(part) if part.isdigit() else part for part in path.split('.'))
+
+    def get(issue):
+        value = issue
+        for key in keys:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                # 缺失的层级，或中间层为None
+                return None
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False)
+        return value
+    return get
+
+class FieldMapping:
+    """
+    报表的列定义：列名 -> issue中的点分路径（支持嵌套的自定义字段）。
+
+    子issue的sheet在第一列之后多一列 "Parent Key"；是否为子issue由 fields.parent.key 判断。
+    各列的取值函数只编译一次，写入时按列批量提取。
+    """
+    def __init__(self, columns=None):
+        """
+        :param columns: 有序的 {列名: 路径}，默认 DEFAULT_COLUMNS
+        """
+        columns = dict(columns or DEFAULT_COLUMNS)
+        if not columns:
+            raise ValueError("Field mapping must define at least one column")
+        self.columns = list(columns)
+        self.paths = [columns[name] for name in self.columns]
+        self.getters = [compile_path(path) for path in self.paths]
+        self.parent_getter = compile_path(PARENT_PATH)
+
+    def sheet_columns(self, sheet_name):
+        if sheet_name == CHILD_SHEET:
+            return self.columns[:1] + [PARENT_COLUMN] + self.columns[1:]
+        return list(self.columns)
+
+    def split(self, issues):
+        """
+        按列提取一批issues，并用父issue列作为掩码拆分根/子issue
+
+        :return: (根issue行列表, 子issue行列表)
+        """
+        parents = list(map(self.parent_getter, issues))
+        columns = [list(map(getter, issues)) for getter in self.getters]
+        is_child = [parent is not None for parent in parents]
+        rows = list(zip(*columns))
+        if not any(is_child):
+            return rows, []
+        root_rows = [row for row, child in zip(rows, is_child) if not child]
+        child_rows = [row[:1] + (parent,) + row[1:]
+                      for row, parent, child in zip(rows, parents, is_child) if child]
+        return root_rows, child_rows
+
+class IssueReportWriter:
+    """
+    JIRA issues报表的流式写出基类。
+
+    根issue写入 "Root Issues"，子issue写入 "Child Issues"；没有数据的sheet不会生成。
+    列由 FieldMapping 决定。子类实现 _append / _save / _cleanup，决定sheet如何落到文件
+    （xlsx的sheet、CSV/Parquet的单独文件）。
+    文件先写到 "<path>.part"，close() 时才替换为正式文件，失败或 discard() 时不会留下半成品。
+    """
+    extension = None
+    # write_issues 每次按列提取的issue数
+    chunk_size = 1000
+
+    def __init__(self, base_path, field_mapping=None):
+        """
+        :param base_path: 不带扩展名的输出路径
+        :param field_mapping: FieldMapping，默认使用 DEFAULT_COLUMNS
+        """
+        self.base_path = base_path
+        self.field_mapping = field_mapping or FieldMapping()
+        self.root_count = 0
+        self.child_count = 0
+
+    @property
+    def issue_count(self):
+        return self.root_count + self.child_count
+
+    def write_issues(self, issues):
+        """
+        写入一批issues（任意可迭代对象，可以是分页生成器）
+
+        :return: 本批写入的行数
+        """
+        written = 0
+        iterator = iter(issues)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                break
+            root_rows, child_rows = self.field_mapping.split(chunk)
+            if root_rows:
+                self._append_rows(ROOT_SHEET, root_rows)
+                self.root_count += len(root_rows)
+            if child_rows:
+                self._append_rows(CHILD_SHEET, child_rows)
+                self.child_count += len(child_rows)
+            written += len(chunk)
+        return written
+
+    def close(self):
+        """
+        保存报表
+
+        :return: 生成的文件路径列表
+        """
+        paths = self._save()
+        for path in paths:
+            os.replace(f"{path}.part", path)
+        logging.info(f"Report saved to {', '.join(paths)} ({self.issue_count} issues)")
+        return paths
+
+    def discard(self):
+        """
+        放弃报表，删除已写出的临时文件
+        """
+        self._cleanup()
+
+    def _sheet_path(self, sheet_name):
+        """多文件格式中sheet对应的文件路径"""
+        return f"{self.base_path}_{SHEET_FILE_SUFFIX[sheet_name]}.{self.extension}"
+
+    def _append_rows(self, sheet_name, rows):
+        for row in rows:
+            self._append(sheet_name, row)
+
+    def _append(self, sheet_name, row):
+        raise NotImplementedError
+
+    def _save(self):
+        """写完所有 .part 文件并返回最终路径"""
+        raise NotImplementedError
+
+    def _cleanup(self):
+        raise NotImplementedError
+
+class ExcelReportWriter(IssueReportWriter):
+    """
+    xlsx报表（openpyxl write-only模式）：每一行写入后即刷到临时文件，内存占用与issue数量无关。
+    工作簿先保存到本writer在报表目录中创建的临时目录，成功后再移动到目标路径，放弃时删除整个临时目录。
+    """
+    extension = 'xlsx'
+
+    def __init__(self, base_path, field_mapping=None):
+        super().__init__(base_path, field_mapping)
+        from openpyxl import Workbook
+
+        self.filepath = f"{base_path}.{self.extension}"
+        self._workbook = Workbook(write_only=True)
+        self._sheets = {}
+        self._tmpdir = None
+
+    def _append(self, sheet_name, row):
+        sheet = self._sheets.get(sheet_name)
+        if sheet is None:
+            # Root Issues 始终排在第一个
+            index = 0 if sheet_name == ROOT_SHEET else None
+            sheet = self._workbook.create_sheet(title=sheet_name, index=index)
+            sheet.append(self.field_mapping.sheet_columns(sheet_name))
+            self._sheets[sheet_name] = sheet
+        if row is not None:
+            sheet.append(row)
+
+    def _save_to_tmpdir(self):
+        """保存工作簿到新建的临时目录，返回文件路径（保存时openpyxl会删除write-only sheet的行临时文件）"""
+        self._tmpdir = tempfile.mkdtemp(prefix=f".{os.path.basename(self.filepath)}.",
+                                        dir=os.path.dirname(self.filepath) or None)
+        path = os.path.join(self._tmpdir, os.path.basename(self.filepath))
+        self._workbook.save(path)
+        return path
+
+    def _save(self):
+        if not self._sheets:
+            # 没有任何issue时也生成一个只有表头的报表
+            self._append(ROOT_SHEET, None)
+        os.replace(self._save_to_tmpdir(), f"{self.filepath}.part")
+        self._remove_tmpdir()
+        return [self.filepath]
+
+    def _remove_tmpdir(self):
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def _cleanup(self):
+        if self._workbook is not None and self._sheets and self._tmpdir is None:
+            # 未保存过：保存到临时目录以结束sheet的行写入并删除其临时文件（否则要到进程退出才清理）
+            try:
+                self._save_to_tmpdir()
+            except Exception as e:
+                logging.warning(f"Failed to release temporary files of {self.filepath}: {e}")
+        self._remove_tmpdir()
+        self._sheets = {}
+        self._workbook = None
+        part_path = f"{self.filepath}.part"
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+class CsvReportWriter(IssueReportWriter):
+    """
+    CSV报表：每个sheet一个UTF-8文件（<base>_root.csv / <base>_child.csv），逐行写出。
+    """
+    extension = 'csv'
+
+    def __init__(self, base_path, field_mapping=None):
+        super().__init__(base_path, field_mapping)
+        self._files = {}
+        self._writers = {}
+
+    def _append(self, sheet_name, row):
+        writer = self._writers.get(sheet_name)
+        if writer is None:
+            f = open(f"{self._sheet_path(sheet_name)}.part", 'w', newline='', encoding='utf-8')
+            self._files[sheet_name] = f
+            writer = csv.writer(f)
+            writer.writerow(self.field_mapping.sheet_columns(sheet_name))
+            self._writers[sheet_name] = writer
+        if row is not None:
+            writer.writerow(row)
+
+    def _save(self):
+        if not self._files:
+            self._append(ROOT_SHEET, None)
+        for f in self._files.values():
+            f.close()
+        return [self._sheet_path(name) for name in SHEETS if name in self._files]
+
+    def _cleanup(self):
+        for name, f in self._files.items():
+            f.close()
+            part_path = f"{self._sheet_path(name)}.part"
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        self._files = {}
+        self._writers = {}
+
+class ParquetReportWriter(IssueReportWriter):
+    """
+    Parquet报表：每个sheet一个文件（<base>_root.parquet / <base>_child.parquet），
+    按batch_size行一批写成row group，内存占用只与batch大小有关。需要pyarrow（仅在使用时导入）。
+    """
+    extension = 'parquet'
+
+    def __init__(self, base_path, field_mapping=None, compression='zstd', batch_size=10000):
+        super().__init__(base_path, field_mapping)
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError(f"{self.extension}格式导出需要安装pyarrow")
+        self._pa = pyarrow
+        self.compression = compression
+        self.batch_size = batch_size
+        self._buffers = {}
+        self._writers = {}
+
+    def _schema(self, sheet_name):
+        return self._pa.schema([(column, self._pa.string()) for column in self.field_mapping.sheet_columns(sheet_name)])
+
+    def _open_writer(self, path, schema):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema, compression=self.compression)
+
+    def _append_rows(self, sheet_name, rows):
+        buffer = self._buffers.setdefault(sheet_name, [])
+        buffer.extend(rows)
+        if len(buffer) >= self.batch_size:
+            self._flush(sheet_name)
+
+    def _append(self, sheet_name, row):
+        self._append_rows(sheet_name, [row] if row is not None else [])
+
+    def _flush(self, sheet_name):
+        writer = self._writers.get(sheet_name)
+        schema = self._schema(sheet_name)
+        if writer is None:
+            writer = self._open_writer(f"{self._sheet_path(sheet_name)}.part", schema)
+            self._writers[sheet_name] = writer
+        rows = self._buffers.get(sheet_name) or []
+        if rows:
+            # 行 -> 列
+            # 所有列按字符串存储，自定义字段中的数字等值转为字符串
+            columns = [
+                self._pa.array([v if v is None or isinstance(v, str) else str(v) for v in values],
+                               type=self._pa.string())
+                for values in zip(*rows)
+            ]
+            writer.write_batch(self._pa.RecordBatch.from_arrays(columns, schema=schema))
+        self._buffers[sheet_name] = []
+
+    def _save(self):
+        if not self._buffers:
+            self._append(ROOT_SHEET, None)
+        for sheet_name in list(self._buffers):
+            self._flush(sheet_name)
+        for writer in self._writers.values():
+            writer.close()
+        return [self._sheet_path(name) for name in SHEETS if name in self._writers]
+
+    def _cleanup(self):
+        for name, writer in self._writers.items():
+            try:
+                writer.close()
+            except Exception as e:
+                logging.debug(f"Closing discarded {self.extension} writer failed: {e}")
+            part_path = f"{self._sheet_path(name)}.part"
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        self._buffers = {}
+        self._writers = {}
+
+class ArrowReportWriter(ParquetReportWriter):
+    """
+    Arrow IPC（Feather v2）报表：与Parquet相同的分批写出，压缩只支持 zstd / lz4。
+    """
+    extension = 'arrow'
+
+    def _open_writer(self, path, schema):
+        import pyarrow.ipc as ipc
+        options = ipc.IpcWriteOptions(compression=self.compression)
+        return ipc.new_file(path, schema, options=options)
+
+REPORT_WRITERS = {
+    'xlsx': ExcelReportWriter,
+    'csv': CsvReportWriter,
+    'parquet': ParquetReportWriter,
+    'arrow': ArrowReportWriter,
+}
+
+def create_report_writer(output_format, base_path, compression='zstd', field_mapping=None):
+    """
+    按输出格式创建报表writer
+
+    :param output_format: xlsx / csv / parquet / arrow
+    :param base_path: 不带扩展名的输出路径
+    :param compression: parquet/arrow 的压缩算法
+    :param field_mapping: FieldMapping，默认使用 DEFAULT_COLUMNS
+    """
+    writer_class = REPORT_WRITERS.get(output_format)
+    if writer_class is None:
+        raise ValueError(f"Unsupported output format '{output_format}', expected one of {sorted(REPORT_WRITERS)}")
+    if issubclass(writer_class, ParquetReportWriter):
+        return writer_class(base_path, field_mapping, compression=compression)
+    return writer_class(base_path, field_mapping)
@@ -11,13 +11,13 @@ class ResultReporter:
         """
         self.mattermost_processor = mattermost_processor
 
-    def handle_task_result(self, task, result_item):
+    def format_message(self, task, result_item):
         """
-        对最终执行结果进行检查或处理，并将结果发送到 Mattermost。
+        根据任务标签生成 Mattermost 消息内容。
         
         :param task: Task 类型对象
         :param result_item: 存储了执行状态、success/错误信息等的字典
-        :return: None 或者其他需要返回的数据
+        :return: 消息文本
         """
         execution_details = result_item.get('execution_details', {})
         is_success = execution_details.get("success", False)
@@ -30,6 +30,17 @@ class ResultReporter:
         else:
             # 默认逻辑
             message = f"Task {task.id} finished. success={is_success}, details={execution_details}"
+        return message
+
+    def handle_task_result(self, task, result_item):
+        """
+        对最终执行结果进行检查或处理，并将结果发送到 Mattermost。
+        
+        :param task: Task 类型对象
+        :param result_item: 存储了执行状态、success/错误信息等的字典
+        :return: None 或者其他需要返回的数据
+        """
+        message = self.format_message(task, result_item)
 
         # 在此处可做更多判断或格式化
         logging.info(f"ResultReporter is sending Mattermost message: {message}")
@@ -39,4 +50,15 @@ class ResultReporter:
 
         # 若需要返回更多信息或做其他处理，也可在这里进行
         # 例如 return {"message_sent": True, "task_id": str(task.id)}
-        return
\ No newline at end of file
+        return
+
+    def handle_task_results(self, items):
+        """
+        批量发送多个任务的结果：合并为一条 Mattermost 消息，只需一次网络往返。
+        发送失败时抛出异常，由调用方（ResultOutbox）负责重试。
+        
+        :param items: (task, result_item) 列表
+        """
+        messages = [self.format_message(task, result_item) for task, result_item in items]
+        logging.info(f"ResultReporter is sending {len(messages)} result(s) to Mattermost in one message")
+        self.mattermost_processor.send_custom_message("\n".join(messages))
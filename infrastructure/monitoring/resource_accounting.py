@@ -0,0 +1,132 @@
+# scheduler/resource_accounting.py
+import contextvars
+import logging
+import random
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+# Usage of the task running in the current context; sub-threads see it when
+# their work is submitted through contextvars.copy_context().run
+_current_usage: "contextvars.ContextVar[Optional[TaskResourceUsage]]" = contextvars.ContextVar(
+    "task_resource_usage", default=None)
+
+# tracemalloc is process wide, so only one task at a time is memory-traced
+_memory_trace_lock = threading.Lock()
+
+class TaskResourceUsage:
+    """Resource counters for one task execution."""
+
+    def __init__(self, trace_memory: bool = False):
+        self._lock = threading.Lock()
+        self.external_calls = 0
+        self.http_requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.trace_memory = trace_memory
+        self.peak_memory_bytes: Optional[int] = None
+
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    def add_call(self) -> None:
+        with self._lock:
+            self.external_calls += 1
+
+    def add_http(self, bytes_sent: int, bytes_received: int) -> None:
+        with self._lock:
+            self.http_requests += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def as_dict(self) -> Dict[str, Any]:
+        usage = {
+            "wall_time": round(self.wall_time, 6),
+            "cpu_time": round(self.cpu_time, 6),
+            "external_calls": self.external_calls,
+            "http_requests": self.http_requests,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "memory_sampled": self.peak_memory_bytes is not None
+        }
+        if self.peak_memory_bytes is not None:
+            usage["peak_memory_bytes"] = self.peak_memory_bytes
+        return usage
+
+def record_external_call() -> None:
+    """Count one external API call for the task running in this context (no-op outside a task)."""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add_call()
+
+def _response_hook(response, *args, **kwargs):
+    usage = _current_usage.get()
+    if usage is None:
+        return response
+    body = response.request.body if response.request is not None else None
+    sent = len(body) if body else 0
+    length = response.headers.get("Content-Length")
+    received = int(length) if length and length.isdigit() else len(response.content or b"")
+    usage.add_http(sent, received)
+    return response
+
+def install_session_hooks(session) -> None:
+    """Attach the byte-counting response hook to a requests.Session (idempotent)."""
+    hooks = session.hooks.setdefault("response", [])
+    if _response_hook not in hooks:
+        hooks.append(_response_hook)
+
+class ResourceAccountant:
+    """
+    Tracks wall time, thread CPU time, external calls and HTTP bytes for each
+    task; peak traced memory (tracemalloc) only for a sampled fraction of tasks
+    because tracing slows down every allocation in the process while active.
+    """
+
+    def __init__(self, enabled: bool = True, memory_sample_rate: float = 0.0,
+                 rng: Callable[[], float] = random.random):
+        self.enabled = enabled
+        self.memory_sample_rate = memory_sample_rate
+        self.rng = rng
+
+    def start(self) -> Optional["AccountingScope"]:
+        """Begin accounting for the current context; returns None when disabled."""
+        if not self.enabled:
+            return None
+        trace_memory = self.memory_sample_rate > 0 and self.rng() < self.memory_sample_rate \
+            and _memory_trace_lock.acquire(blocking=False)
+        return AccountingScope(TaskResourceUsage(trace_memory=trace_memory))
+
+class AccountingScope:
+    """Active accounting for one task; call stop() in the same context that started it."""
+
+    def __init__(self, usage: TaskResourceUsage):
+        self.usage = usage
+        self._started_tracing = False
+        if usage.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            self._memory_baseline = tracemalloc.get_traced_memory()[0]
+        self._token = _current_usage.set(usage)
+
+    def stop(self) -> Dict[str, Any]:
+        usage = self.usage
+        usage.wall_time = time.perf_counter() - usage._wall_start
+        usage.cpu_time = time.thread_time() - usage._cpu_start
+        if usage.trace_memory:
+            try:
+                usage.peak_memory_bytes = max(0, tracemalloc.get_traced_memory()[1] - self._memory_baseline)
+                if self._started_tracing:
+                    tracemalloc.stop()
+            finally:
+                _memory_trace_lock.release()
+        try:
+            _current_usage.reset(self._token)
+        except ValueError:
+            logging.debug("Resource accounting scope stopped in a different context")
+        return usage.as_dict()
@@ -0,0 +1,139 @@
+# scheduler/bulk_checkpoint_store.py
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bulk_items (
+    task_id TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result_key TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (task_id, item_key)
+);
+"""
+
+STARTED = "started"
+DONE = "done"
+FAILED = "failed"
+
+def item_keys(items: Iterable[Dict[str, Any]], operation_type: str) -> List[str]:
+    """
+    Idempotency key per bulk item: the item's own "idempotency_key" if given,
+    otherwise a hash of operation and item content. Identical items in the
+    same list get an occurrence suffix so they remain distinct.
+    """
+    keys = []
+    seen = Counter()
+    for item in items:
+        explicit = item.get("idempotency_key")
+        if explicit:
+            keys.append(str(explicit))
+            continue
+        canonical = json.dumps(item, sort_keys=True, separators=(',', ':'), default=str)
+        digest = hashlib.sha256(f"{operation_type}:{canonical}".encode('utf-8')).hexdigest()[:32]
+        seen[digest] += 1
+        keys.append(digest if seen[digest] == 1 else f"{digest}-{seen[digest]}")
+    return keys
+
+class BulkCheckpointStore:
+    """
+    SQLite-backed per-item progress of bulk Jira tasks. Each item is recorded
+    as started before its API call and done/failed after it, so a retried or
+    recovered task can skip finished items and check in-doubt ones.
+    """
+
+    def __init__(self, db_path: str = "task_storage/bulk_checkpoints.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def _write(self, task_id: Any, item_key: str, status: str,
+               result_key: Optional[str] = None, error: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bulk_items (task_id, item_key, status, result_key, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(task_id), item_key, status, result_key, error, time.time())
+            )
+
+    def mark_started(self, task_id: Any, item_key: str) -> None:
+        self._write(task_id, item_key, STARTED)
+
+    def mark_done(self, task_id: Any, item_key: str, result_key: Optional[str] = None) -> None:
+        self._write(task_id, item_key, DONE, result_key=result_key)
+
+    def mark_failed(self, task_id: Any, item_key: str, error: str) -> None:
+        self._write(task_id, item_key, FAILED, error=error)
+
+    def load(self, task_id: Any) -> Dict[str, Dict[str, Any]]:
+        """Checkpointed items of a task: {item_key: {"status", "result_key", "error", "updated_at"}}."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_key, status, result_key, error, updated_at FROM bulk_items WHERE task_id = ?",
+                (str(task_id),)
+            ).fetchall()
+        return {r[0]: {"status": r[1], "result_key": r[2], "error": r[3], "updated_at": r[4]} for r in rows}
+
+    def get_progress(self, task_id: Any) -> Dict[str, int]:
+        """Item counts per checkpoint status for a task."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM bulk_items WHERE task_id = ? GROUP BY status",
+                (str(task_id),)
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def clear(self, task_id: Any) -> None:
+        """Forget a task's checkpoints (once it completed or will not be retried)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM bulk_items WHERE task_id = ?", (str(task_id),))
+        logging.info(f"Cleared bulk checkpoints for task {task_id}")
+
+    def for_task(self, task_id: Any) -> "BulkCheckpoint":
+        return BulkCheckpoint(self, task_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class BulkCheckpoint:
+    """Checkpoint view bound to one task, handed to JiraDataProcessor."""
+
+    def __init__(self, store: BulkCheckpointStore, task_id: Any):
+        self.store = store
+        self.task_id = task_id
+
+    def item_keys(self, items: Iterable[Dict[str, Any]], operation_type: str) -> List[str]:
+        return item_keys(items, operation_type)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        return self.store.load(self.task_id)
+
+    def started(self, item_key: str) -> None:
+        self.store.mark_started(self.task_id, item_key)
+
+    def done(self, item_key: str, result_key: Optional[str] = None) -> None:
+        self.store.mark_done(self.task_id, item_key, result_key)
+
+    def failed(self, item_key: str, error: str) -> None:
+        self.store.mark_failed(self.task_id, item_key, error)
+
+    def clear(self) -> None:
+        self.store.clear(self.task_id)
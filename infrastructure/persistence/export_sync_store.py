@@ -0,0 +1,132 @@
+# infrastructure/persistence/export_sync_store.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_scopes (
+    env TEXT NOT NULL,
+    key_type TEXT NOT NULL,
+    key_value TEXT NOT NULL,
+    watermark REAL,
+    last_full_sync REAL,
+    last_sync REAL NOT NULL,
+    PRIMARY KEY (env, key_type, key_value)
+);
+CREATE TABLE IF NOT EXISTS scope_issues (
+    env TEXT NOT NULL,
+    key_type TEXT NOT NULL,
+    key_value TEXT NOT NULL,
+    issue_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (env, key_type, key_value, issue_key)
+);
+"""
+
+class ExportSyncStore:
+    """
+    SQLite-backed issue sets of incrementally synced Jira exports. Each
+    (env, key_type, key_value) scope keeps the issues exported so far and a
+    watermark (epoch seconds of the newest "updated" seen), so the next run
+    only fetches issues updated since then and merges them in. A full sync
+    replaces the scope's issues, dropping those deleted in Jira.
+    """
+
+    def __init__(self, db_path: str = "task_storage/export_sync.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_scope(self, env: str, key_type: str, key_value: str) -> Optional[Dict[str, Any]]:
+        """Sync state of a scope: {"watermark", "last_full_sync", "last_sync"}, or None if never synced."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, last_full_sync, last_sync FROM sync_scopes "
+                "WHERE env = ? AND key_type = ? AND key_value = ?",
+                (env, key_type, key_value)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"watermark": row[0], "last_full_sync": row[1], "last_sync": row[2]}
+
+    def merge(self, env: str, key_type: str, key_value: str, issues: Iterable[Dict[str, Any]],
+              watermark: Optional[float] = None, full: bool = False) -> int:
+        """
+        Upsert issues into a scope in one transaction and advance its watermark
+        (it never moves backwards). full=True first removes the scope's issues.
+
+        :return: number of issues in the scope afterwards
+        """
+        rows = [(env, key_type, key_value, issue["key"], json.dumps(issue, separators=(',', ':')))
+                for issue in issues]
+        now = time.time()
+        with self._lock, self._conn:
+            if full:
+                self._conn.execute(
+                    "DELETE FROM scope_issues WHERE env = ? AND key_type = ? AND key_value = ?",
+                    (env, key_type, key_value)
+                )
+            # ON CONFLICT keeps the row id, so issues stay in first-seen order
+            self._conn.executemany(
+                "INSERT INTO scope_issues (env, key_type, key_value, issue_key, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (env, key_type, key_value, issue_key) DO UPDATE SET data = excluded.data",
+                rows
+            )
+            previous = self._conn.execute(
+                "SELECT watermark, last_full_sync FROM sync_scopes WHERE env = ? AND key_type = ? AND key_value = ?",
+                (env, key_type, key_value)
+            ).fetchone()
+            old_watermark, last_full_sync = previous if previous else (None, None)
+            if full:
+                last_full_sync = now
+            candidates = [w for w in (old_watermark, watermark) if w is not None]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_scopes (env, key_type, key_value, watermark, last_full_sync, last_sync) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (env, key_type, key_value, max(candidates) if candidates else None, last_full_sync, now)
+            )
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM scope_issues WHERE env = ? AND key_type = ? AND key_value = ?",
+                (env, key_type, key_value)
+            ).fetchone()[0]
+        logging.info(f"Merged {len(rows)} issues into export scope {env}/{key_type}/{key_value} "
+                     f"({'full' if full else 'incremental'}), {count} issues in scope")
+        return count
+
+    def iter_issues(self, env: str, key_type: str, key_value: str, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Issues of a scope in first-seen order, in batches of batch_size."""
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, data FROM scope_issues WHERE env = ? AND key_type = ? AND key_value = ? "
+                    "AND rowid > ? ORDER BY rowid LIMIT ?",
+                    (env, key_type, key_value, last_rowid, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            yield [json.loads(data) for _, data in rows]
+
+    def clear(self, env: str, key_type: str, key_value: str) -> None:
+        """Forget a scope; its next sync is a full one."""
+        with self._lock, self._conn:
+            params = (env, key_type, key_value)
+            self._conn.execute("DELETE FROM scope_issues WHERE env = ? AND key_type = ? AND key_value = ?", params)
+            self._conn.execute("DELETE FROM sync_scopes WHERE env = ? AND key_type = ? AND key_value = ?", params)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,292 @@
+# infrastructure/persistence/jira_issue_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    env TEXT NOT NULL,
+    issue_key TEXT NOT NULL,
+    project_key TEXT NOT NULL,
+    parent_key TEXT,
+    updated TEXT,
+    fields TEXT,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (env, issue_key)
+);
+CREATE INDEX IF NOT EXISTS idx_issues_parent ON issues (env, parent_key);
+CREATE INDEX IF NOT EXISTS idx_issues_project ON issues (env, project_key);
+CREATE TABLE IF NOT EXISTS scopes (
+    env TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    fields TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (env, scope)
+);
+"""
+
+# A root scope is what the root-ticket query (key = X OR parent = X) returns: the root and its direct children
+ROOT_SCOPE_SQL = """
+SELECT {columns} FROM issues
+WHERE env = ? AND (issue_key = ? OR parent_key = ?)
+ORDER BY issue_key != ?, rowid
+"""
+
+def field_set(fields) -> Optional[FrozenSet[str]]:
+    """Requested Jira fields (list or comma string) as a set; None means all fields ("*all")."""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    names = frozenset(f.strip() for f in fields if f.strip())
+    if not names or names & {"*all", "*navigable"}:
+        return None
+    return names
+
+def _covers(stored: Optional[str], requested: Optional[FrozenSet[str]]) -> bool:
+    """Whether an entry fetched with the stored fields answers a read of the requested fields."""
+    if stored is None:
+        return True
+    return requested is not None and requested <= set(json.loads(stored))
+
+class JiraIssueStore:
+    """
+    SQLite-backed local copy of Jira issues keyed by (env, issue key), with
+    parent and project indexes for hierarchy lookups. Each entry remembers
+    which fields it was fetched with and when, so readers can serve a
+    request locally only if the entry covers the fields they need and is
+    younger than their freshness bound.
+
+    Upserting an issue whose "updated" equals the stored one merges the two
+    field sets (e.g. a search for summary/status and a pre-check for a custom
+    field); otherwise the newer copy replaces the entry.
+
+    Scopes ("root:PROJ-1", "project:PROJ") record when a whole tree or
+    project was last fetched (replace_scope), which is what makes a local
+    hierarchy or project read complete rather than just the issues that
+    happen to be stored.
+    """
+
+    def __init__(self, db_path: str = "task_storage/jira_issues.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "upserts": 0}
+
+    def _count(self, key: str, n: int = 1) -> None:
+        self._stats[key] += n
+
+    def upsert_issues(self, env: str, issues: Iterable[Dict[str, Any]], fields=None) -> int:
+        """
+        Store issues from a search or issue response in one transaction.
+
+        :param fields: fields the issues were requested with (None / "*all" for all fields)
+        :return: number of issues stored
+        """
+        requested = field_set(fields)
+        issues = [issue for issue in issues if issue.get("key")]
+        if not issues:
+            return 0
+        with self._lock, self._conn:
+            return self._upsert(env, issues, requested)
+
+    def _upsert(self, env: str, issues: List[Dict[str, Any]], requested: Optional[FrozenSet[str]]) -> int:
+        """Upsert issues inside the caller's transaction (lock held)."""
+        now = time.time()
+        existing = {}
+        keys = [issue["key"] for issue in issues]
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self._conn.execute(
+                f"SELECT issue_key, updated, fields, data FROM issues WHERE env = ? "
+                f"AND issue_key IN ({','.join('?' * len(chunk))})",
+                [env] + chunk
+            ).fetchall()
+            existing.update({row[0]: row[1:] for row in rows})
+
+        rows = []
+        for issue in issues:
+            issue_fields = issue.get("fields") or {}
+            updated = issue_fields.get("updated")
+            stored_fields = requested
+            data = issue
+            previous = existing.get(issue["key"])
+            if previous is not None and updated is not None and previous[0] == updated:
+                # Same version of the issue: keep the fields fetched earlier
+                data = json.loads(previous[2])
+                data.update({k: v for k, v in issue.items() if k != "fields"})
+                data.setdefault("fields", {}).update(issue_fields)
+                previous_fields = None if previous[1] is None else frozenset(json.loads(previous[1]))
+                stored_fields = None if requested is None or previous_fields is None else requested | previous_fields
+            parent = (data.get("fields") or {}).get("parent") or {}
+            rows.append((
+                env, issue["key"], issue["key"].split('-')[0], parent.get("key"), updated,
+                json.dumps(sorted(stored_fields)) if stored_fields is not None else None,
+                now, json.dumps(data, separators=(',', ':'))
+            ))
+        # ON CONFLICT keeps the row id, so reads stay in first-seen order
+        self._conn.executemany(
+            "INSERT INTO issues (env, issue_key, project_key, parent_key, updated, fields, fetched_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (env, issue_key) DO UPDATE SET project_key = excluded.project_key, "
+            "parent_key = excluded.parent_key, updated = excluded.updated, fields = excluded.fields, "
+            "fetched_at = excluded.fetched_at, data = excluded.data",
+            rows
+        )
+        self._count("upserts", len(rows))
+        return len(rows)
+
+    def _fresh_rows(self, rows, requested, max_age: Optional[float]) -> Optional[List[Dict[str, Any]]]:
+        """Rows (fields, fetched_at, data) usable for a read, or None if any is not (lock held)."""
+        now = time.time()
+        issues = []
+        for stored_fields, fetched_at, data in rows:
+            if (max_age is not None and now - fetched_at > max_age) or not _covers(stored_fields, requested):
+                return None
+            issues.append(json.loads(data))
+        return issues
+
+    def get_issue(self, env: str, issue_key: str, fields=None, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        A stored issue if it covers the requested fields and is at most max_age seconds old
+        (None: any age); otherwise None and the caller should fetch from Jira.
+        """
+        requested = field_set(fields)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fields, fetched_at, data FROM issues WHERE env = ? AND issue_key = ?",
+                (env, issue_key)
+            ).fetchone()
+            issues = self._fresh_rows([row], requested, max_age) if row is not None else None
+            self._count("hits" if issues else "misses")
+        return issues[0] if issues else None
+
+    def replace_scope(self, env: str, scope: str, issues: List[Dict[str, Any]], fields=None) -> int:
+        """
+        Store the complete result of a root-ticket ("root:<key>", the root and its direct children)
+        or project ("project:<key>") fetch in one transaction: upsert the issues, drop stored
+        members of the scope that the fetch no longer returned (deleted or moved in Jira) and
+        record the fetch time. Other scopes that contained a dropped issue are no longer
+        complete and lose their freshness.
+
+        :return: number of issues stored
+        """
+        requested = field_set(fields)
+        issues = [issue for issue in issues if issue.get("key")]
+        kind, _, key = scope.partition(':')
+        fetched = {issue["key"] for issue in issues}
+        with self._lock, self._conn:
+            count = self._upsert(env, issues, requested) if issues else 0
+            if kind == "root":
+                members = self._conn.execute(
+                    ROOT_SCOPE_SQL.format(columns="issue_key, project_key, parent_key"), (env, key, key, key)
+                ).fetchall()
+            else:
+                members = self._conn.execute(
+                    "SELECT issue_key, project_key, parent_key FROM issues WHERE env = ? AND project_key = ?",
+                    (env, key)
+                ).fetchall()
+            self._delete_issues(env, [member for member in members if member[0] not in fetched], keep_scope=scope)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scopes (env, scope, fields, fetched_at) VALUES (?, ?, ?, ?)",
+                (env, scope, json.dumps(sorted(requested)) if requested is not None else None, time.time())
+            )
+        return count
+
+    def _delete_issues(self, env: str, rows, keep_scope: Optional[str] = None) -> None:
+        """
+        Delete issues (issue_key, project_key, parent_key) and forget every scope that contained
+        them, except keep_scope (lock held, inside the caller's transaction).
+        """
+        if not rows:
+            return
+        scopes = set()
+        for issue_key, project_key, parent_key in rows:
+            scopes.update({f"project:{project_key}", f"root:{issue_key}"})
+            if parent_key:
+                scopes.add(f"root:{parent_key}")
+        scopes.discard(keep_scope)
+        self._conn.executemany("DELETE FROM issues WHERE env = ? AND issue_key = ?",
+                               [(env, row[0]) for row in rows])
+        self._conn.executemany("DELETE FROM scopes WHERE env = ? AND scope = ?",
+                               [(env, scope) for scope in scopes])
+
+    def _scope_fresh(self, env: str, scope: str, requested, max_age: Optional[float]) -> bool:
+        """(lock held)"""
+        row = self._conn.execute(
+            "SELECT fields, fetched_at FROM scopes WHERE env = ? AND scope = ?", (env, scope)
+        ).fetchone()
+        if row is None or not _covers(row[0], requested):
+            return False
+        return max_age is None or time.time() - row[1] <= max_age
+
+    def get_tree(self, env: str, root_key: str, fields=None, max_age: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        The root issue and its direct children (root first) if they were fetched as a whole
+        (replace_scope "root:<key>") within max_age with the requested fields; otherwise None.
+        """
+        requested = field_set(fields)
+        with self._lock:
+            issues = None
+            if self._scope_fresh(env, f"root:{root_key}", requested, max_age):
+                rows = self._conn.execute(
+                    ROOT_SCOPE_SQL.format(columns="fields, fetched_at, data"), (env, root_key, root_key, root_key)
+                ).fetchall()
+                issues = self._fresh_rows(rows, requested, None) if rows else None
+            self._count("hits" if issues else "misses")
+        return issues
+
+    def get_project_issues(self, env: str, project_key: str, fields=None,
+                           max_age: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """Issues of a project if it was fetched as a whole (replace_scope "project:<key>") within max_age; otherwise None."""
+        requested = field_set(fields)
+        with self._lock:
+            issues = None
+            if self._scope_fresh(env, f"project:{project_key}", requested, max_age):
+                rows = self._conn.execute(
+                    "SELECT fields, fetched_at, data FROM issues WHERE env = ? AND project_key = ? ORDER BY rowid",
+                    (env, project_key)
+                ).fetchall()
+                issues = self._fresh_rows(rows, requested, None)
+            self._count("hits" if issues is not None else "misses")
+        return issues
+
+    def get_children(self, env: str, parent_key: str) -> List[Dict[str, Any]]:
+        """Stored direct children of an issue (whatever has been stored, regardless of age)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM issues WHERE env = ? AND parent_key = ? ORDER BY rowid", (env, parent_key)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def invalidate(self, env: str, issue_key: str) -> None:
+        """Drop an issue (and the freshness of scopes containing it) after it was changed or deleted through this process."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT issue_key, project_key, parent_key FROM issues WHERE env = ? AND issue_key = ?",
+                (env, issue_key)
+            ).fetchall()
+            self._delete_issues(env, rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["issues"] = self._conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+            stats["scopes"] = self._conn.execute("SELECT COUNT(*) FROM scopes").fetchone()[0]
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,153 @@
+# scheduler/scheduler_state_store.py
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    task_id TEXT PRIMARY KEY,
+    cron_expr TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    offset_seconds INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pending_retries (
+    task_id TEXT PRIMARY KEY,
+    due_ts REAL NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS queued_tasks (
+    task_id TEXT PRIMARY KEY,
+    priority TEXT NOT NULL,
+    seq INTEGER NOT NULL
+);
+"""
+
+UPSERT_SQL = {
+    "scheduled_jobs": "INSERT OR REPLACE INTO scheduled_jobs (task_id, cron_expr, priority, offset_seconds) VALUES (?, ?, ?, ?)",
+    "pending_retries": "INSERT OR REPLACE INTO pending_retries (task_id, due_ts, kind) VALUES (?, ?, ?)",
+    "queued_tasks": "INSERT OR REPLACE INTO queued_tasks (task_id, priority, seq) VALUES (?, ?, ?)",
+}
+
+def _enum_value(value: Any) -> str:
+    """Store enums (e.g. TaskPriority) by value rather than by repr."""
+    return str(getattr(value, "value", value))
+
+class SchedulerStateStore:
+    """
+    SQLite-backed store for scheduler state that would otherwise only live in
+    memory: cron schedules, pending retries (with due times) and queue contents.
+
+    Writes are buffered per (table, task_id) and flushed in one transaction by
+    flush(), so a burst of changes to the same task costs a single row write.
+    Anything not yet flushed when the process dies is recovered by the
+    scheduler's reconciliation against task statuses on startup.
+    """
+
+    def __init__(self, db_path: str = "task_storage/scheduler_state.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        # table -> {task_id: row tuple, or None for delete}
+        self._pending: Dict[str, Dict[str, Optional[tuple]]] = {table: {} for table in UPSERT_SQL}
+        self._queue_seq = self._load_max_queue_seq()
+
+    def _load_max_queue_seq(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM queued_tasks").fetchone()
+        return row[0]
+
+    def _stage(self, table: str, task_id: Any, row: Optional[tuple]) -> None:
+        with self._lock:
+            self._pending[table][str(task_id)] = row
+
+    # Scheduled jobs
+
+    def save_schedule(self, task_id: Any, cron_expr: str, priority: str, offset: int = 0) -> None:
+        self._stage("scheduled_jobs", task_id, (str(task_id), cron_expr, _enum_value(priority), offset))
+
+    def delete_schedule(self, task_id: Any) -> None:
+        self._stage("scheduled_jobs", task_id, None)
+
+    # Pending retries
+
+    def save_retry(self, task_id: Any, due_ts: float, kind: str) -> None:
+        self._stage("pending_retries", task_id, (str(task_id), due_ts, kind))
+
+    def delete_retry(self, task_id: Any) -> None:
+        self._stage("pending_retries", task_id, None)
+
+    # Queue contents
+
+    def save_queued(self, task_id: Any, priority: str) -> None:
+        with self._lock:
+            self._queue_seq += 1
+            self._pending["queued_tasks"][str(task_id)] = (str(task_id), _enum_value(priority), self._queue_seq)
+
+    def delete_queued(self, task_id: Any) -> None:
+        self._stage("queued_tasks", task_id, None)
+
+    def flush(self) -> int:
+        """Write all buffered changes in a single transaction. Returns the number of rows touched."""
+        # Hold the DB lock across swap and write so batches reach disk in order
+        with self._db_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {table: {} for table in UPSERT_SQL}
+
+            count = sum(len(rows) for rows in pending.values())
+            if not count:
+                return 0
+
+            try:
+                with self._conn:
+                    for table, rows in pending.items():
+                        upserts = [row for row in rows.values() if row is not None]
+                        deletes = [(task_id,) for task_id, row in rows.items() if row is None]
+                        if deletes:
+                            self._conn.executemany(f"DELETE FROM {table} WHERE task_id = ?", deletes)
+                        if upserts:
+                            self._conn.executemany(UPSERT_SQL[table], upserts)
+            except sqlite3.Error as e:
+                logging.error(f"Failed to flush scheduler state: {e}")
+                # Put the batch back unless newer changes for the same rows arrived meanwhile
+                with self._lock:
+                    for table, rows in pending.items():
+                        for task_id, row in rows.items():
+                            self._pending[table].setdefault(task_id, row)
+                return 0
+        logging.debug(f"Flushed {count} scheduler state changes")
+        return count
+
+    def load_state(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Load all persisted scheduler state."""
+        with self._db_lock:
+            scheduled = self._conn.execute(
+                "SELECT task_id, cron_expr, priority, offset_seconds FROM scheduled_jobs").fetchall()
+            retries = self._conn.execute(
+                "SELECT task_id, due_ts, kind FROM pending_retries ORDER BY due_ts").fetchall()
+            queued = self._conn.execute(
+                "SELECT task_id, priority FROM queued_tasks ORDER BY seq").fetchall()
+        return {
+            "scheduled": [
+                {"task_id": r[0], "cron_expr": r[1], "priority": r[2], "offset": r[3]} for r in scheduled
+            ],
+            "retries": [{"task_id": r[0], "due_ts": r[1], "kind": r[2]} for r in retries],
+            "queued": [{"task_id": r[0], "priority": r[1]} for r in queued],
+        }
+
+    def close(self) -> None:
+        """Flush outstanding changes and close the database."""
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
@@ -8,7 +8,7 @@ from copy import deepcopy
 
 from domain.exceptions import EntityNotFoundError
 from domain.entities.repositories import BaseRepository
-from domain.entities.models import Task, TaskStatus
+from domain.entities.models import Task, TaskStatus, TaskScheduleType
 
 class TaskRepository(BaseRepository[Task]):
     """
@@ -27,6 +27,15 @@ class TaskRepository(BaseRepository[Task]):
         self._task_execute_history: List[Task] = []
         self.persistence_manager = persistence_manager
         
+        # Persistence writes per task in its current lifecycle (until DONE/FAILED/TIMEOUT)
+        self._lifecycle_writes: Dict[UUID, int] = {}
+        self._write_stats = {
+            "writes": 0,
+            "noop_transitions": 0,
+            "completed_lifecycles": 0,
+            "completed_lifecycle_writes": 0
+        }
+        
         # Try to recover tasks on initialization
         if self.persistence_manager:
             self._recover_tasks()
@@ -40,12 +49,17 @@ class TaskRepository(BaseRepository[Task]):
         if not task_dicts:
             return
         
+        recovered_ids = set()
         for task_dict in task_dicts:
-            # Skip tasks that are already DONE or FAILED
+            # Skip tasks that are already DONE or FAILED, unless they recur on a cron schedule.
+            # The snapshot also holds history copies of finished tasks, so a recurring
+            # task is only made active once.
             if task_dict["status"] in (TaskStatus.DONE, TaskStatus.FAILED):
                 history_task = Task(**task_dict)
-                self._task_execute_history.append(history_task)
-                continue
+                recurring = history_task.task_type == TaskScheduleType.SCHEDULED and history_task.cron_expr
+                if not recurring or history_task.id in recovered_ids:
+                    self._task_execute_history.append(history_task)
+                    continue
                 
             # Tasks that were RUNNING when the app crashed should be reset to PENDING
             if task_dict["status"] == TaskStatus.RUNNING:
@@ -54,6 +68,29 @@ class TaskRepository(BaseRepository[Task]):
             # Add the task to the active task list
             task = Task(**task_dict)
             self._tasks.append(task)
+            recovered_ids.add(task.id)
+    
+    def _record_write(self, task: Task):
+        """Count a durable write for task; fold the count into the stats when its lifecycle ends."""
+        self._write_stats["writes"] += 1
+        writes = self._lifecycle_writes.get(task.id, 0) + 1
+        if task.status in (TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.TIMEOUT):
+            self._lifecycle_writes.pop(task.id, None)
+            self._write_stats["completed_lifecycles"] += 1
+            self._write_stats["completed_lifecycle_writes"] += writes
+        else:
+            self._lifecycle_writes[task.id] = writes
+    
+    def get_lifecycle_writes(self, task_id: UUID) -> int:
+        """Number of persistence writes for the task's current (unfinished) lifecycle."""
+        return self._lifecycle_writes.get(task_id, 0)
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Persistence write counters, including the average writes per finished task lifecycle."""
+        stats = dict(self._write_stats)
+        completed = stats["completed_lifecycles"]
+        stats["avg_writes_per_lifecycle"] = stats["completed_lifecycle_writes"] / completed if completed else 0.0
+        return stats
     
     def persist_tasks(self):
         """Save current tasks to persistent storage."""
@@ -78,6 +115,7 @@ class TaskRepository(BaseRepository[Task]):
     def add(self, entity: Task) -> Task:
         """Add a new task."""
         self._tasks.append(entity)
+        self._record_write(entity)
         self.persist_tasks()
         return entity
 
@@ -94,6 +132,7 @@ class TaskRepository(BaseRepository[Task]):
                     # Deep copy to history to prevent modification
                     self._task_execute_history.append(deepcopy(entity))
                 
+                self._record_write(entity)
                 self.persist_tasks()
                 return entity
         
@@ -120,9 +159,15 @@ class TaskRepository(BaseRepository[Task]):
         return self.get_by_status(TaskStatus.PENDING)
     
     def update_task_status(self, task_id: UUID, new_status: TaskStatus) -> Task:
-        """Update the status of a task."""
+        """
+        Update the status of a task. Setting the status the task already has is
+        a no-op (no version bump, no write); invalid transitions raise
+        InvalidStatusTransition.
+        """
         task = self.get_by_id(task_id)
-        task.update_status(new_status)
+        if not task.update_status(new_status):
+            self._write_stats["noop_transitions"] += 1
+            return task
         return self.update(task)
     
     def add_from_dict(self, task_data: Dict[str, Any]) -> Task:
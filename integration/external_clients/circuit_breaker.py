@@ -0,0 +1,224 @@
+"""
+Per-endpoint circuit breakers for calls to external services (Jira, Confluence).
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+import requests
+
+from domain.exceptions import CircuitOpenError
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """
+    Whether an exception says the endpoint itself is unhealthy: connection
+    errors, timeouts, HTTP 5xx and 429. Client errors (400/403/404, bad
+    payloads) and local exceptions are the caller's problem and must not
+    open the breaker for everyone else.
+    """
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status >= 500 or status == 429
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              ConnectionError, TimeoutError))
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker for one external endpoint.
+
+    - CLOSED: calls pass; consecutive failures are counted
+    - OPEN: calls are rejected until recovery_timeout has elapsed
+    - HALF_OPEN: up to half_open_max_calls trial calls pass; one success
+      closes the breaker, one failure re-opens it. Calls rejected while the
+      trial calls are in flight are told to come back after probe_timeout
+    """
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, recovery_timeout: float = 30,
+                 half_open_max_calls: int = 1, probe_timeout: float = 5,
+                 clock: Callable[[], float] = time.monotonic):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.probe_timeout = probe_timeout
+        self.clock = clock
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._successes = 0
+        self._failures = 0
+        self._rejected = 0
+        self._open_count = 0
+        self._last_state_change = time.time()
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logging.info(f"Circuit breaker [{self.endpoint}] {self._state} -> {state}")
+            self._state = state
+            self._last_state_change = time.time()
+
+    def _refresh(self) -> None:
+        """Move OPEN to HALF_OPEN once the recovery timeout has elapsed (lock held)."""
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.recovery_timeout:
+            self._set_state(self.HALF_OPEN)
+            self._half_open_in_flight = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def is_open(self) -> bool:
+        """True while calls to this endpoint would be rejected."""
+        return self.state == self.OPEN
+
+    def remaining_open_time(self) -> float:
+        """
+        Seconds until the breaker lets another call through: the rest of the
+        recovery timeout while OPEN, probe_timeout while HALF_OPEN with all
+        trial slots taken, 0 otherwise.
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.HALF_OPEN and self._half_open_in_flight >= self.half_open_max_calls:
+                return self.probe_timeout
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (self.clock() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """Reserve permission for one call; must be followed by record_success/record_failure."""
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+            self._consecutive_failures = 0
+            if self._state == self.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._half_open_in_flight = 0
+                self._opened_at = self.clock()
+                if self._state != self.OPEN:
+                    self._open_count += 1
+                self._set_state(self.OPEN)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Invoke func through the breaker, raising CircuitOpenError if it is open."""
+        if not self.allow_request():
+            raise CircuitOpenError(self.endpoint, retry_after=self.remaining_open_time())
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_endpoint_failure(e):
+                self.record_failure()
+            else:
+                # The endpoint answered; only the request was wrong
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "successes": self._successes,
+                "failures": self._failures,
+                "rejected": self._rejected,
+                "open_count": self._open_count,
+                "last_state_change": self._last_state_change
+            }
+
+class CircuitBreakerRegistry:
+    """
+    Process-wide registry of circuit breakers keyed by endpoint URL.
+    Shared by the integration clients (which record outcomes) and the
+    scheduler (which defers tasks whose endpoints are open).
+    """
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30,
+                 half_open_max_calls: int = 1, probe_timeout: float = 5,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.probe_timeout = probe_timeout
+        self.clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(endpoint: str) -> str:
+        """Normalise an endpoint so "https://jira.example.com/" and "jira.example.com" share a breaker."""
+        endpoint = (endpoint or "").strip().rstrip('/')
+        for prefix in ("https://", "http://"):
+            if endpoint.startswith(prefix):
+                endpoint = endpoint[len(prefix):]
+        return endpoint.lower()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        key = self.normalize(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    key,
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout,
+                    half_open_max_calls=self.half_open_max_calls,
+                    probe_timeout=self.probe_timeout,
+                    clock=self.clock
+                )
+                self._breakers[key] = breaker
+            return breaker
+
+    def call(self, endpoint: str, func: Callable, *args, **kwargs) -> Any:
+        return self.get(endpoint).call(func, *args, **kwargs)
+
+    def is_open(self, endpoint: str) -> bool:
+        key = self.normalize(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(key)
+        return breaker is not None and breaker.is_open()
+
+    def remaining_open_time(self, endpoints) -> float:
+        """Longest remaining open time across endpoints (0 if none is open)."""
+        remaining = 0.0
+        for endpoint in endpoints:
+            key = self.normalize(endpoint)
+            with self._lock:
+                breaker = self._breakers.get(key)
+            if breaker is not None:
+                remaining = max(remaining, breaker.remaining_open_time())
+        return remaining
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {key: breaker.get_metrics() for key, breaker in breakers}
@@ -2,6 +2,7 @@ import logging
 import time
 from atlassian import Confluence
 from bs4 import BeautifulSoup
+from infrastructure.monitoring.resource_accounting import install_session_hooks, record_external_call
 
 class ConfluenceService:
     """
@@ -11,15 +12,30 @@ class ConfluenceService:
     - parse_table_cell, etc.
     No direct knowledge of business rules, which live in the domain layer.
     """
-    def __init__(self, url: str, username: str, password: str):
+    def __init__(self, url: str, username: str, password: str, circuit_breakers=None):
+        self.url = url
+        self.circuit_breakers = circuit_breakers
         self.confluence = Confluence(
             url=url,
             username=username,
             password=password
         )
+        # Count HTTP requests and bytes for the task making the calls
+        install_session_hooks(self.confluence._session)
+
+    def _call(self, func, *args, **kwargs):
+        """
+        Invoke a Confluence API call through the circuit breaker for this base URL
+        (raises CircuitOpenError while it is open). Calls directly without a registry.
+        """
+        record_external_call()
+        if self.circuit_breakers is None:
+            return func(*args, **kwargs)
+        return self.circuit_breakers.call(self.url, func, *args, **kwargs)
 
     def get_page_xhtml(self, page_id: str) -> dict:
-        page_info = self.confluence.get_page_by_id(
+        page_info = self._call(
+            self.confluence.get_page_by_id,
             page_id=page_id,
             expand='body.storage,version'
         )
@@ -117,7 +133,8 @@ class ConfluenceService:
         Returns True if successful, False otherwise.
         """
         updated_body = str(soup)
-        update_resp = self.confluence.update_page(
+        update_resp = self._call(
+            self.confluence.update_page,
             page_id=page_id,
             title=title,
             body=updated_body,
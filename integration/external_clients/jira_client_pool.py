@@ -0,0 +1,67 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from integration.external_clients.jira_service import JiraService
+
+
+class JiraClientPool:
+    """
+    按 Jira 环境管理 JiraService：每个环境一个客户端（一个 requests.Session 和按并发度设定大小的连接池），
+    首次使用时创建，之后所有线程共享，连接保持 keep-alive 复用。
+
+    environments 中没有配置的环境使用默认客户端（与只有一个 Jira 时的行为相同）。
+    """
+
+    def __init__(self, default_config: Dict[str, Any], environments: Optional[Dict[str, Dict[str, Any]]] = None,
+                 client_factory: Callable[..., JiraService] = JiraService, **client_kwargs):
+        """
+        :param default_config: 默认 Jira 的 url/username/password
+        :param environments: {环境名: {url, username, password}}，未给出的账号信息沿用默认配置
+        :param client_factory: 创建客户端的函数，默认 JiraService
+        :param client_kwargs: 传给每个客户端的其他参数（熔断器、缓存、pool_maxsize 等）
+        """
+        self.default_config = default_config
+        self.environments = environments or {}
+        self.client_factory = client_factory
+        self.client_kwargs = client_kwargs
+
+        self._clients: Dict[str, JiraService] = {}
+        self._unlisted_envs = set()
+        self._lock = threading.Lock()
+
+    def _resolve(self, env: Optional[str]):
+        """环境名 -> (客户端key, 连接配置)"""
+        if env is None or env not in self.environments:
+            if env is not None and env not in self._unlisted_envs:
+                self._unlisted_envs.add(env)
+                logging.warning(f"Jira environment {env} is not configured, using the default Jira client")
+            return "default", self.default_config
+        return env, dict(self.default_config, **self.environments[env])
+
+    def get(self, env: Optional[str] = None) -> JiraService:
+        """返回环境对应的客户端（线程安全，每个环境只创建一次）"""
+        with self._lock:
+            key, config = self._resolve(env)
+            client = self._clients.get(key)
+            if client is None:
+                client = self.client_factory(
+                    url=config.get('url'),
+                    username=config.get('username'),
+                    password=config.get('password'),
+                    **self.client_kwargs
+                )
+                self._clients[key] = client
+                logging.info(f"Created Jira client for {key} ({config.get('url')})")
+            return client
+
+    def endpoint_for(self, env: Optional[str] = None) -> Optional[str]:
+        """环境对应客户端的 Jira URL（熔断器、限流器按该URL区分），不会创建客户端"""
+        with self._lock:
+            return self._resolve(env)[1].get('url')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """每个环境客户端的连接复用统计"""
+        with self._lock:
+            clients = dict(self._clients)
+        return {key: client.get_connection_stats() for key, client in clients.items()}
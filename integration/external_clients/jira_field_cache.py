@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class _FieldCatalog:
+    """某个Jira环境的字段元数据快照"""
+
+    def __init__(self, fields: List[Dict[str, Any]], loaded_at: float):
+        self.loaded_at = loaded_at
+        self.name_to_id: Dict[str, str] = {}
+        for field in fields:
+            field_id = field.get('id')
+            if not field_id:
+                continue
+            # 字段ID本身也能解析；同名字段取第一个（与原先线性查找一致）
+            self.name_to_id.setdefault(field_id, field_id)
+            name = field.get('name')
+            if name:
+                self.name_to_id.setdefault(name, field_id)
+
+
+class JiraFieldCache:
+    """
+    按Jira环境缓存字段目录（get_all_fields），提供 字段名 -> 字段ID 的O(1)查找。
+
+    - 缓存在 ttl_seconds 后过期，下次查找时重新加载
+    - 查不到的字段名会触发一次重新加载（字段可能刚创建），但同一环境两次加载至少间隔 min_refresh_interval 秒，
+      避免错误的字段名导致反复下载整个字段目录
+    - 同一环境同时只有一个线程在加载，其余线程等待其结果
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, min_refresh_interval: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self.clock = clock
+
+        self._catalogs: Dict[str, _FieldCatalog] = {}
+        self._env_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "load_errors": 0}
+
+    def _env_lock(self, env: str) -> threading.Lock:
+        with self._lock:
+            lock = self._env_locks.get(env)
+            if lock is None:
+                lock = self._env_locks[env] = threading.Lock()
+            return lock
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    def _is_fresh(self, catalog: Optional[_FieldCatalog]) -> bool:
+        return catalog is not None and self.clock() - catalog.loaded_at <= self.ttl_seconds
+
+    def _load(self, env: str, loader: Callable[[], List[Dict[str, Any]]],
+              stale: Optional[_FieldCatalog]) -> _FieldCatalog:
+        """在环境锁内加载；若等待期间其他线程已加载完成，则直接使用其结果"""
+        with self._env_lock(env):
+            current = self._catalogs.get(env)
+            if current is not None and current is not stale and self._is_fresh(current):
+                return current
+            try:
+                fields = loader()
+            except Exception:
+                self._count("load_errors")
+                raise
+            catalog = _FieldCatalog(fields or [], self.clock())
+            self._catalogs[env] = catalog
+            self._count("loads")
+            logging.info(f"Loaded {len(fields or [])} Jira fields for {env}")
+            return catalog
+
+    def _catalog(self, env: str, loader: Callable[[], List[Dict[str, Any]]]) -> _FieldCatalog:
+        catalog = self._catalogs.get(env)
+        if self._is_fresh(catalog):
+            return catalog
+        return self._load(env, loader, catalog)
+
+    def resolve(self, env: str, field_names: Iterable[str],
+                loader: Callable[[], List[Dict[str, Any]]]) -> Dict[str, str]:
+        """
+        一次解析多个字段名（批量操作用）
+
+        :param env: Jira环境（URL）
+        :param field_names: 字段名或字段ID
+        :param loader: 返回字段列表的函数，通常是 jira.get_all_fields
+        :return: {字段名: 字段ID}，无法解析的字段名不在结果中
+        """
+        names = list(dict.fromkeys(field_names))
+        catalog = self._catalog(env, loader)
+        resolved = {name: catalog.name_to_id[name] for name in names if name in catalog.name_to_id}
+        missing = [name for name in names if name not in resolved]
+        if missing and self.clock() - catalog.loaded_at >= self.min_refresh_interval:
+            # 字段可能是缓存加载之后才创建的
+            catalog = self._load(env, loader, catalog)
+            resolved.update({name: catalog.name_to_id[name] for name in missing if name in catalog.name_to_id})
+        self._count("hits", len(resolved))
+        self._count("misses", len(names) - len(resolved))
+        return resolved
+
+    def get_field_id(self, env: str, field_name: str,
+                     loader: Callable[[], List[Dict[str, Any]]]) -> Optional[str]:
+        return self.resolve(env, [field_name], loader).get(field_name)
+
+    def warm(self, env: str, loader: Callable[[], List[Dict[str, Any]]]) -> None:
+        """预先加载（或刷新）某个环境的字段目录"""
+        self._load(env, loader, self._catalogs.get(env))
+
+    def invalidate(self, env: Optional[str] = None) -> None:
+        """清除某个环境的缓存；env为None时清除全部"""
+        with self._lock:
+            if env is None:
+                self._catalogs.clear()
+            else:
+                self._catalogs.pop(env, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        now = self.clock()
+        stats["environments"] = {
+            env: {"fields": len(catalog.name_to_id), "age_seconds": round(now - catalog.loaded_at, 1)}
+            for env, catalog in list(self._catalogs.items())
+        }
+        return stats
@@ -0,0 +1,83 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+
+class ProjectPermissionCache:
+    """
+    缓存每个 (Jira环境, 项目) 的角色成员集合，权限检查 (env, project, user) 直接在集合中查找。
+
+    - 成员集合在 ttl_seconds 后过期，下次检查时重新加载
+    - 同一项目的多个用户检查共用一次加载；同一项目同时只有一个线程在加载
+    - 加载失败不缓存
+    """
+
+    def __init__(self, ttl_seconds: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+
+        self._members: Dict[Tuple[str, str], Tuple[float, FrozenSet[str]]] = {}
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "loads": 0, "load_errors": 0}
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _fresh(self, key: Tuple[str, str]) -> Optional[FrozenSet[str]]:
+        entry = self._members.get(key)
+        if entry is not None and self.clock() - entry[0] <= self.ttl_seconds:
+            return entry[1]
+        return None
+
+    def get_members(self, env: str, project_key: str, loader: Callable[[], Any]) -> FrozenSet[str]:
+        """
+        项目的角色成员集合
+
+        :param loader: 返回成员用户名集合的函数（会发起Jira请求）
+        """
+        key = (env, project_key)
+        members = self._fresh(key)
+        if members is not None:
+            self._count("hits")
+            return members
+        with self._key_lock(key):
+            # 等待期间其他线程可能已经加载完成
+            members = self._fresh(key)
+            if members is not None:
+                self._count("hits")
+                return members
+            try:
+                members = frozenset(loader())
+            except Exception:
+                self._count("load_errors")
+                raise
+            self._members[key] = (self.clock(), members)
+            self._count("loads")
+            logging.info(f"Loaded {len(members)} role members of project {project_key} on {env}")
+            return members
+
+    def has_permission(self, env: str, project_key: str, username: str, loader: Callable[[], Any]) -> bool:
+        return username in self.get_members(env, project_key, loader)
+
+    def invalidate(self, env: Optional[str] = None, project_key: Optional[str] = None) -> None:
+        """清除缓存：指定env/project时只清除匹配的项目，都不指定时清除全部"""
+        with self._lock:
+            for key in list(self._members):
+                if (env is None or key[0] == env) and (project_key is None or key[1] == project_key):
+                    del self._members[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["projects"] = len(self._members)
+        return stats
@@ -1,5 +1,44 @@
 import logging
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
 from atlassian import Jira
+from requests.adapters import HTTPAdapter
+from infrastructure.monitoring.resource_accounting import install_session_hooks, record_external_call
+from integration.external_clients.jira_field_cache import JiraFieldCache
+from integration.external_clients.jira_permission_cache import ProjectPermissionCache
+from integration.external_clients.rate_limiter import parse_retry_after
+from integration.external_clients.circuit_breaker import CircuitBreakerRegistry
+
+# Jira 限流/过载时返回的状态码；这类失败会暂停该环境的所有调用并重试
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_jira_datetime(value) -> Optional[float]:
+    """
+    Jira日期时间字段（如 fields.updated "2024-05-01T10:15:30.000+0000"）转为epoch秒；无法解析时返回None
+    """
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def format_jql_datetime(epoch_seconds: float, tz=timezone.utc) -> str:
+    """
+    epoch秒转为JQL日期时间 "yyyy-MM-dd HH:mm"（分钟精度，向下取整）。
+    JQL按Jira账号的时区解释该时间，tz应与之一致。
+    """
+    return datetime.fromtimestamp(epoch_seconds, tz).strftime("%Y-%m-%d %H:%M")
+
+# /rest/api/2/issue/bulk 单次请求最多创建的issue数
+BULK_CREATE_MAX = 50
 
 
 class JiraService:
@@ -14,18 +53,174 @@ class JiraService:
     5. 删除 Issue 前，检查某些字段是否有值或无值，以及检查状态是否符合要求再执行删除
     """
 
-    def __init__(self, url: str, username: str, password: str):
+    def __init__(self, url: str, username: str, password: str, circuit_breakers=None, field_cache=None,
+                 page_workers: int = 4, permission_cache=None, pool_maxsize: int = 10,
+                 rate_limiters=None, throttle_retries: int = 2, issue_store=None,
+                 issue_max_age: float = 300, delete_check_max_age: float = 30):
         """
         初始化 Jira Helper，并登录 Jira。
         :param url: Jira 的 URL，例如 "https://your-jira.com"
         :param username: Jira 用户名
         :param password: Jira 密码或 API Token
+        :param circuit_breakers: 可选的 CircuitBreakerRegistry，按 endpoint 记录调用成败并在熔断时拒绝调用
+        :param field_cache: 可选的 JiraFieldCache（可在多个环境间共享），默认每个实例单独缓存
+        :param page_workers: search_issues(fetch_all=True) 并发获取分页、并发获取项目角色详情的线程数
+        :param permission_cache: 可选的 ProjectPermissionCache（可在多个环境间共享），默认每个实例单独缓存
+        :param pool_maxsize: 每个主机保持的 keep-alive 连接数，应不小于访问本环境的最大并发线程数，
+                             否则超出的连接用完即被丢弃、无法复用
+        :param rate_limiters: 可选的 RateLimiterRegistry（进程内共享），同一环境的所有调用按其令牌桶和并发上限执行
+        :param throttle_retries: 配置了 rate_limiters 时，被限流（429/503）的调用在 Retry-After 之后的重试次数
+        :param issue_store: 可选的 JiraIssueStore（本地issue缓存，可在多个环境间共享）；搜索结果写入其中，
+                            get_issue、层级/项目查询在新鲜度范围内直接从本地读取
+        :param issue_max_age: 本地读取issue、root ticket层级和项目issues时允许的最大数据年龄（秒）
+        :param delete_check_max_age: 删除前检查允许的最大数据年龄（秒），应比 issue_max_age 更严格
         """
+        self.url = url
+        self.circuit_breakers = circuit_breakers
+        self.field_cache = field_cache or JiraFieldCache()
+        self.page_workers = max(1, page_workers)
+        self.permission_cache = permission_cache or ProjectPermissionCache()
+        self.rate_limiters = rate_limiters
+        self.throttle_retries = max(0, throttle_retries)
+        self.issue_store = issue_store
+        self.issue_max_age = issue_max_age
+        self.delete_check_max_age = delete_check_max_age
         self.jira = Jira(
             url=url,
             username=username,
             password=password
         )
+        # 连接池按并发度设定大小；session 只在这里配置，之后各线程只用它发请求
+        self.pool_maxsize = pool_maxsize
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.jira._session.mount("https://", self._adapter)
+        self.jira._session.mount("http://", self._adapter)
+        # 统计当前任务的HTTP请求数和传输字节数
+        install_session_hooks(self.jira._session)
+
+    def get_connection_stats(self) -> dict:
+        """
+        HTTP连接复用统计：requests 为经过连接池的请求数，new_connections 为新建的连接数，
+        其余请求复用了 keep-alive 连接。
+        """
+        container = self._adapter.poolmanager.pools
+        pools = []
+        for key in container.keys():
+            try:
+                pools.append(container[key])
+            except KeyError:  # 刚被淘汰的主机连接池
+                pass
+        requests_count = sum(pool.num_requests for pool in pools)
+        new_connections = sum(pool.num_connections for pool in pools)
+        return {
+            "url": self.url,
+            "pool_maxsize": self.pool_maxsize,
+            "requests": requests_count,
+            "new_connections": new_connections,
+            "reused_connections": max(0, requests_count - new_connections),
+            "reuse_ratio": (requests_count - new_connections) / requests_count if requests_count else 0.0
+        }
+
+    def _call_endpoint(self, endpoint: str, func, *args, **kwargs):
+        """
+        通过 endpoint 对应的熔断器调用 func；熔断打开时抛出 CircuitOpenError。
+        配置了限流器时调用在熔断器内经过 endpoint 的限流器。未配置时直接调用。
+        """
+        record_external_call()
+        call = func
+        if self.rate_limiters is not None:
+            limiter = self.rate_limiters.get(endpoint)
+            call = lambda *a, **kw: self._call_limited(limiter, func, *a, **kw)
+        if self.circuit_breakers is None:
+            return call(*args, **kwargs)
+        return self.circuit_breakers.call(endpoint, call, *args, **kwargs)
+
+    def _call_limited(self, limiter, func, *args, **kwargs):
+        """
+        按限流器调用 func，并把耗时和是否被限流反馈给限流器。
+        被限流（429/503）时限流器按 Retry-After 暂停该环境，之后重试，最多 throttle_retries 次。
+        """
+        attempt = 0
+        while True:
+            limiter.acquire()
+            started = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                response = getattr(e, 'response', None)
+                throttled = getattr(response, 'status_code', None) in THROTTLE_STATUS_CODES
+                retry_after = parse_retry_after(response.headers.get('Retry-After')) if throttled else None
+                limiter.release(time.monotonic() - started, throttled=throttled, retry_after=retry_after, failed=True)
+                if throttled and attempt < self.throttle_retries:
+                    attempt += 1
+                    logging.info(f"Jira {limiter.endpoint} throttled (HTTP {response.status_code}), "
+                                 f"retry {attempt}/{self.throttle_retries}")
+                    continue
+                raise
+            limiter.release(time.monotonic() - started)
+            return result
+
+    def _call(self, func, *args, **kwargs):
+        """以本实例的 Jira URL 作为 endpoint 调用 func。"""
+        return self._call_endpoint(self.url, func, *args, **kwargs)
+
+    @staticmethod
+    def _store_env(jira_env_url: str) -> str:
+        """本地issue缓存中的环境名（"https://env1.jira.com/" 与 "env1.jira.com" 相同）"""
+        return CircuitBreakerRegistry.normalize(jira_env_url)
+
+    def _store_issues(self, issues, fields, jira_env_url: str = None, scope: str = None):
+        """
+        把Jira返回的issues写入本地缓存；scope 表示这是该树/项目的完整结果。
+        缓存写入失败只记录日志，不影响调用方。
+        """
+        if self.issue_store is None or not issues:
+            return
+        env = self._store_env(jira_env_url or self.url)
+        try:
+            if scope is not None:
+                self.issue_store.replace_scope(env, scope, issues, fields)
+            else:
+                self.issue_store.upsert_issues(env, issues, fields)
+        except Exception as e:
+            logging.warning(f"Failed to store {len(issues)} issues of {env} locally: {e}")
+
+    def _search_page(self, jql, start, limit, fields, expand, validate_query) -> dict:
+        """一次 /rest/api/2/search 请求；返回的issues写入本地缓存"""
+        result = self._call(
+            self.jira.jql,
+            jql=jql,
+            start=start,
+            limit=limit,
+            fields=fields,
+            expand=expand,
+            validate_query=validate_query
+        )
+        self._store_issues(result.get('issues'), fields)
+        return result
+
+    def get_issue(self, issue_key: str, fields="*all", max_age: float = None) -> dict:
+        """
+        获取单个 Issue：本地缓存中有包含所需字段且不超过 max_age 秒（默认 issue_max_age）的数据时直接返回，
+        否则请求Jira并写入缓存。
+
+        :param fields: 需要的字段（列表或逗号分隔字符串），默认 "*all"
+        """
+        max_age = self.issue_max_age if max_age is None else max_age
+        if self.issue_store is not None:
+            issue = self.issue_store.get_issue(self._store_env(self.url), issue_key, fields, max_age)
+            if issue is not None:
+                return issue
+        if not isinstance(fields, str):
+            fields = ",".join(fields)
+        issue = self._call(self.jira.issue, issue_key, fields=fields)
+        self._store_issues([issue], fields)
+        return issue
+
+    def _invalidate_stored_issue(self, issue_key: str):
+        if self.issue_store is not None:
+            self.issue_store.invalidate(self._store_env(self.url), issue_key)
+
     def check_project_permission_mock(self, project_key: str, check_username: str) -> bool:
         """
         Mock
@@ -44,34 +239,61 @@ class JiraService:
         这里以项目中是否配置到某些角色(actors)中为例进行判断（简单示例）。
         根据实际业务需要，可以进一步细化权限判断逻辑。
 
+        项目的角色成员集合按 (环境, 项目) 缓存，同一项目的多个用户检查共用一次获取。
+
         :param project_key: Jira 项目的 Key
         :param check_username: 要检查权限的用户名
         :return: 如果用户在项目角色中出现，则返回 True，否则 False
         """
         try:
-            # 获取该项目下所有角色对应的链接
-            project_roles = self.jira.project_role(project_key)
-            # project_roles 形如 {"Administrators": "https://xxx", "Developers": "https://xxx"} 等
-
-            for role_name, role_link in project_roles.items():
-                # role_link 形如 "https://xxx/rest/api/2/project/PROJ/role/10002"
-                role_id = role_link.split('/')[-1]
-                # 获取该角色的详细信息
-                role_details = self.jira.get_project_role_details_by_id(project_key, role_id)
-                # role_details 中包含 actors 列表，可用来判断用户是否在此角色下
-                actors = role_details.get('actors', [])
-                for actor in actors:
-                    if actor['type'] == 'atlassian-user-role-actor':
-                        # 不同 Jira 版本里 actorUser 字段可能不同，这里以 name 或 accountId 等字段做判断
-                        # 假设兼容老版 Jira username 以及新版 accountId
-                        actor_name = actor['actorUser'].get('name') or actor['actorUser'].get('accountId')
-                        if actor_name == check_username:
-                            return True
+            return self.permission_cache.has_permission(
+                self.url, project_key, check_username, lambda: self.get_project_role_members(project_key)
+            )
         except Exception as e:
             print(f"获取项目权限时出现异常: {e}")
 
         return False
 
+    def get_project_role_members(self, project_key: str) -> set:
+        """
+        获取项目所有角色中的用户（不经过缓存）。各角色的详情并发获取。
+
+        :param project_key: Jira 项目的 Key
+        :return: 用户名集合（兼容老版 Jira username 以及新版 accountId）
+        """
+        # 获取该项目下所有角色对应的链接（GET project/{key}/role）
+        project_roles = self._call(self.jira.get_project_roles, project_key)
+        # project_roles 形如 {"Administrators": "https://xxx", "Developers": "https://xxx"} 等
+        # role_link 形如 "https://xxx/rest/api/2/project/PROJ/role/10002"
+        role_ids = [role_link.rstrip('/').split('/')[-1] for role_link in (project_roles or {}).values()]
+        if not role_ids:
+            return set()
+
+        with ThreadPoolExecutor(max_workers=min(self.page_workers, len(role_ids)),
+                                thread_name_prefix="JiraProjectRole") as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run,
+                            self._call, self.jira.get_project_actors_for_role_project, project_key, role_id)
+                for role_id in role_ids
+            ]
+            # GET project/{key}/role/{id} 的 actors 列表
+            roles_actors = [future.result() or [] for future in futures]
+
+        members = set()
+        for actors in roles_actors:
+            for actor in actors:
+                if actor.get('type') == 'atlassian-user-role-actor':
+                    # Jira Server/DC 的 actor 直接带 name，Cloud 在 actorUser 中带 accountId
+                    actor_user = actor.get('actorUser') or {}
+                    for actor_name in (actor.get('name'), actor_user.get('name'), actor_user.get('accountId')):
+                        if actor_name:
+                            members.add(actor_name)
+        return members
+
+    def invalidate_permission_cache(self, project_key: str = None):
+        """项目角色变更后调用；不指定项目时清除本环境的全部缓存"""
+        self.permission_cache.invalidate(self.url, project_key)
+
     def search_issues(self,
                       jql: str,
                       fields: str = "*all",
@@ -89,44 +311,171 @@ class JiraService:
         :param limit: 每次查询的数量，默认不指定则由 Jira 的默认限制决定
         :param expand: 扩展字段
         :param validate_query: 是否验证 query
-        :param fetch_all: 是否自动翻页获取全部 Issue，默认 False
+        :param fetch_all: 是否自动翻页获取全部 Issue（第一页之后的分页并发获取，按顺序拼接），默认 False
         :return: Issue 列表（每个元素都是字典对象）
         """
         if not fetch_all:
             # 不获取全部，仅单次调用
-            return self.jira.jql(
-                jql=jql,
-                start=start,
-                limit=limit,
-                fields=fields,
-                expand=expand,
-                validate_query=validate_query
-            ).get('issues', [])
-
-        # 如果需要获取全部，循环翻页
-        all_issues = []
-        current_start = start
+            return self._search_page(jql, start, limit, fields, expand, validate_query).get('issues', [])
+
+        # 如果需要获取全部：第一页返回 total 后，其余分页的 offset 都已确定，并发获取后按顺序拼接
         per_page = limit if limit else 50  # 如果没指定 limit，就用一个默认值做分页
 
-        while True:
-            result = self.jira.jql(
-                jql=jql,
-                start=current_start,
-                limit=per_page,
-                fields=fields,
-                expand=expand,
-                validate_query=validate_query
-            )
-            issues = result.get('issues', [])
-            all_issues.extend(issues)
+        def fetch_page(page_start, page_limit):
+            return self._search_page(jql, page_start, page_limit, fields, expand, validate_query)
 
-            total = result.get('total', 0)
-            current_start += len(issues)
-            if current_start >= total:
-                break
+        first = fetch_page(start, per_page)
+        first_issues = first.get('issues', [])
+        total = first.get('total', 0)
+        if not first_issues or start + len(first_issues) >= total:
+            return first_issues
+
+        # Jira 可能把 maxResults 截断到系统上限，以第一页实际返回的数量作为页大小
+        page_size = min(per_page, len(first_issues))
+        offsets = list(range(start + len(first_issues), total, page_size))
+        workers = min(self.page_workers, len(offsets))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="JiraSearchPage") as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, fetch_page, offset, page_size)
+                for offset in offsets
+            ]
+            pages = [future.result().get('issues', []) for future in futures]
 
+        all_issues = list(first_issues)
+        for issues in pages:
+            all_issues.extend(issues)
         return all_issues
 
+    def search_issues_iter(self,
+                           jql: str,
+                           fields: str = "*all",
+                           start: int = 0,
+                           page_size: int = 50,
+                           expand: str = None,
+                           validate_query: bool = None,
+                           prefetch: bool = True):
+        """
+        按 JQL 逐页获取并逐个 yield Issue 的生成器。调用方得到答案后可以随时停止迭代（break / close），
+        不会再请求后续分页。
+
+        prefetch=True 时，在产出当前页的同时后台获取下一页，内存中最多同时保留两页。
+
+        :param jql: JQL 查询语句
+        :param fields: 要返回的字段，默认 "*all"；只需要部分字段时应尽量指定以减小每页大小
+        :param start: 起始位置，默认从 0 开始
+        :param page_size: 每页数量（Jira 可能截断到系统上限，以实际返回数量为准）
+        :param expand: 扩展字段
+        :param validate_query: 是否验证 query
+        :param prefetch: 是否预取下一页
+        """
+        def fetch_page(page_start):
+            return self._search_page(jql, page_start, page_size, fields, expand, validate_query)
+
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="JiraSearchPrefetch") if prefetch else None
+        try:
+            page_start = start
+            result = fetch_page(page_start)
+            while True:
+                issues = result.get('issues', [])
+                total = result.get('total', 0)
+                next_start = page_start + len(issues)
+                has_next = bool(issues) and next_start < total
+
+                pending = None
+                if has_next and pool is not None:
+                    pending = pool.submit(contextvars.copy_context().run, fetch_page, next_start)
+                result = None  # 当前页只由 issues 引用，产出完毕即可释放
+
+                for issue in issues:
+                    yield issue
+
+                if not has_next:
+                    return
+                issues = None
+                page_start = next_start
+                result = pending.result() if pending is not None else fetch_page(page_start)
+        finally:
+            if pool is not None:
+                # 调用方提前停止时，放弃尚未开始的预取
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def _load_fields(self):
+        return self._call(self.jira.get_all_fields)
+
+    def get_field_id(self, field_name: str):
+        """
+        字段名（或字段ID）-> 字段ID，查不到返回 None。字段目录按环境缓存，不会每次调用都下载。
+        """
+        return self.field_cache.get_field_id(self.url, field_name, self._load_fields)
+
+    def get_field_ids(self, field_names) -> dict:
+        """
+        批量解析字段名，供批量更新使用：只需一次缓存查找（必要时一次加载）。
+
+        :return: {字段名: 字段ID}，无法解析的字段名不在结果中
+        """
+        return self.field_cache.resolve(self.url, field_names, self._load_fields)
+
+    def warm_field_cache(self) -> bool:
+        """启动时预加载字段目录；失败只记录日志，之后首次使用时再加载"""
+        try:
+            self.field_cache.warm(self.url, self._load_fields)
+            return True
+        except Exception as e:
+            logging.warning(f"预加载 Jira 字段目录失败 ({self.url}): {e}")
+            return False
+
+    def invalidate_field_cache(self):
+        """字段配置变更后调用，下次查找时重新加载字段目录"""
+        self.field_cache.invalidate(self.url)
+
+    def create_issue(self, payload: dict, issue_key: str = None) -> dict:
+        """
+        创建单个 Issue。
+
+        :param payload: {"fields": {...}, "update": {...}}，与 /rest/api/2/issue 请求体相同
+        :param issue_key: 未使用，与 update 操作保持相同的调用方式
+        :return: {"id": ..., "key": ..., "self": ...}
+        """
+        return self._call(self.jira.create_issue, fields=payload.get("fields", {}), update=payload.get("update"))
+
+    @staticmethod
+    def _bulk_element_error(error: dict) -> str:
+        element_errors = error.get("elementErrors") or {}
+        messages = list(element_errors.get("errorMessages") or [])
+        messages += [f"{field}: {message}" for field, message in (element_errors.get("errors") or {}).items()]
+        return "; ".join(messages) or f"HTTP {error.get('status', 'error')}"
+
+    def create_issues_bulk(self, payloads: list) -> list:
+        """
+        通过 /rest/api/2/issue/bulk 一次请求创建多个 Issue（最多 BULK_CREATE_MAX 个）。
+
+        Jira 对每个元素单独校验：成功的元素按顺序出现在 "issues" 中，
+        失败的元素在 "errors" 中以 failedElementNumber（请求中的下标）标识。
+        整个请求失败（网络错误、全部元素校验失败时的4xx等）时抛出异常。
+
+        :param payloads: 每个元素与 create_issue 的 payload 相同
+        :return: 与 payloads 一一对应的列表，成功为 {"id", "key", "self"}，失败为 {"error": 错误信息}
+        """
+        if len(payloads) > BULK_CREATE_MAX:
+            raise ValueError(f"Bulk create accepts at most {BULK_CREATE_MAX} issues per request, got {len(payloads)}")
+        issue_updates = [
+            {k: v for k, v in (("fields", p.get("fields", {})), ("update", p.get("update"))) if v is not None}
+            for p in payloads
+        ]
+        response = self._call(self.jira.create_issues, issue_updates) or {}
+
+        failed = {error.get("failedElementNumber"): self._bulk_element_error(error)
+                  for error in response.get("errors") or []}
+        created = iter(response.get("issues") or [])
+        results = []
+        for index in range(len(payloads)):
+            if index in failed:
+                results.append({"error": failed[index]})
+            else:
+                results.append(next(created, None) or {"error": "Bulk create response has no issue for this element"})
+        return results
+
     def update_issue(self, issue_key: str, field_name: str, value) -> bool:
         """
         更新 Issue 指定字段的值。此处通过字段名字获取到真正的字段 ID。
@@ -137,20 +486,16 @@ class JiraService:
         :return: 是否更新成功
         """
         try:
-            # 获取所有字段信息，然后根据 field_name 匹配真正的 field_id
-            all_fields = self.jira.get_all_fields()
-            field_id = None
-            for f in all_fields:
-                if f.get('name') == field_name:
-                    field_id = f.get('id')
-                    break
+            # 通过缓存的字段目录把 field_name 解析为真正的 field_id
+            field_id = self.get_field_id(field_name)
             if not field_id:
                 print(f"未找到字段 '{field_name}' 对应的 field id，更新失败。")
                 return False
 
             # 拼装要更新的数据
             update_data = {field_id: value}
-            self.jira.issue_update(issue_key, fields=update_data)
+            self._call(self.jira.issue_update, issue_key, fields=update_data)
+            self._invalidate_stored_issue(issue_key)
             return True
         except Exception as e:
             print(f"更新 Issue [{issue_key}] 字段 [{field_name}] 失败: {e}")
@@ -172,13 +517,17 @@ class JiraService:
         :param must_not_have_fields: 需要为空的字段名称列表
         :param must_status_in: 允许删除的状态名称列表（可选）
         :return: 是否删除成功
+
+        检查只获取 status 和要检查的字段；本地缓存中不超过 delete_check_max_age 秒的数据可直接用于检查。
         """
         must_have_fields = must_have_fields or {}
         must_not_have_fields = must_not_have_fields or []
         must_status_in = must_status_in or []
 
         try:
-            issue = self.jira.issue(issue_key)
+            check_fields = ["status"] + list(must_have_fields) + list(must_not_have_fields)
+            issue = self.get_issue(issue_key, fields=list(dict.fromkeys(check_fields)),
+                                   max_age=self.delete_check_max_age)
 
             # 1. 检查状态
             status_name = issue['fields'].get('status', {}).get('name')
@@ -208,21 +557,44 @@ class JiraService:
                     return False
 
             # 条件均符合，则执行删除
-            self.jira.delete_issue(issue_key)
+            self._call(self.jira.delete_issue, issue_key)
+            self._invalidate_stored_issue(issue_key)
             print(f"Issue [{issue_key}] 已删除。")
             return True
         except Exception as e:
             print(f"删除 Issue [{issue_key}] 失败: {e}")
             return False
-    def get_issues_by_root_ticket(self, jira_env_url: str, root_ticket_key: str, fields: list = None):
+
+    @staticmethod
+    def _with_updated_since(jql: str, updated_since: str = None) -> str:
+        """在JQL后追加 updated >= 条件，只查询此后更新过的issues"""
+        if not updated_since:
+            return jql
+        return f'({jql}) AND updated >= "{updated_since}"'
+
+    def get_issues_by_root_ticket(self, jira_env_url: str, root_ticket_key: str, fields: list = None,
+                                  updated_since: str = None):
         """
         根据root-ticket key获取相关的JIRA issues数据
         
         :param jira_env_url: JIRA环境URL，如env1.jira.com
         :param root_ticket_key: 根ticket的key，如"PROJ-123"
         :param fields: 需要获取的字段列表
+        :param updated_since: 可选，JQL日期时间（"yyyy-MM-dd HH:mm"），只获取此后更新过的issues
         :return: 包含相关issues及其亲子关系的数据
+
+        配置了本地缓存时，issue_max_age 内完整获取过（且包含所需字段和parent）的层级直接从本地读取。
         """
+        scope = f"root:{root_ticket_key}"
+        # 层级查找依赖 parent 字段，不含 parent 的结果不能作为完整层级
+        hierarchy_fields = fields is None or "parent" in fields
+        if self.issue_store is not None and not updated_since and hierarchy_fields:
+            local = self.issue_store.get_tree(self._store_env(jira_env_url), root_ticket_key, fields,
+                                              self.issue_max_age)
+            if local is not None:
+                logging.info(f"Read {len(local)} issues of root ticket {root_ticket_key} on {jira_env_url} locally")
+                return {"issues": local}
+        jql = self._with_updated_since(f'key = {root_ticket_key} OR parent = {root_ticket_key}', updated_since)
         # 模拟API调用，实际项目中应替换为真实的JIRA API调用
         # 构造模拟数据 - 包含层级结构
         mock_data = {
@@ -264,19 +636,35 @@ class JiraService:
         }
         
         # 记录API调用日志
-        logging.info(f"Retrieved {len(mock_data['issues'])} issues from {jira_env_url} for root ticket {root_ticket_key}")
+        # 与本客户端的其他调用使用同一个 endpoint（熔断器、限流器）
+        issues_data = self._call(lambda: mock_data)
+        logging.info(f"Retrieved {len(issues_data['issues'])} issues from {jira_env_url} for root ticket {root_ticket_key} ({jql})")
+        complete = not updated_since and hierarchy_fields
+        self._store_issues(issues_data['issues'], fields, jira_env_url, scope if complete else None)
         
-        return mock_data
+        return issues_data
 
-    def get_issues_by_project(self, jira_env_url: str, project_key: str, fields: list = None):
+    def get_issues_by_project(self, jira_env_url: str, project_key: str, fields: list = None,
+                              updated_since: str = None):
         """
         根据project key获取相关的JIRA issues数据
         
         :param jira_env_url: JIRA环境URL，如env1.jira.com
         :param project_key: 项目的key，如"PROJ"
         :param fields: 需要获取的字段列表
+        :param updated_since: 可选，JQL日期时间（"yyyy-MM-dd HH:mm"），只获取此后更新过的issues
         :return: 该项目下的issues数据
+
+        配置了本地缓存时，issue_max_age 内完整获取过（且包含所需字段）的项目直接从本地读取。
         """
+        scope = f"project:{project_key}"
+        if self.issue_store is not None and not updated_since:
+            local = self.issue_store.get_project_issues(self._store_env(jira_env_url), project_key, fields,
+                                                        self.issue_max_age)
+            if local is not None:
+                logging.info(f"Read {len(local)} issues of project {project_key} on {jira_env_url} locally")
+                return {"issues": local}
+        jql = self._with_updated_since(f'project = {project_key}', updated_since)
         # 模拟API调用
         mock_data = {
             "issues": [
@@ -303,6 +691,9 @@ class JiraService:
             ]
         }
         
-        logging.info(f"Retrieved {len(mock_data['issues'])} issues from {jira_env_url} for project {project_key}")
+        # 与本客户端的其他调用使用同一个 endpoint（熔断器、限流器）
+        issues_data = self._call(lambda: mock_data)
+        logging.info(f"Retrieved {len(issues_data['issues'])} issues from {jira_env_url} for project {project_key} ({jql})")
+        self._store_issues(issues_data['issues'], fields, jira_env_url, None if updated_since else scope)
         
-        return mock_data
\ No newline at end of file
+        return issues_data
\ No newline at end of file
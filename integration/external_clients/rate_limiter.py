@@ -0,0 +1,189 @@
+"""
+Per-endpoint adaptive rate limiters for calls to external services (Jira).
+
+Every client of one endpoint, in every task and thread of the process, takes
+its calls through the same limiter, so concurrent bulk tasks share the
+server's capacity instead of each bringing their own max_workers.
+"""
+import email.utils
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from integration.external_clients.circuit_breaker import CircuitBreakerRegistry
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date); None if absent/invalid."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket plus concurrency limit for one external endpoint, both adapted with AIMD.
+
+    - acquire() blocks until the endpoint is not paused, a request slot is free
+      and a token is available
+    - release() reports the call's latency and whether it was throttled (HTTP 429):
+      - healthy call (latency <= latency_target): rate and concurrency grow additively,
+        about increase_step per second at full throughput
+      - throttled call: rate and concurrency are multiplied by decrease_factor and the
+        endpoint is paused for Retry-After (or default_retry_after) seconds
+      - slow call: concurrency is multiplied by slow_decrease_factor
+      - other failures leave the limits unchanged
+      Decreases happen at most once per decrease_cooldown, so a burst of 429s
+      from one overload only backs off once.
+    """
+    def __init__(self, endpoint: str, rate: float = 10, min_rate: float = 0.5, max_rate: float = 50,
+                 concurrency: float = 4, min_concurrency: float = 1, max_concurrency: float = 16,
+                 latency_target: float = 2.0, increase_step: float = 1.0, decrease_factor: float = 0.5,
+                 slow_decrease_factor: float = 0.9, decrease_cooldown: float = 1.0,
+                 default_retry_after: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.endpoint = endpoint
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.min_concurrency = max(1.0, min_concurrency)
+        self.max_concurrency = max(max_concurrency, self.min_concurrency)
+        self.latency_target = latency_target
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.slow_decrease_factor = slow_decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.default_retry_after = default_retry_after
+        self.clock = clock
+
+        self._rate = min(max(rate, self.min_rate), self.max_rate)
+        self._concurrency = min(max(concurrency, self.min_concurrency), self.max_concurrency)
+        self._tokens = 1.0
+        self._refilled_at = clock()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+        # Metrics
+        self._calls = 0
+        self._throttled = 0
+        self._slow = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._latency_ewma = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed; the bucket holds at most one second of the current rate (lock held)."""
+        capacity = max(1.0, self._rate)
+        self._tokens = min(capacity, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
+    def acquire(self) -> None:
+        """Block until the caller may start one call."""
+        started = self.clock()
+        waited = False
+        with self._cond:
+            while True:
+                now = self.clock()
+                self._refill(now)
+                if now < self._paused_until:
+                    timeout = self._paused_until - now
+                elif self._in_flight >= int(self._concurrency):
+                    timeout = None  # woken by release()
+                elif self._tokens < 1:
+                    timeout = (1 - self._tokens) / self._rate
+                else:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    if waited:
+                        self._waits += 1
+                        self._wait_time += now - started
+                    return
+                waited = True
+                self._cond.wait(timeout)
+
+    def release(self, latency: float, throttled: bool = False, retry_after: Optional[float] = None,
+                failed: bool = False) -> None:
+        """
+        Report the outcome of a call started with acquire() and adapt the limits.
+        Failed calls that were not throttled free their slot without changing the limits.
+        """
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._calls += 1
+            self._latency_ewma = latency if self._calls == 1 else 0.8 * self._latency_ewma + 0.2 * latency
+            now = self.clock()
+            can_decrease = now - self._last_decrease >= self.decrease_cooldown
+            if throttled:
+                self._throttled += 1
+                pause = retry_after if retry_after is not None else self.default_retry_after
+                self._paused_until = max(self._paused_until, now + pause)
+                if can_decrease:
+                    self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+                    self._concurrency = max(self.min_concurrency, self._concurrency * self.decrease_factor)
+                    self._tokens = min(self._tokens, 1.0)
+                    self._last_decrease = now
+                    logging.warning(f"Rate limiter [{self.endpoint}] throttled, pausing {pause:.1f}s; "
+                                    f"rate {self._rate:.2f}/s, concurrency {int(self._concurrency)}")
+            elif latency > self.latency_target:
+                self._slow += 1
+                if can_decrease:
+                    self._concurrency = max(self.min_concurrency, self._concurrency * self.slow_decrease_factor)
+                    self._last_decrease = now
+            elif not failed:
+                self._rate = min(self.max_rate, self._rate + self.increase_step / self._rate)
+                self._concurrency = min(self.max_concurrency,
+                                        self._concurrency + self.increase_step / self._concurrency)
+            self._cond.notify_all()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "rate": round(self._rate, 3),
+                "concurrency_limit": int(self._concurrency),
+                "in_flight": self._in_flight,
+                "paused_for": max(0.0, self._paused_until - self.clock()),
+                "calls": self._calls,
+                "throttled": self._throttled,
+                "throttle_ratio": self._throttled / self._calls if self._calls else 0.0,
+                "slow": self._slow,
+                "waits": self._waits,
+                "wait_time": round(self._wait_time, 3),
+                "latency_ewma": round(self._latency_ewma, 3)
+            }
+
+class RateLimiterRegistry:
+    """
+    Process-wide registry of adaptive rate limiters keyed by endpoint URL
+    (normalised like circuit breakers). Limiter parameters are shared
+    defaults; overrides maps an endpoint to its own parameters.
+    """
+    def __init__(self, overrides: Optional[Dict[str, Dict[str, Any]]] = None, **limiter_kwargs):
+        self.overrides = {CircuitBreakerRegistry.normalize(k): v for k, v in (overrides or {}).items()}
+        self.limiter_kwargs = limiter_kwargs
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> AdaptiveRateLimiter:
+        key = CircuitBreakerRegistry.normalize(endpoint)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                kwargs = dict(self.limiter_kwargs, **self.overrides.get(key, {}))
+                limiter = AdaptiveRateLimiter(key, **kwargs)
+                self._limiters[key] = limiter
+            return limiter
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            limiters = list(self._limiters.items())
+        return {key: limiter.get_metrics() for key, limiter in limiters}
@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import Mock
+from application.use_cases.handlers import bulk_jira_task
+from domain.entities.models import TaskStatus
+from domain.exceptions import IntegrationException
+from domain.services.jira_data_processor import JiraDataProcessor
+from infrastructure.persistence.bulk_checkpoint_store import BulkCheckpointStore, item_keys
+
+@pytest.fixture
+def store(tmp_path):
+    store = BulkCheckpointStore(db_path=str(tmp_path / "bulk.db"))
+    yield store
+    store.close()
+
+def tickets(n):
+    return [{"fields": {"summary": f"ticket {i}"}} for i in range(n)]
+
+def test_item_keys_are_stable_and_distinct():
+    items = [{"fields": {"summary": "same"}}, {"fields": {"summary": "same"}}, {"idempotency_key": "ext-1"}]
+    keys = item_keys(items, "create")
+    assert keys == item_keys(items, "create")
+    assert len(set(keys)) == 3
+    assert keys[2] == "ext-1"
+    assert item_keys(items, "update")[0] != keys[0]
+
+def test_retry_resumes_only_unfinished_items(store):
+    created, attempts = [], []
+    def create_issue(payload, _):
+        summary = payload["fields"]["summary"]
+        attempts.append(summary)
+        if summary == "ticket 2" and attempts.count(summary) == 1:
+            raise RuntimeError("boom")
+        created.append(summary)
+        assert any(label.startswith("bulk-") for label in payload["fields"]["labels"])
+        return {"key": f"P-{summary[-1]}"}
+
+    jira_service = Mock(create_issue=Mock(side_effect=create_issue))
+    processor = JiraDataProcessor(jira_service, idempotency_labels=True)
+    checkpoint = store.for_task("task-1")
+
+    first = processor.process_bulk_jira_operations(tickets(5), "create", 2, checkpoint=checkpoint)
+    assert (first["success_count"], first["failed_count"]) == (4, 1)
+
+    second = processor.process_bulk_jira_operations(tickets(5), "create", 2, checkpoint=checkpoint)
+    assert (second["success_count"], second["failed_count"], second["resumed_count"]) == (5, 0, 4)
+    assert sorted(created) == [f"ticket {i}" for i in range(5)]
+    assert store.get_progress("task-1") == {"done": 5}
+
+def test_in_doubt_item_is_found_by_label_instead_of_recreated(store):
+    data = tickets(1)
+    checkpoint = store.for_task("task-2")
+    checkpoint.started(item_keys(data, "create")[0])
+    jira_service = Mock()
+    jira_service.search_issues.return_value = [{"key": "P-7"}]
+    processor = JiraDataProcessor(jira_service, idempotency_labels=True)
+
+    result = processor.process_bulk_jira_operations(data, "create", 1, checkpoint=checkpoint)
+
+    jira_service.create_issue.assert_not_called()
+    assert result["success"][0]["key"] == "P-7"
+    assert result["resumed_count"] == 1
+
+def test_labels_are_opt_in_and_in_doubt_item_is_found_by_summary(store):
+    data = [{"fields": {"project": {"key": "P"}, "summary": 'Fix "login"'}}]
+    checkpoint = store.for_task("task-3")
+    checkpoint.started(item_keys(data, "create")[0])
+    jira_service = Mock()
+    jira_service.search_issues.return_value = [{"key": "P-8", "fields": {"summary": 'Fix "login"'}},
+                                               {"key": "P-9", "fields": {"summary": "Fix login page"}}]
+    processor = JiraDataProcessor(jira_service)
+
+    result = processor.process_bulk_jira_operations(data, "create", 1, checkpoint=checkpoint)
+    assert result["success"][0]["key"] == "P-8"
+    jql = jira_service.search_issues.call_args[0][0]
+    assert jql.startswith('project = "P" AND summary ~ "\\"Fix  login \\"" AND created >= ')
+
+    jira_service.create_issue.return_value = {"key": "P-10"}
+    processor.process_bulk_jira_operations(tickets(1), "create", 1, checkpoint=store.for_task("task-5"))
+    assert "labels" not in jira_service.create_issue.call_args[0][0]["fields"]
+
+def test_linked_resume_skips_finished_root(store):
+    jira_service = Mock()
+    jira_service.create_issue.side_effect = [{"key": "ROOT-1"}, RuntimeError("down"), {"key": "C-1"}]
+    processor = JiraDataProcessor(jira_service)
+    checkpoint = store.for_task("task-3")
+    hierarchy = lambda: {"root": {"fields": {"summary": "root"}}, "children": tickets(1)}
+
+    first = processor.process_linked_jira_operations(hierarchy(), "create", 1, checkpoint=checkpoint)
+    assert first["failed_count"] == 1
+
+    second = processor.process_linked_jira_operations(hierarchy(), "create", 1, checkpoint=checkpoint)
+    assert second["root"]["key"] == "ROOT-1"
+    assert second["children"][0]["key"] == "C-1"
+    assert jira_service.create_issue.call_count == 3
+
+def run_bulk_handler(store, retries_left):
+    processor = Mock()
+    processor.process_bulk_jira_operations.return_value = {"success": [{"key": "P-1"}], "failed": [{"error": "boom"}],
+                                                           "success_count": 1, "failed_count": 1}
+    di_container = Mock()
+    di_container.get_jira_data_processor.return_value = processor
+    di_container.get_bulk_checkpoint_store.return_value = store
+    executor = Mock(di_container=di_container)
+    task = Mock(id="task-4", tags=["BULK_JIRA_TASK"], parameters={"tickets_data": tickets(2)})
+    task.should_retry.return_value = retries_left
+    store.for_task("task-4").done("item-1", "P-1")
+    return bulk_jira_task.handle(executor, task), executor
+
+def test_partial_failure_is_retried_with_checkpoint_kept(store):
+    with pytest.raises(IntegrationException):
+        run_bulk_handler(store, retries_left=True)
+    assert store.get_progress("task-4") == {"done": 1}
+
+def test_partial_failure_without_retry_clears_checkpoint(store):
+    result, executor = run_bulk_handler(store, retries_left=False)
+    assert result["failed_count"] == 1
+    executor.finish_task.assert_called_once_with("task-4", TaskStatus.FAILED)
+    assert store.get_progress("task-4") == {}
@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import Mock, patch
+from domain.services.jira_data_processor import JiraDataProcessor
+from infrastructure.persistence.bulk_checkpoint_store import BulkCheckpointStore
+from integration.external_clients.jira_service import JiraService
+
+def tickets(n):
+    return [{"fields": {"summary": f"ticket {i}"}} for i in range(n)]
+
+def fake_bulk(fail_summaries=(), fail_requests=()):
+    """create_issues_bulk stub: element errors for fail_summaries, exception for chunks containing fail_requests."""
+    calls = []
+    def create_issues_bulk(payloads):
+        summaries = [p["fields"]["summary"] for p in payloads]
+        calls.append(summaries)
+        if any(s in fail_requests for s in summaries):
+            raise RuntimeError("502 Bad Gateway")
+        return [{"error": "summary: invalid"} if s in fail_summaries else {"key": f"P-{s.split()[-1]}"}
+                for s in summaries]
+    return Mock(side_effect=create_issues_bulk), calls
+
+def test_jira_service_maps_bulk_element_errors():
+    with patch("integration.external_clients.jira_service.Jira") as jira_cls:
+        jira = jira_cls.return_value
+        jira._session.hooks = {}
+        jira.create_issues.return_value = {
+            "issues": [{"id": "1", "key": "P-1"}, {"id": "3", "key": "P-3"}],
+            "errors": [{"status": 400, "failedElementNumber": 1,
+                        "elementErrors": {"errorMessages": [], "errors": {"summary": "required"}}}],
+        }
+        service = JiraService("https://jira", "u", "p")
+        results = service.create_issues_bulk([{"fields": {"summary": "a"}}, {"fields": {}}, {"fields": {"summary": "c"}}])
+
+    assert results == [{"id": "1", "key": "P-1"}, {"error": "summary: required"}, {"id": "3", "key": "P-3"}]
+    jira.create_issues.assert_called_once_with(
+        [{"fields": {"summary": "a"}}, {"fields": {}}, {"fields": {"summary": "c"}}])
+    with pytest.raises(ValueError):
+        service.create_issues_bulk([{"fields": {}}] * 51)
+
+def test_bulk_create_chunks_and_maps_partial_failures(tmp_path):
+    bulk, calls = fake_bulk(fail_summaries={"ticket 1"}, fail_requests={"ticket 4"})
+    jira_service = Mock(create_issues_bulk=bulk)
+    processor = JiraDataProcessor(jira_service, bulk_create_chunk_size=2)
+    store = BulkCheckpointStore(db_path=str(tmp_path / "bulk.db"))
+    checkpoint = store.for_task("task-1")
+
+    result = processor.process_bulk_jira_operations(tickets(5), "create", 3, checkpoint=checkpoint)
+    assert sorted(len(c) for c in calls) == [1, 2, 2]
+    jira_service.create_issue.assert_not_called()
+    assert sorted(s["key"] for s in result["success"]) == ["P-0", "P-2", "P-3"]
+    assert sorted((f["data"]["fields"]["summary"], f["error"]) for f in result["failed"]) == [
+        ("ticket 1", "summary: invalid"), ("ticket 4", "502 Bad Gateway")]
+    assert (result["success_count"], result["failed_count"]) == (3, 2)
+
+    # Retry only re-sends the failed tickets, still through the bulk endpoint
+    calls.clear()
+    bulk.side_effect = fake_bulk()[0].side_effect
+    retry = processor.process_bulk_jira_operations(tickets(5), "create", 3, checkpoint=checkpoint)
+    assert (retry["success_count"], retry["resumed_count"], retry["failed_count"]) == (5, 3, 0)
+    assert bulk.call_count == 4
+    store.close()
+
+def test_linked_children_use_bulk_create():
+    bulk, calls = fake_bulk()
+    jira_service = Mock(create_issues_bulk=bulk, create_issue=Mock(return_value={"key": "ROOT-1"}))
+    processor = JiraDataProcessor(jira_service, bulk_create_chunk_size=50)
+
+    result = processor.process_linked_jira_operations({"root": tickets(1)[0], "children": tickets(3)}, "create")
+    assert result["success_count"] == 4
+    assert len(calls) == 1
+    payloads = bulk.call_args.args[0]
+    assert all(p["fields"]["parent"] == {"key": "ROOT-1"} for p in payloads)
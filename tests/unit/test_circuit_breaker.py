@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import Mock
+from requests.exceptions import HTTPError
+from integration.external_clients.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from domain.exceptions import CircuitOpenError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def fail():
+    raise ConnectionError("down")
+
+def http_error(status):
+    def raise_error():
+        raise HTTPError(f"HTTP {status}", response=Mock(status_code=status))
+    return raise_error
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def registry(clock):
+    return CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=10, clock=clock)
+
+def test_breaker_opens_after_threshold_and_rejects(registry):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            registry.call("https://jira.example.com/", fail)
+    assert registry.is_open("jira.example.com")
+    with pytest.raises(CircuitOpenError):
+        registry.call("https://jira.example.com", lambda: "ok")
+    metrics = registry.get_metrics()["jira.example.com"]
+    assert metrics["state"] == CircuitBreaker.OPEN
+    assert metrics["rejected"] == 1
+
+def test_half_open_success_closes_breaker(registry, clock):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            registry.call("env1.jira.com", fail)
+    assert registry.remaining_open_time(["env1.jira.com", "env2.jira.com"]) == 10
+    clock.now += 10
+    assert registry.get("env1.jira.com").state == CircuitBreaker.HALF_OPEN
+    assert registry.call("env1.jira.com", lambda: "ok") == "ok"
+    assert registry.get("env1.jira.com").state == CircuitBreaker.CLOSED
+
+def test_half_open_failure_reopens_breaker(registry, clock):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            registry.call("env1.jira.com", fail)
+    clock.now += 10
+    with pytest.raises(ConnectionError):
+        registry.call("env1.jira.com", fail)
+    assert registry.is_open("env1.jira.com")
+    assert registry.get_metrics()["env1.jira.com"]["open_count"] == 2
+
+def test_client_errors_do_not_open_breaker(registry):
+    for status in (400, 403, 404, 400):
+        with pytest.raises(HTTPError):
+            registry.call("jira.example.com", http_error(status))
+    with pytest.raises(KeyError):
+        registry.call("jira.example.com", lambda: {}["missing"])
+    assert not registry.is_open("jira.example.com")
+
+    for status in (503, 429):
+        with pytest.raises(HTTPError):
+            registry.call("jira.example.com", http_error(status))
+    assert registry.is_open("jira.example.com")
+
+def test_rejection_during_half_open_probe_reports_probe_timeout(clock):
+    registry = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=10, probe_timeout=3, clock=clock)
+    with pytest.raises(ConnectionError):
+        registry.call("env1.jira.com", fail)
+    clock.now += 10
+    breaker = registry.get("env1.jira.com")
+    assert breaker.allow_request()  # the probe is in flight
+
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.call(lambda: "ok")
+    assert rejected.value.retry_after == 3
+    assert registry.remaining_open_time(["env1.jira.com"]) == 3
+
+    breaker.record_success()
+    assert registry.remaining_open_time(["env1.jira.com"]) == 0
@@ -0,0 +1,75 @@
+import pytest
+from datetime import datetime, timezone
+from apscheduler.triggers.cron import CronTrigger
+from application.schedulers.cron import CronExpression, CronIndex, compile_cron
+from application.schedulers.spreading import SpreadPolicy, OffsetTrigger
+
+def test_compiled_expressions_are_shared():
+    assert compile_cron("*/5 * * * *") is compile_cron("*/5 * * * *")
+
+@pytest.mark.parametrize("expr, after, expected", [
+    ("* * * * *", datetime(2025, 1, 1, 10, 0, 30), datetime(2025, 1, 1, 10, 1)),
+    ("*/15 * * * *", datetime(2025, 1, 1, 10, 16), datetime(2025, 1, 1, 10, 30)),
+    ("0 0 * * *", datetime(2025, 1, 1, 10, 0), datetime(2025, 1, 2, 0, 0)),
+    ("30 9 * * mon-fri", datetime(2025, 1, 3, 10, 0), datetime(2025, 1, 6, 9, 30)),  # Fri -> Mon
+    ("0 12 1 * 0", datetime(2025, 1, 1, 13, 0), datetime(2025, 1, 5, 12, 0)),  # dom OR dow (Sunday)
+    ("0 0 29 2 *", datetime(2025, 3, 1), datetime(2028, 2, 29, 0, 0)),
+    ("@hourly", datetime(2025, 12, 31, 23, 59), datetime(2026, 1, 1, 0, 0)),
+])
+def test_next_after(expr, after, expected):
+    assert CronExpression(expr).next_after(after) == expected
+
+@pytest.mark.parametrize("expr", ["* * * *", "61 * * * *", "*/0 * * * *", "0 0 30 2 *"])
+def test_invalid_expressions(expr):
+    with pytest.raises(ValueError):
+        CronExpression(expr).next_after(datetime(2025, 1, 1))
+
+def test_index_fires_due_entries_and_rearms():
+    now = [datetime(2025, 1, 1, 10, 0, 30).timestamp()]
+    fired = []
+    index = CronIndex(on_fire=lambda key, payload, ts: fired.append((key, payload)), clock=lambda: now[0])
+    index.add("a", "* * * * *", "HIGH")
+    index.add("b", "*/5 * * * *", "LOW")
+    index.add("c", "* * * * *")
+    index.remove("c")
+
+    assert index.fire_due() == 0
+    now[0] = datetime(2025, 1, 1, 10, 1).timestamp()
+    assert index.fire_due() == 1
+    assert fired == [("a", "HIGH")]
+    assert index.next_fire_time("a") == datetime(2025, 1, 1, 10, 2).timestamp()
+
+    # A long pause coalesces missed periods into one fire per schedule
+    now[0] = datetime(2025, 1, 1, 10, 20, 10).timestamp()
+    assert index.fire_due() == 2
+    assert index.next_fire_time("a") == datetime(2025, 1, 1, 10, 21).timestamp()
+    assert index.next_fire_time("b") == datetime(2025, 1, 1, 10, 25).timestamp()
+
+def test_spread_offsets_are_deterministic_and_respect_tolerance():
+    policy = SpreadPolicy(enabled=True, window_seconds=300)
+    offsets = [policy.offset_for(f"task-{i}") for i in range(1000)]
+    assert offsets == [policy.offset_for(f"task-{i}") for i in range(1000)]
+    assert all(0 <= o <= 300 for o in offsets)
+    assert len(set(offsets)) > 200
+    assert all(policy.offset_for(f"task-{i}", tolerance=10) <= 10 for i in range(100))
+    assert SpreadPolicy(enabled=False).offset_for("task-1") == 0
+
+def test_index_applies_offset_and_reports_flattened_profile():
+    now = [datetime(2025, 1, 1, 23, 0).timestamp()]
+    index = CronIndex(on_fire=lambda *_: None, clock=lambda: now[0])
+    for i in range(60):
+        index.add(i, "0 0 * * *", offset=i % 30)
+    assert index.next_fire_time(7) == datetime(2025, 1, 2, 0, 0, 7).timestamp()
+
+    profile = index.get_load_profile()
+    assert profile["peak_per_second_before"] == 60
+    assert profile["peak_per_second_after"] == 2
+
+    now[0] = datetime(2025, 1, 2, 0, 0, 10).timestamp()
+    assert index.fire_due() == 22  # offsets 0..10, twice each
+    assert index.next_fire_time(7) == datetime(2025, 1, 3, 0, 0, 7).timestamp()
+
+def test_offset_trigger_shifts_wrapped_trigger():
+    trigger = OffsetTrigger(CronTrigger.from_crontab("* * * * *", timezone="UTC"), 17)
+    now = datetime(2025, 1, 1, 10, 0, 20, tzinfo=timezone.utc)
+    assert trigger.get_next_fire_time(None, now) == datetime(2025, 1, 1, 10, 1, 17, tzinfo=timezone.utc)
@@ -0,0 +1,68 @@
+import csv
+import pytest
+from unittest.mock import Mock
+from domain.services.jira_data_processor import JiraDataProcessor
+from infrastructure.persistence.export_sync_store import ExportSyncStore
+from integration.external_clients.jira_service import format_jql_datetime, parse_jira_datetime
+
+@pytest.fixture
+def store(tmp_path):
+    store = ExportSyncStore(db_path=str(tmp_path / "sync.db"))
+    yield store
+    store.close()
+
+def issue(key, summary, updated):
+    return {"key": key, "fields": {"summary": summary, "status": {"name": "Open"},
+                                   "issuetype": {"name": "Task"}, "updated": updated}}
+
+def report_rows(result):
+    with open(result["report_files"][0], newline="", encoding="utf-8") as f:
+        return {row["Key"]: row["Summary"] for row in csv.DictReader(f)}
+
+def test_jira_datetime_round_trip():
+    epoch = parse_jira_datetime("2024-05-01T10:15:30.000+0200")
+    assert epoch == parse_jira_datetime("2024-05-01T08:15:30.000+0000")
+    assert format_jql_datetime(epoch) == "2024-05-01 08:15"
+    assert parse_jira_datetime(None) is None and parse_jira_datetime("yesterday") is None
+
+def test_store_merges_in_first_seen_order_and_full_sync_replaces(store):
+    store.merge("e1", "project", "P", [issue("P-1", "a", None), issue("P-2", "b", None)], watermark=100, full=True)
+    store.merge("e1", "project", "P", [issue("P-2", "b2", None), issue("P-3", "c", None)], watermark=50)
+    batches = list(store.iter_issues("e1", "project", "P", batch_size=2))
+    assert [[i["key"] for i in b] for b in batches] == [["P-1", "P-2"], ["P-3"]]
+    assert batches[0][1]["fields"]["summary"] == "b2"
+    assert store.get_scope("e1", "project", "P")["watermark"] == 100  # never moves backwards
+
+    store.merge("e1", "project", "P", [issue("P-3", "c", None)], full=True)
+    assert [i["key"] for b in store.iter_issues("e1", "project", "P") for i in b] == ["P-3"]
+
+def test_scheduled_export_fetches_only_updated_issues_and_renders_merged_set(store, tmp_path):
+    service = Mock()
+    service.get_issues_by_project.side_effect = [
+        {"issues": [issue("P-1", "first", "2024-05-01T10:00:00.000+0000"),
+                    issue("P-2", "second", "2024-05-01T11:30:00.000+0000")]},
+        {"issues": [issue("P-2", "second edited", "2024-05-02T09:00:00.000+0000")]},
+    ]
+    processor = JiraDataProcessor(service, report_dir=str(tmp_path), sync_store=store, sync_overlap_seconds=120)
+
+    first = processor.export_issues(["e1"], "project", "P", True, "csv")
+    assert first["incremental"] and first["full_sync_envs"] == ["e1"]
+    assert "updated_since" not in service.get_issues_by_project.call_args.kwargs
+    assert "updated" in service.get_issues_by_project.call_args.kwargs["fields"]
+
+    second = processor.export_issues(["e1"], "project", "P", True, "csv")
+    assert second["full_sync_envs"] == []
+    assert service.get_issues_by_project.call_args.kwargs["updated_since"] == "2024-05-01 11:28"
+    assert second["issue_count"] == 2
+    assert report_rows(second) == {"P-1": "first", "P-2": "second edited"}
+
+def test_full_resync_after_interval_and_manual_exports_are_full(store, tmp_path):
+    service = Mock()
+    service.get_issues_by_project.return_value = {"issues": [issue("P-1", "a", "2024-05-01T10:00:00.000+0000")]}
+    processor = JiraDataProcessor(service, report_dir=str(tmp_path), sync_store=store, full_resync_interval=0)
+
+    processor.export_issues(["e1"], "project", "P", True, "csv")
+    assert processor.export_issues(["e1"], "project", "P", True, "csv")["full_sync_envs"] == ["e1"]
+
+    manual = processor.export_issues(["e1"], "project", "P", False, "csv")
+    assert "incremental" not in manual
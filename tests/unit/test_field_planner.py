@@ -0,0 +1,31 @@
+from unittest.mock import Mock
+from domain.services.field_planner import FieldPlanner, QueryPlan, fields_from_paths, NO_FIELDS
+from domain.services.jira_data_processor import JiraDataProcessor
+
+def test_fields_from_paths():
+    assert fields_from_paths(["key", "fields.summary", "fields.status.name", "fields.customfield_1.value",
+                              "jira_environment", "fields.summary", "renderedFields"]) == (
+        "summary", "status", "customfield_1", "renderedFields")
+
+def test_plan_params_and_extras():
+    planner = FieldPlanner()
+    planner.declare("op", fields=["summary", "status"], expand=["changelog"])
+    planner.declare("keys_only")
+
+    assert planner.plan("op") == QueryPlan(("summary", "status"), ("changelog",))
+    plan = planner.plan("op", extra_fields=["status", "labels"])
+    assert (plan.fields_param, plan.expand_param) == ("summary,status,labels", "changelog")
+    assert planner.plan("keys_only").fields_param == NO_FIELDS
+    assert planner.plan("keys_only").expand_param is None
+
+def test_processor_queries_use_declared_fields():
+    service = Mock()
+    service.search_issues_iter.return_value = iter([])
+    service.get_issues_by_project.return_value = {"issues": []}
+    processor = JiraDataProcessor(service, report_columns={"Key": "key", "Severity": "fields.customfield_1.value"})
+
+    processor.check_and_process_tickets("project = P")
+    service.search_issues_iter.assert_called_once_with("project = P", fields="description", expand=None)
+
+    processor.fetch_issues_from_envs(["env1"], "project", "P")
+    assert service.get_issues_by_project.call_args.kwargs["fields"] == ["customfield_1", "parent"]
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import types
+import pytest
+from unittest.mock import Mock
+from application.use_cases.executor import TaskExecutor
+from application.use_cases.handler_registry import HandlerRegistry, HandlerSpec, ResourceClass, default_handler_registry
+from domain.entities.models import TaskStatus
+
+@pytest.fixture
+def fake_handler_module(monkeypatch):
+    module = types.ModuleType("fake_handlers")
+    module.calls = []
+    def handle(executor, task):
+        module.calls.append(task.id)
+        return {"success": True, "handled_by": "fake"}
+    module.handle = handle
+    monkeypatch.setitem(sys.modules, "fake_handlers", module)
+    return module
+
+def test_handler_is_resolved_lazily_and_cached(fake_handler_module):
+    registry = HandlerRegistry([HandlerSpec(tag="FAKE", target="fake_handlers:handle",
+                                            resource_class=ResourceClass.CPU, idempotent=True)])
+    assert registry.loaded_tags() == []
+    assert registry.spec_for(["OTHER", "FAKE"]).resource_class == ResourceClass.CPU
+
+    handler = registry.resolve("FAKE")
+    assert handler is fake_handler_module.handle
+    assert registry.resolve("FAKE") is handler
+    assert registry.loaded_tags() == ["FAKE"]
+
+    with pytest.raises(KeyError):
+        registry.resolve("MISSING")
+
+def test_executor_dispatches_by_tag(fake_handler_module):
+    task = Mock(id="t1", tags=["FAKE"], parameters={})
+    task_repo = Mock()
+    task_repo.get_by_id.return_value = task
+    registry = HandlerRegistry([HandlerSpec(tag="FAKE", target="fake_handlers:handle")])
+    executor = TaskExecutor(task_repo, Mock(), Mock(), handler_registry=registry)
+
+    result = executor.execute_task("t1")
+
+    assert result == {"success": True, "handled_by": "fake"}
+    assert fake_handler_module.calls == ["t1"]
+    task_repo.update_task_status.assert_called_once_with("t1", TaskStatus.RUNNING)
+
+def test_default_handlers_are_registered():
+    registry = default_handler_registry()
+    assert "JIRA_TASK_EXP" in registry
+    assert "BULK_JIRA_TASK" in registry
+    assert registry.get_spec("BULK_JIRA_TASK").batchable
+
+def test_pandas_not_loaded_until_report_export():
+    code = "import sys, app; print('pandas' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "False"
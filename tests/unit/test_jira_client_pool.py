@@ -0,0 +1,59 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+from integration.external_clients.jira_client_pool import JiraClientPool
+from integration.external_clients.jira_service import JiraService
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"total": 0, "issues": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_one_client_per_configured_env_and_default_fallback():
+    factory = Mock(side_effect=lambda **kwargs: Mock(**kwargs))
+    pool = JiraClientPool({"url": "https://default", "username": "u", "password": "p"},
+                          {"env1": {"url": "https://env1"}, "env2": {"url": "https://env2", "username": "u2"}},
+                          client_factory=factory, pool_maxsize=16)
+
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(pool.get("env1"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(c) for c in clients}) == 1
+    assert pool.get("env2") is not clients[0]
+    assert pool.get("unknown.jira.com") is pool.get()
+    assert factory.call_count == 3
+    factory.assert_any_call(url="https://env2", username="u2", password="p", pool_maxsize=16)
+
+def test_connections_reused_across_threads():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        service = JiraService(f"http://127.0.0.1:{server.server_address[1]}", "u", "p", pool_maxsize=4)
+        def search():
+            for _ in range(10):
+                service.search_issues("project = P", limit=1)
+        threads = [threading.Thread(target=search) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = service.get_connection_stats()
+    finally:
+        server.shutdown()
+
+    assert stats["requests"] == 40
+    assert stats["new_connections"] <= 4
+    assert stats["reused_connections"] == 40 - stats["new_connections"]
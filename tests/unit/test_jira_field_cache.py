@@ -0,0 +1,80 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+from integration.external_clients.jira_field_cache import JiraFieldCache
+from integration.external_clients.jira_service import JiraService
+
+FIELDS = [
+    {"id": "summary", "name": "Summary"},
+    {"id": "customfield_10010", "name": "Severity"},
+    {"id": "customfield_10011", "name": "Severity"},  # duplicate name: first one wins
+]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_resolve_many_loads_once_and_honours_ttl():
+    clock = FakeClock()
+    cache = JiraFieldCache(ttl_seconds=100, min_refresh_interval=10, clock=clock)
+    loader = Mock(return_value=FIELDS)
+
+    assert cache.resolve("env1", ["Summary", "Severity", "customfield_10011"], loader) == {
+        "Summary": "summary", "Severity": "customfield_10010", "customfield_10011": "customfield_10011"}
+    for _ in range(100):
+        cache.get_field_id("env1", "Severity", loader)
+    assert loader.call_count == 1
+
+    cache.resolve("env2", ["Summary"], loader)  # separate catalogue per environment
+    assert loader.call_count == 2
+
+    clock.now = 101
+    cache.get_field_id("env1", "Summary", loader)
+    assert loader.call_count == 3
+
+    cache.invalidate("env1")
+    cache.get_field_id("env1", "Summary", loader)
+    assert loader.call_count == 4
+
+def test_unknown_field_refresh_is_rate_limited():
+    clock = FakeClock()
+    cache = JiraFieldCache(ttl_seconds=1000, min_refresh_interval=60, clock=clock)
+    loader = Mock(return_value=FIELDS)
+    cache.warm("env1", loader)
+
+    assert cache.get_field_id("env1", "Nope", loader) is None
+    assert cache.get_field_id("env1", "Nope", loader) is None
+    assert loader.call_count == 1
+
+    clock.now = 61
+    loader.return_value = FIELDS + [{"id": "customfield_20000", "name": "Nope"}]
+    assert cache.get_field_id("env1", "Nope", loader) == "customfield_20000"
+    assert loader.call_count == 2
+
+def test_concurrent_lookups_share_one_load():
+    cache = JiraFieldCache()
+    def slow_loader():
+        time.sleep(0.1)
+        return FIELDS
+    loader = Mock(side_effect=slow_loader)
+    threads = [threading.Thread(target=cache.get_field_id, args=("env1", "Summary", loader)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loader.call_count == 1
+
+def test_update_issue_uses_cached_catalogue():
+    with patch("integration.external_clients.jira_service.Jira") as jira_cls:
+        jira = jira_cls.return_value
+        jira._session.hooks = {}
+        jira.get_all_fields.return_value = FIELDS
+        service = JiraService("https://jira", "u", "p")
+
+        for i in range(50):
+            assert service.update_issue(f"P-{i}", "Severity", "High")
+        assert jira.get_all_fields.call_count == 1
+        jira.issue_update.assert_called_with("P-49", fields={"customfield_10010": "High"})
+        assert not service.update_issue("P-1", "Unknown", 1)
@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import Mock
+from infrastructure.persistence.jira_issue_store import JiraIssueStore
+from integration.external_clients.jira_service import JiraService
+
+UPDATED = "2024-05-01T10:00:00.000+0000"
+
+@pytest.fixture
+def store(tmp_path):
+    store = JiraIssueStore(db_path=str(tmp_path / "issues.db"))
+    yield store
+    store.close()
+
+def issue(key, parent=None, **fields):
+    return {"key": key, "fields": dict(fields, parent={"key": parent} if parent else None)}
+
+def test_reads_need_covered_fields_and_freshness(store):
+    store.upsert_issues("e1", [issue("P-1", summary="s", status={"name": "Open"})], fields="summary,status,parent")
+    assert store.get_issue("e1", "P-1", ["summary"])["fields"]["summary"] == "s"
+    assert store.get_issue("e1", "P-1", ["description"]) is None
+    assert store.get_issue("e1", "P-1", "*all") is None
+    assert store.get_issue("e1", "P-1", ["summary"], max_age=-1) is None
+    assert store.get_issue("e2", "P-1", ["summary"]) is None
+    assert store.get_stats()["hits"] == 1
+
+def test_same_version_merges_fields(store):
+    store.upsert_issues("e1", [issue("P-1", summary="s", updated=UPDATED)], fields=["summary", "updated"])
+    store.upsert_issues("e1", [issue("P-1", description="d", updated=UPDATED)], fields=["description", "updated"])
+    merged = store.get_issue("e1", "P-1", ["summary", "description"])
+    assert merged["fields"]["summary"] == "s" and merged["fields"]["description"] == "d"
+
+    store.upsert_issues("e1", [issue("P-1", description="new", updated="2024-05-02T10:00:00.000+0000")],
+                        fields=["description", "updated"])
+    assert store.get_issue("e1", "P-1", ["summary", "description"]) is None
+
+def test_root_scope_served_only_after_complete_fetch_and_replaced_on_refetch(store):
+    tree = [issue("P-1"), issue("P-2", "P-1"), issue("P-4", "P-1")]
+    store.upsert_issues("e1", tree, fields="parent")
+    assert store.get_tree("e1", "P-1", ["parent"]) is None
+
+    store.replace_scope("e1", "root:P-1", tree, fields="parent")
+    assert [i["key"] for i in store.get_tree("e1", "P-1", ["parent"])] == ["P-1", "P-2", "P-4"]
+    assert [i["key"] for i in store.get_children("e1", "P-1")] == ["P-2", "P-4"]
+
+    store.replace_scope("e1", "root:P-1", tree[:2], fields="parent")
+    assert [i["key"] for i in store.get_tree("e1", "P-1", ["parent"])] == ["P-1", "P-2"]
+
+def test_root_refresh_keeps_grandchildren_and_dropped_rows_expire_other_scopes(store):
+    store.replace_scope("e1", "project:P", [issue("P-1"), issue("P-2", "P-1"), issue("P-3", "P-2"),
+                                            issue("P-4", "P-1")], fields="parent")
+    # The root-ticket fetch only covers P-1 and its direct children; P-3 is not its business
+    store.replace_scope("e1", "root:P-1", [issue("P-1"), issue("P-2", "P-1"), issue("P-4", "P-1")], fields="parent")
+    assert [i["key"] for i in store.get_project_issues("e1", "P", ["parent"])] == ["P-1", "P-2", "P-3", "P-4"]
+
+    # P-4 disappeared from the tree: the project scope no longer knows all of P
+    store.replace_scope("e1", "root:P-1", [issue("P-1"), issue("P-2", "P-1")], fields="parent")
+    assert store.get_project_issues("e1", "P", ["parent"]) is None
+    assert store.get_tree("e1", "P-1", ["parent"]) is not None
+
+    store.invalidate("e1", "P-2")
+    assert store.get_tree("e1", "P-1", ["parent"]) is None
+
+def test_jira_service_reads_through_the_store(store):
+    service = JiraService("https://env1.jira.com", "u", "p", issue_store=store)
+    service._call_endpoint = Mock(side_effect=service._call_endpoint)
+    fields = ["summary", "parent"]
+
+    first = service.get_issues_by_root_ticket("env1.jira.com", "PROJ-1", fields=fields)
+    second = service.get_issues_by_root_ticket("https://env1.jira.com/", "PROJ-1", fields=fields)
+    assert [i["key"] for i in second["issues"]] == [i["key"] for i in first["issues"]]
+    assert service._call_endpoint.call_count == 1
+
+    service.get_issues_by_root_ticket("env1.jira.com", "PROJ-1", fields=fields, updated_since="2024-05-01 10:00")
+    assert service._call_endpoint.call_count == 2
+
+def test_search_results_stored_and_delete_check_invalidates(store):
+    service = JiraService("https://env1.jira.com", "u", "p", issue_store=store)
+    service.jira = Mock()
+    service.jira.jql.return_value = {"total": 1, "issues": [issue("P-1", status={"name": "Done"})]}
+    service.search_issues("project = P", fields="status")
+    assert store.get_issue("env1.jira.com", "P-1", ["status"]) is not None
+
+    assert service.delete_issue("P-1", must_status_in=["Done"])
+    service.jira.issue.assert_not_called()  # pre-check served by the stored search result
+    assert store.get_issue("env1.jira.com", "P-1", ["status"]) is None
@@ -0,0 +1,83 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+from atlassian import Jira
+from domain.services.jira_data_processor import JiraDataProcessor
+from integration.external_clients.jira_permission_cache import ProjectPermissionCache
+from integration.external_clients.jira_service import JiraService
+
+ROLES = {"Developers": "https://jira/rest/api/2/project/P/role/1",
+         "Administrators": "https://jira/rest/api/2/project/P/role/2",
+         "Viewers": "https://jira/rest/api/2/project/P/role/3"}
+
+def role_actors(project_key, role_id):
+    time.sleep(0.05)
+    return {"1": [{"type": "atlassian-user-role-actor", "name": "alice"}],
+            "2": [{"type": "atlassian-user-role-actor", "actorUser": {"accountId": "acc-bob"}},
+                  {"type": "atlassian-group-role-actor", "name": "jira-users"}],
+            "3": []}[role_id]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def make_service(cache=None):
+    # spec=Jira: only methods the pinned atlassian-python-api really has
+    jira = Mock(spec=Jira)
+    jira._session = Mock(hooks={})
+    jira.get_project_roles.return_value = ROLES
+    jira.get_project_actors_for_role_project.side_effect = role_actors
+    with patch("integration.external_clients.jira_service.Jira", return_value=jira):
+        return JiraService("https://jira", "u", "p", permission_cache=cache), jira
+
+def test_roles_fetched_concurrently_and_members_reused_across_users():
+    service, jira = make_service()
+    start = time.monotonic()
+    assert service.check_project_permission("P", "alice")
+    assert time.monotonic() - start < 0.12  # three role lookups in parallel, not 0.15s+
+    assert service.check_project_permission("P", "acc-bob")
+    assert not service.check_project_permission("P", "mallory")
+    assert jira.get_project_roles.call_count == 1
+    assert jira.get_project_actors_for_role_project.call_count == 3
+
+def test_ttl_invalidation_and_failures_not_cached():
+    clock = FakeClock()
+    service, jira = make_service(ProjectPermissionCache(ttl_seconds=60, clock=clock))
+    service.check_project_permission("P", "alice")
+    clock.now = 61
+    service.check_project_permission("P", "alice")
+    assert jira.get_project_roles.call_count == 2
+
+    service.invalidate_permission_cache("P")
+    service.check_project_permission("P", "alice")
+    assert jira.get_project_roles.call_count == 3
+
+    jira.get_project_roles.side_effect = RuntimeError("down")
+    assert not service.check_project_permission("Q", "alice")
+    jira.get_project_roles.side_effect = None
+    assert service.check_project_permission("Q", "alice")
+
+def test_concurrent_checks_share_one_load():
+    service, jira = make_service()
+    threads = [threading.Thread(target=service.check_project_permission, args=("P", f"user{i}")) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert jira.get_project_roles.call_count == 1
+
+def test_export_permission_checked_through_cached_client_of_each_env():
+    service, jira = make_service()
+    other = Mock()
+    other.check_project_permission.return_value = True
+    pool = Mock()
+    pool.get.side_effect = lambda env: {"e1": service, "e2": other}.get(env, service)
+    processor = JiraDataProcessor(service, client_pool=pool)
+
+    assert processor.check_user_permission("root_ticket", "P-1", "alice", ["e1", "e2", "unlisted"])
+    assert processor.check_user_permission("project", "P", "alice", ["e1"])
+    assert jira.get_project_roles.call_count == 1  # cached across both exports
+    other.check_project_permission.assert_called_once_with("P", "alice")
+    assert not processor.check_user_permission("project", "P", "mallory", ["e1", "e2"])
@@ -0,0 +1,78 @@
+import threading
+import time
+from unittest.mock import patch
+from integration.external_clients.jira_service import JiraService
+
+def make_service(total, server_max=None, latency=0.0, page_workers=4):
+    state = {"active": 0, "max_active": 0, "calls": []}
+    lock = threading.Lock()
+
+    def jql(jql, start, limit, **kwargs):
+        with lock:
+            state["calls"].append((start, limit))
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+        time.sleep(latency)
+        with lock:
+            state["active"] -= 1
+        size = min(limit, server_max or limit)
+        return {"total": total, "issues": [{"key": f"P-{i}"} for i in range(start, min(start + size, total))]}
+
+    with patch("integration.external_clients.jira_service.Jira") as jira_cls:
+        jira_cls.return_value._session.hooks = {}
+        jira_cls.return_value.jql.side_effect = jql
+        service = JiraService("https://jira", "u", "p", page_workers=page_workers)
+    return service, state
+
+def test_pages_fetched_concurrently_in_order():
+    service, state = make_service(total=1000, latency=0.05)
+    start = time.monotonic()
+    issues = service.search_issues("project = P", limit=100, fetch_all=True)
+    elapsed = time.monotonic() - start
+
+    assert [i["key"] for i in issues] == [f"P-{i}" for i in range(1000)]
+    assert state["max_active"] == 4
+    assert elapsed < 0.05 * 10 / 2  # well below 10 sequential round trips
+
+def test_server_capped_page_size_and_single_page():
+    service, state = make_service(total=250, server_max=100)
+    issues = service.search_issues("project = P", limit=1000, fetch_all=True)
+    assert [i["key"] for i in issues] == [f"P-{i}" for i in range(250)]
+    assert sorted(state["calls"]) == [(0, 1000), (100, 100), (200, 100)]
+
+    service, state = make_service(total=30)
+    assert len(service.search_issues("project = P", fetch_all=True)) == 30
+    assert state["calls"] == [(0, 50)]
+
+def test_iter_stops_paging_early_with_one_page_prefetched():
+    service, state = make_service(total=1000, latency=0.02)
+    keys = []
+    for issue in service.search_issues_iter("project = P", page_size=100):
+        keys.append(issue["key"])
+        if len(keys) == 150:
+            break
+    time.sleep(0.1)  # let an in-flight prefetch finish
+    assert keys == [f"P-{i}" for i in range(150)]
+    # at most the current page + one prefetched page (the prefetch may be cancelled before it starts)
+    assert sorted(state["calls"])[:2] == [(0, 100), (100, 100)]
+    assert len(state["calls"]) <= 3
+
+    service, state = make_service(total=250, server_max=100)
+    assert len(list(service.search_issues_iter("project = P", page_size=100, prefetch=False))) == 250
+    assert [c[0] for c in state["calls"]] == [0, 100, 200]
+
+def test_check_and_process_tickets_stops_at_first_marker():
+    from domain.services.jira_data_processor import JiraDataProcessor
+
+    service, state = make_service(total=5000)
+    jql = service.jira.jql.side_effect
+    def with_marker(**kwargs):
+        result = jql(**kwargs)
+        for issue in result["issues"]:
+            issue["fields"] = {"description": "SPECIAL_MARKER" if issue["key"] == "P-10" else None}
+        return result
+    service.jira.jql.side_effect = with_marker
+
+    with patch("domain.services.jira_data_processor.time.sleep"):
+        assert JiraDataProcessor(service).check_and_process_tickets("project = P")
+    assert len(state["calls"]) <= 2
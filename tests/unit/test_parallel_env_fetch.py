@@ -0,0 +1,76 @@
+import threading
+import time
+from unittest.mock import Mock
+from application.use_cases.result_cache import ResultCache, MISS
+from domain.services.jira_data_processor import JiraDataProcessor
+
+def make_service(delays, failing=()):
+    service = Mock()
+    def get_issues(env, key, **kwargs):
+        if env in failing:
+            raise RuntimeError(f"{env} down")
+        time.sleep(delays[env])
+        return {"issues": [{"key": f"{env}-1", "fields": {
+            "summary": "s", "status": {"name": "Open"}, "issuetype": {"name": "Task"}}}]}
+    service.get_issues_by_project.side_effect = get_issues
+    return service
+
+def test_envs_fetched_in_parallel_in_env_order():
+    processor = JiraDataProcessor(make_service({"e1": 0.3, "e2": 0.3, "e3": 0.1}))
+    start = time.monotonic()
+    fetched = processor.fetch_issues_from_envs(["e1", "e2", "e3"], "project", "P")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.55  # close to the slowest env, not the sum
+    assert [i["key"] for i in fetched["issues"]] == ["e1-1", "e2-1", "e3-1"]
+    assert [i["jira_environment"] for i in fetched["issues"]] == ["e1", "e2", "e3"]
+    assert fetched["timed_out_envs"] == [] and fetched["failed_envs"] == {}
+
+def test_slow_and_failing_envs_marked_partial(tmp_path):
+    processor = JiraDataProcessor(make_service({"fast": 0, "slow": 1.0}, failing=("bad",)),
+                                  env_fetch_timeout=0.2, report_dir=str(tmp_path))
+
+    start = time.monotonic()
+    result = processor.export_issues(["fast", "slow", "bad"], "project", "P", False)
+    assert time.monotonic() - start < 0.6
+
+    assert result["success"] and result["partial"]
+    assert result["issue_count"] == 1
+    assert result["report_files"] == [result["excel_path"]] == [str(tmp_path / "P.xlsx")]
+    assert result["timed_out_envs"] == ["slow"]
+    assert result["failed_envs"] == {"bad": "bad down"}
+
+    # Partial exports are not memoized
+    cache = ResultCache()
+    cache.get_or_compute("k", lambda: result)
+    assert cache.get_or_compute("k", lambda: result)[1] == MISS
+
+def test_all_envs_failed_is_failure(tmp_path):
+    processor = JiraDataProcessor(make_service({}, failing=("e1",)), report_dir=str(tmp_path))
+    result = processor.export_issues(["e1"], "project", "P", False)
+    assert not result["success"]
+    assert list(tmp_path.iterdir()) == []
+    assert result["failed_envs"] == {"e1": "e1 down"}
+
+def test_per_env_concurrency_bounded():
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    def get_issues(env, key, **kwargs):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return {"issues": []}
+    service = Mock()
+    service.get_issues_by_project.side_effect = get_issues
+    processor = JiraDataProcessor(service, max_concurrent_per_env=2, fetch_workers=8)
+
+    threads = [threading.Thread(target=processor.fetch_issues_from_envs, args=(["e1"], "project", "P"))
+               for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert active["max"] == 2
@@ -0,0 +1,87 @@
+import email.utils
+import threading
+import time
+from unittest.mock import Mock
+import pytest
+from requests.exceptions import HTTPError
+from integration.external_clients.jira_service import JiraService
+from integration.external_clients.rate_limiter import AdaptiveRateLimiter, RateLimiterRegistry, parse_retry_after
+
+def throttled_error(retry_after="0"):
+    response = Mock(status_code=429, headers={"Retry-After": retry_after})
+    return HTTPError("Too Many Requests", response=response)
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    in_ten = email.utils.formatdate(time.time() + 10, usegmt=True)
+    assert 8 <= parse_retry_after(in_ten) <= 10
+
+def test_aimd_grows_on_fast_calls_and_backs_off_once_per_cooldown():
+    limiter = AdaptiveRateLimiter("jira", rate=10, concurrency=4, max_rate=50, max_concurrency=16,
+                                  decrease_cooldown=60, default_retry_after=0)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(0.01)
+    grown = limiter.get_metrics()
+    assert grown["rate"] > 10 and grown["concurrency_limit"] > 4
+
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(0.01, throttled=True, failed=True)
+    backed_off = limiter.get_metrics()
+    assert backed_off["rate"] == pytest.approx(grown["rate"] / 2, rel=0.01)
+    assert backed_off["throttled"] == 3
+
+def test_concurrency_limit_is_shared_by_all_threads():
+    limiter = AdaptiveRateLimiter("jira", rate=1000, max_rate=1000, concurrency=2, max_concurrency=2)
+    in_flight = []
+    lock = threading.Lock()
+    current = [0]
+
+    def call():
+        limiter.acquire()
+        with lock:
+            current[0] += 1
+            in_flight.append(current[0])
+        time.sleep(0.02)
+        with lock:
+            current[0] -= 1
+        limiter.release(0.02)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(in_flight) == 2
+
+def test_retry_after_pauses_the_endpoint():
+    limiter = AdaptiveRateLimiter("jira", rate=1000, max_rate=1000)
+    limiter.acquire()
+    limiter.release(0.01, throttled=True, retry_after=0.2, failed=True)
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.18
+    limiter.release(0.01)
+
+def test_registry_shares_limiter_per_host_with_overrides():
+    registry = RateLimiterRegistry(overrides={"https://env1.jira.com": {"max_rate": 5}}, rate=10)
+    assert registry.get("https://env1.jira.com/") is registry.get("env1.jira.com")
+    assert registry.get("env1.jira.com").max_rate == 5
+    assert registry.get("env2.jira.com").max_rate == 50
+
+def test_jira_service_retries_throttled_call_through_limiter():
+    registry = RateLimiterRegistry(rate=100, max_rate=100)
+    service = JiraService("https://jira.example.com", "u", "p", rate_limiters=registry, throttle_retries=2)
+    func = Mock(side_effect=[throttled_error(), throttled_error(), {"ok": True}])
+
+    assert service._call(func) == {"ok": True}
+    metrics = registry.get_metrics()["jira.example.com"]
+    assert metrics["throttled"] == 2 and metrics["calls"] == 3 and metrics["in_flight"] == 0
+
+    func = Mock(side_effect=throttled_error())
+    with pytest.raises(HTTPError):
+        service._call(func)
+    assert func.call_count == 3
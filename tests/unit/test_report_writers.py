@@ -0,0 +1,100 @@
+import csv
+import os
+import tempfile
+import pytest
+from openpyxl import load_workbook
+from domain.services.report_writers import ExcelReportWriter, FieldMapping, create_report_writer
+
+def issue(key, parent=None, env="env1"):
+    return {"key": key, "jira_environment": env, "fields": {
+        "summary": f"Summary {key}", "status": {"name": "Open"}, "issuetype": {"name": "Task"},
+        "parent": {"key": parent} if parent else None}}
+
+def test_streams_root_and_child_sheets(tmp_path):
+    path = str(tmp_path / "P.xlsx")
+    writer = ExcelReportWriter(str(tmp_path / "P"))
+    # Pages from a generator are written as they arrive
+    assert writer.write_issues(issue(f"P-{i}", parent="P-0" if i else None) for i in range(3)) == 3
+    writer.write_issues([issue("P-9", env="env2")])
+    assert writer.close() == [path]
+    assert not os.path.exists(path + ".part")
+
+    wb = load_workbook(path, read_only=True)
+    assert wb.sheetnames == ["Root Issues", "Child Issues"]
+    assert list(wb["Root Issues"].values) == [
+        ("Key", "Summary", "Status", "Type", "Environment"),
+        ("P-0", "Summary P-0", "Open", "Task", "env1"),
+        ("P-9", "Summary P-9", "Open", "Task", "env2"),
+    ]
+    children = list(wb["Child Issues"].values)
+    assert children[0] == ("Key", "Parent Key", "Summary", "Status", "Type", "Environment")
+    assert [r[:2] for r in children[1:]] == [("P-1", "P-0"), ("P-2", "P-0")]
+    assert (writer.root_count, writer.child_count) == (2, 2)
+
+def test_empty_report_and_discard(tmp_path):
+    empty = str(tmp_path / "E.xlsx")
+    ExcelReportWriter(str(tmp_path / "E")).close()
+    assert load_workbook(empty, read_only=True).sheetnames == ["Root Issues"]
+
+    writer = ExcelReportWriter(str(tmp_path / "D"))
+    writer.write_issues([issue("D-1")])
+    writer.discard()
+    assert list(tmp_path.iterdir()) == [tmp_path / "E.xlsx"]
+
+def test_csv_writes_one_file_per_sheet(tmp_path):
+    writer = create_report_writer("csv", str(tmp_path / "P"))
+    writer.write_issues([issue("P-0"), issue("P-1", parent="P-0")])
+    root_path, child_path = writer.close()
+    assert (root_path, child_path) == (str(tmp_path / "P_root.csv"), str(tmp_path / "P_child.csv"))
+    with open(child_path, newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [
+            ["Key", "Parent Key", "Summary", "Status", "Type", "Environment"],
+            ["P-1", "P-0", "Summary P-1", "Open", "Task", "env1"],
+        ]
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_columnar_formats_batch_rows(tmp_path, output_format):
+    pa = pytest.importorskip("pyarrow")
+    writer = create_report_writer(output_format, str(tmp_path / "P"))
+    writer.batch_size = 2
+    writer.write_issues(issue(f"P-{i}", parent="P-0" if i else None) for i in range(5))
+    root_path, child_path = writer.close()
+    assert child_path == str(tmp_path / f"P_child.{output_format}")
+
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(child_path)
+        assert pq.ParquetFile(child_path).metadata.row_group(0).column(0).compression == "ZSTD"
+    else:
+        table = pa.ipc.open_file(child_path).read_all()
+    assert table.column_names == ["Key", "Parent Key", "Summary", "Status", "Type", "Environment"]
+    assert table.column("Key").to_pylist() == ["P-1", "P-2", "P-3", "P-4"]
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".part")]
+
+def test_unknown_format_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        create_report_writer("pdf", str(tmp_path / "P"))
+
+def test_field_mapping_nested_custom_fields_and_split():
+    mapping = FieldMapping({"Key": "key", "Severity": "fields.customfield_1.value",
+                            "Component": "fields.components.0.name", "Labels": "fields.labels"})
+    root = issue("P-0")
+    root["fields"].update(customfield_1={"value": "High"}, components=[{"name": "api"}], labels=["a", "b"])
+    child = issue("P-1", parent="P-0")  # custom fields missing
+
+    root_rows, child_rows = mapping.split([root, child])
+    assert root_rows == [("P-0", "High", "api", '["a", "b"]')]
+    assert child_rows == [("P-1", "P-0", None, None, None)]
+    assert mapping.sheet_columns("Child Issues") == ["Key", "Parent Key", "Severity", "Component", "Labels"]
+
+def test_discard_removes_excel_temp_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "sys_tmp"))
+    os.makedirs(tempfile.tempdir)
+    os.makedirs(tmp_path / "reports")
+    writer = ExcelReportWriter(str(tmp_path / "reports" / "D"))
+    writer.write_issues([issue("D-1"), issue("D-2", parent="D-1")])
+    assert os.listdir(tempfile.tempdir)  # openpyxl's per-sheet row files
+
+    writer.discard()
+    assert os.listdir(tempfile.tempdir) == []
+    assert os.listdir(tmp_path / "reports") == []
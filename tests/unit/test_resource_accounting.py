@@ -0,0 +1,72 @@
+import concurrent.futures
+import contextvars
+import sys
+import types
+import requests
+from unittest.mock import Mock
+from application.use_cases.executor import TaskExecutor
+from application.use_cases.handler_registry import HandlerRegistry, HandlerSpec
+from infrastructure.monitoring.resource_accounting import (
+    ResourceAccountant, install_session_hooks, record_external_call
+)
+
+def make_response(body=b"{}", request_body=b"abc"):
+    response = requests.Response()
+    response._content = body
+    response.request = Mock(body=request_body)
+    return response
+
+def test_counts_calls_and_bytes_including_sub_threads():
+    session = requests.Session()
+    install_session_hooks(session)
+    install_session_hooks(session)
+    assert len(session.hooks["response"]) == 1
+    hook = session.hooks["response"][0]
+
+    scope = ResourceAccountant().start()
+    record_external_call()
+    hook(make_response(b"x" * 100))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        pool.submit(contextvars.copy_context().run, record_external_call).result()
+        pool.submit(record_external_call).result()  # no context: not accounted
+    usage = scope.stop()
+
+    assert usage["external_calls"] == 2
+    assert (usage["http_requests"], usage["bytes_sent"], usage["bytes_received"]) == (1, 3, 100)
+    assert usage["wall_time"] >= 0 and usage["cpu_time"] >= 0
+    assert usage["memory_sampled"] is False
+
+    record_external_call()  # outside any task: ignored
+    assert scope.usage.external_calls == 2
+
+def test_memory_is_traced_only_for_sampled_tasks():
+    accountant = ResourceAccountant(memory_sample_rate=0.5, rng=Mock(side_effect=[0.1, 0.9]))
+
+    sampled = accountant.start()
+    blob = [bytearray(1024) for _ in range(100)]
+    sampled_usage = sampled.stop()
+    unsampled_usage = accountant.start().stop()
+
+    assert sampled_usage["memory_sampled"] and sampled_usage["peak_memory_bytes"] >= 100 * 1024
+    assert not unsampled_usage["memory_sampled"]
+    assert ResourceAccountant(enabled=False).start() is None
+    del blob
+
+def test_execution_details_include_resources(monkeypatch):
+    handler_result = {"success": True}
+    def handle(executor, task):
+        record_external_call()
+        return handler_result
+    monkeypatch.setitem(sys.modules, "fake_accounted_handlers", types.SimpleNamespace(handle=handle))
+
+    task = Mock(id="t1", tags=["FAKE"], parameters={})
+    task_repo = Mock()
+    task_repo.get_by_id.return_value = task
+    result_repo = Mock()
+    registry = HandlerRegistry([HandlerSpec(tag="FAKE", target="fake_accounted_handlers:handle")])
+    executor = TaskExecutor(task_repo, result_repo, Mock(), handler_registry=registry)
+
+    assert executor.execute_task("t1") is handler_result
+    details = result_repo.add.call_args[0][0]["execution_details"]
+    assert details["resources"]["external_calls"] == 1
+    assert "resources" not in handler_result
@@ -0,0 +1,109 @@
+import threading
+import pytest
+from unittest.mock import Mock
+from application.use_cases.executor import TaskExecutor
+from application.use_cases.result_cache import ResultCache, HIT, MISS, SHARED, estimate_size
+from domain.entities.models import TaskScheduleType
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_key_ignores_order_and_excluded_params():
+    a = ResultCache.make_key("T", {"key_value": "P", "jira_envs": ["e1"], "user": "alice"}, ("user",))
+    b = ResultCache.make_key("T", {"user": "bob", "jira_envs": ["e1"], "key_value": "P"}, ("user",))
+    c = ResultCache.make_key("T", {"key_value": "Q", "jira_envs": ["e1"]}, ("user",))
+    assert a == b
+    assert a != c
+
+def test_ttl_expiry_and_failures_not_cached():
+    clock = FakeClock()
+    cache = ResultCache(ttl_seconds=10, clock=clock)
+    compute = Mock(return_value={"success": True})
+
+    assert cache.get_or_compute("k", compute)[1] == MISS
+    clock.now = 5
+    result, status, age = cache.get_or_compute("k", compute)
+    assert (status, age) == (HIT, 5)
+    clock.now = 16
+    assert cache.get_or_compute("k", compute)[1] == MISS
+    assert compute.call_count == 2
+
+    failing = Mock(return_value={"success": False})
+    cache.get_or_compute("bad", failing)
+    cache.get_or_compute("bad", failing)
+    assert failing.call_count == 2
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.get_or_compute(key, lambda: {"success": True})
+    cache.get_or_compute("a", lambda: {"success": True})  # a becomes most recently used
+    cache.get_or_compute("c", lambda: {"success": True})  # evicts b
+    assert cache.get_or_compute("a", lambda: {"success": True})[1] == HIT
+    assert cache.get_or_compute("b", lambda: {"success": True})[1] == MISS
+    assert cache.get_stats()["evictions"] == 2
+
+def test_size_bound_evicts_lru_and_skips_oversized_results():
+    blob = {"success": True, "rows": "x" * 400}
+    size = estimate_size(blob)
+    cache = ResultCache(max_bytes=2 * size + 10)
+    for key in ("a", "b", "c"):
+        cache.get_or_compute(key, lambda: dict(blob))
+    assert cache.get_or_compute("a", lambda: dict(blob))[1] == MISS  # evicted by size, not count
+    assert cache.get_stats()["bytes"] <= cache.max_bytes
+
+    cache.get_or_compute("huge", lambda: {"success": True, "rows": "x" * 5000})
+    assert cache.get_or_compute("huge", lambda: {"success": True})[1] == MISS
+
+def test_single_flight_shares_concurrent_run():
+    cache = ResultCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"success": True}
+
+    statuses = []
+    leader = threading.Thread(target=lambda: statuses.append(cache.get_or_compute("k", slow)[1]))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: statuses.append(cache.get_or_compute("k", slow)[1]))
+    follower.start()
+    while cache.get_stats()["shared"] == 0:
+        pass
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert sorted(statuses) == [MISS, SHARED]
+
+def test_jira_export_reused_across_users_with_permission_check():
+    processor = Mock()
+    processor.check_user_permission.side_effect = lambda key_type, key_value, user, jira_envs=None: user != "mallory"
+    processor.export_issues.return_value = {"success": True, "excel_path": "r.xlsx", "issue_count": 3}
+    di_container = Mock()
+    di_container.get_jira_data_processor.return_value = processor
+    task_repo = Mock()
+    executor = TaskExecutor(task_repo, Mock(), di_container)
+
+    def run(user):
+        task = Mock(id=user, tags=["JIRA_TASK_EXP"], task_type=TaskScheduleType.SCHEDULED,
+                    parameters={"jira_envs": ["e1"], "key_type": "project", "key_value": "P", "user": user})
+        task_repo.get_by_id.return_value = task
+        return executor.execute_task(task.id)
+
+    first, second, denied = run("alice"), run("bob"), run("mallory")
+
+    assert processor.export_issues.call_count == 1
+    assert "cache" not in first
+    assert second["cache"]["status"] == HIT
+    assert second["excel_path"] == "r.xlsx"
+    assert denied["success"] is False
+    assert processor.check_user_permission.call_count == 3
@@ -0,0 +1,62 @@
+import threading
+import time
+from unittest.mock import Mock
+from application.services.result_outbox import ResultOutbox
+from domain.services.result_reporter import ResultReporter
+
+def make_task(i):
+    return Mock(id=f"t{i}", tags=[])
+
+def test_results_are_batched_into_one_message():
+    mattermost = Mock()
+    outbox = ResultOutbox(ResultReporter(mattermost), batch_size=10, batch_wait=0.5)
+    for i in range(3):
+        outbox.submit(make_task(i), {"execution_details": {"success": True}})
+    outbox.shutdown()
+
+    mattermost.send_custom_message.assert_called_once()
+    message = mattermost.send_custom_message.call_args[0][0]
+    assert all(f"Task t{i} finished" in message for i in range(3))
+    stats = outbox.get_stats()
+    assert (stats["delivered"], stats["batches"], stats["queued"]) == (3, 1, 0)
+
+def test_submit_does_not_wait_for_delivery():
+    release = threading.Event()
+    reporter = Mock(handle_task_results=Mock(side_effect=lambda batch: release.wait(5)))
+    outbox = ResultOutbox(reporter, batch_wait=0)
+
+    started = time.perf_counter()
+    outbox.submit(make_task(0), {})
+    assert time.perf_counter() - started < 0.1
+
+    release.set()
+    outbox.shutdown()
+    assert outbox.get_stats()["delivered"] == 1
+
+def test_failed_batches_are_retried_then_given_up():
+    reporter = Mock(handle_task_results=Mock(side_effect=[RuntimeError("down"), None]))
+    outbox = ResultOutbox(reporter, batch_wait=0, retry_backoff=0.01)
+    outbox.submit(make_task(0), {})
+    outbox.shutdown()
+    assert outbox.get_stats()["retries"] == 1
+    assert outbox.get_stats()["delivered"] == 1
+
+    always_down = Mock(handle_task_results=Mock(side_effect=RuntimeError("down")))
+    outbox = ResultOutbox(always_down, batch_wait=0, max_attempts=2, retry_backoff=0.01)
+    outbox.submit(make_task(1), {})
+    outbox.shutdown()
+    assert always_down.handle_task_results.call_count == 2
+    assert outbox.get_stats()["failed"] == 1
+
+def test_full_outbox_drops_and_counts():
+    release = threading.Event()
+    reporter = Mock(handle_task_results=Mock(side_effect=lambda batch: release.wait(5)))
+    outbox = ResultOutbox(reporter, batch_size=1, batch_wait=0, max_queue=1)
+    outbox.submit(make_task(0), {})
+    while outbox.pending_count():
+        time.sleep(0.01)  # the worker took the first result and is blocked delivering it
+    assert outbox.submit(make_task(1), {})
+    assert not outbox.submit(make_task(2), {})
+    release.set()
+    outbox.shutdown()
+    assert outbox.get_stats()["dropped"] == 1
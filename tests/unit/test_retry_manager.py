@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import Mock
+from application.schedulers.managers.retry_manager import RetryManager, RetryBudget
+from domain.entities.models import Task, TaskScheduleType, TaskStatus, RetryPolicy
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def retry_manager(clock):
+    budget = RetryBudget(ratio=0.5, min_retries_per_window=2, window_seconds=60, clock=clock)
+    return RetryManager(Mock(), max_delay=100, budget=budget, clock=clock)
+
+def make_task(**policy):
+    return Task(name="retry", task_type=TaskScheduleType.IMMEDIATE, retry_policy=RetryPolicy(**policy))
+
+def test_retry_delay_is_exponential():
+    task = make_task(retry_delay=10, backoff_factor=2.0)
+    delays = []
+    for _ in range(3):
+        task.increment_retry_counter()
+        delays.append(task.get_retry_delay())
+    assert delays == [10, 20, 40]
+
+def test_jittered_delay_is_capped(retry_manager):
+    task = make_task(retry_delay=60, backoff_factor=10.0, current_retries=5)
+    for _ in range(50):
+        assert 0 <= retry_manager.compute_delay(task) <= retry_manager.max_delay
+
+def test_process_retries_fires_only_due_entries(retry_manager, clock):
+    fired = []
+    task = make_task(retry_delay=10)
+    assert retry_manager.schedule_retry(task, fired.append)
+    retry_manager.task_repository.update_task_status.assert_called_with(task.id, TaskStatus.RETRY)
+
+    clock.now += 11
+    assert retry_manager.process_retries() == 1
+    assert fired == [task.id]
+    assert retry_manager.process_retries() == 0
+
+def test_cleanup_retry_cancels_pending_entry(retry_manager, clock):
+    fired = []
+    task = make_task(retry_delay=10)
+    retry_manager.schedule_retry(task, fired.append)
+    retry_manager.cleanup_retry(task.id)
+    clock.now += 11
+    assert retry_manager.process_retries() == 0
+    assert fired == []
+
+def test_retry_budget_caps_retries_to_dispatch_rate(retry_manager):
+    for _ in range(10):
+        retry_manager.record_dispatch()
+    # allowance = max(2, 0.5 * 10) = 5
+    results = [retry_manager.schedule_retry(make_task(), lambda _: None) for _ in range(7)]
+    assert results.count(True) == 5
+    assert retry_manager.get_stats()["budget"]["rejected_total"] == 2
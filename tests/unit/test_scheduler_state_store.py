@@ -0,0 +1,77 @@
+import time
+import pytest
+from unittest.mock import Mock
+from application.schedulers.scheduler_service import SchedulerService
+from domain.entities.models import TaskStatus, TaskScheduleType, TaskPriority
+from infrastructure.persistence.scheduler_state_store import SchedulerStateStore
+from infrastructure.persistence.persistence import TaskPersistenceManager
+from infrastructure.repositories.task_repository import TaskRepository
+
+@pytest.fixture
+def store(tmp_path):
+    store = SchedulerStateStore(db_path=str(tmp_path / "state.db"))
+    yield store
+    store.close()
+
+def make_service(task_repo, store):
+    return SchedulerService(
+        task_repository=task_repo,
+        task_executor=Mock(),
+        task_result_repo=Mock(),
+        confluence_updater=Mock(),
+        state_store=store
+    )
+
+def test_buffered_writes_are_coalesced_on_flush(store):
+    store.save_queued("a", TaskPriority.HIGH)
+    store.delete_queued("a")
+    store.save_queued("b", TaskPriority.LOW)
+    store.save_schedule("c", "0 0 * * *", TaskPriority.MEDIUM, 12)
+    store.save_retry("d", 123.0, "retry")
+    assert store.flush() == 4
+
+    state = store.load_state()
+    assert state["queued"] == [{"task_id": "b", "priority": "LOW"}]
+    assert state["scheduled"] == [{"task_id": "c", "cron_expr": "0 0 * * *", "priority": "MEDIUM", "offset": 12}]
+    assert state["retries"] == [{"task_id": "d", "due_ts": 123.0, "kind": "retry"}]
+
+def test_restart_restores_schedules_retries_and_queue(store):
+    task_repo = TaskRepository()
+    scheduled = task_repo.add_from_dict({"name": "s", "task_type": TaskScheduleType.SCHEDULED, "cron_expr": "0 0 * * *"})
+    queued = task_repo.add_from_dict({"name": "q", "task_type": TaskScheduleType.IMMEDIATE, "priority": TaskPriority.HIGH})
+    retried = task_repo.add_from_dict({"name": "r", "task_type": TaskScheduleType.IMMEDIATE})
+    unflushed = task_repo.add_from_dict({"name": "u", "task_type": TaskScheduleType.IMMEDIATE})
+
+    first = make_service(task_repo, store)
+    first.scheduled_task_manager.schedule_task(scheduled.id, scheduled.cron_expr, scheduled.priority)
+    first.task_queue_manager.add_task(queued.id, queued.priority)
+    task_repo.update_task_status(queued.id, TaskStatus.QUEUED)
+    first.retry_manager.restore(retried.id, time.time() + 60, first._retry_task, "retry")
+    for status in (TaskStatus.QUEUED, TaskStatus.RUNNING, TaskStatus.FAILED, TaskStatus.RETRY):
+        task_repo.update_task_status(retried.id, status)
+    store.flush()
+    # Status changed after the last flush: reconciliation must pick it up
+    task_repo.update_task_status(unflushed.id, TaskStatus.QUEUED)
+
+    second = make_service(task_repo, store)
+    second.restore_state()
+    assert second.scheduled_task_manager.is_scheduled(scheduled.id)
+    assert second.retry_manager.is_pending(retried.id)
+    restored_queue = [task_id for _, task_id in second.task_queue_manager.get_next_tasks(10)]
+    assert restored_queue == [queued.id, unflushed.id]
+
+def test_finished_recurring_task_is_recovered_once(tmp_path):
+    persistence = TaskPersistenceManager(storage_path=str(tmp_path))
+    task_repo = TaskRepository(persistence_manager=persistence)
+    task = task_repo.add_from_dict({"name": "s", "task_type": TaskScheduleType.SCHEDULED, "cron_expr": "0 0 * * *"})
+    for status in (TaskStatus.SCHEDULED, TaskStatus.QUEUED, TaskStatus.RUNNING, TaskStatus.DONE):
+        task_repo.update_task_status(task.id, status)
+    task_repo.persist_tasks()
+
+    for _ in range(2):
+        task_repo = TaskRepository(persistence_manager=persistence)
+        task_repo.persist_tasks()
+
+    assert [t.id for t in task_repo.get_all()] == [task.id]
+    # One active copy plus the single history entry recorded when it finished
+    assert len(persistence.load_tasks_snapshot()) == 2
@@ -0,0 +1,133 @@
+import sys
+import types
+import pytest
+from unittest.mock import Mock
+from application.schedulers.scheduler_service import SchedulerService
+from application.use_cases.executor import TaskExecutor
+from application.use_cases.handler_registry import HandlerRegistry, HandlerSpec
+from domain.entities.models import Task, TaskStatus, TaskScheduleType, RetryPolicy
+from domain.exceptions import IntegrationException, InvalidStatusTransition
+from infrastructure.repositories.task_repository import TaskRepository
+
+def make_task(**kwargs):
+    return Task(name="t", task_type=TaskScheduleType.IMMEDIATE, **kwargs)
+
+def test_valid_and_invalid_transitions():
+    task = make_task()
+    assert task.update_status(TaskStatus.QUEUED)
+    assert task.update_status(TaskStatus.RUNNING)
+    assert task.update_status(TaskStatus.DONE)
+    with pytest.raises(InvalidStatusTransition):
+        task.update_status(TaskStatus.RUNNING)
+    assert task.status == TaskStatus.DONE
+
+def test_same_status_is_a_noop_without_write():
+    task_repo = TaskRepository()
+    task = task_repo.add_from_dict({"name": "t", "task_type": TaskScheduleType.IMMEDIATE})
+    task_repo.update_task_status(task.id, TaskStatus.QUEUED)
+    version = task.version
+
+    task_repo.update_task_status(task.id, TaskStatus.QUEUED)
+
+    assert task.version == version
+    assert task_repo.get_lifecycle_writes(task.id) == 2
+    assert task_repo.get_write_stats()["noop_transitions"] == 1
+
+def test_lifecycle_write_count():
+    task_repo = TaskRepository()
+    task = task_repo.add_from_dict({"name": "t", "task_type": TaskScheduleType.IMMEDIATE})
+    for status in (TaskStatus.QUEUED, TaskStatus.RUNNING, TaskStatus.RUNNING, TaskStatus.DONE):
+        task_repo.update_task_status(task.id, status)
+
+    stats = task_repo.get_write_stats()
+    assert stats["completed_lifecycles"] == 1
+    assert stats["avg_writes_per_lifecycle"] == 4
+    assert task_repo.get_lifecycle_writes(task.id) == 0
+
+def test_retry_requeue_is_a_single_write():
+    task_repo = TaskRepository()
+    task = task_repo.add_from_dict({"name": "t", "task_type": TaskScheduleType.IMMEDIATE,
+                                    "retry_policy": RetryPolicy()})
+    for status in (TaskStatus.QUEUED, TaskStatus.RUNNING, TaskStatus.FAILED, TaskStatus.RETRY):
+        task_repo.update_task_status(task.id, status)
+    service = SchedulerService(task_repository=task_repo, task_executor=Mock(),
+                               task_result_repo=Mock(), confluence_updater=Mock())
+    writes = task_repo.get_write_stats()["writes"]
+
+    service._retry_task(task.id)
+
+    assert task.status == TaskStatus.QUEUED
+    assert task_repo.get_write_stats()["writes"] == writes + 1
+    assert not service.task_queue_manager.is_queue_empty()
+
+def make_scheduler_with_handler(handle, monkeypatch):
+    monkeypatch.setitem(sys.modules, "fake_slow_handlers", types.SimpleNamespace(handle=handle))
+    task_repo = TaskRepository()
+    registry = HandlerRegistry([HandlerSpec(tag="SLOW", target="fake_slow_handlers:handle")])
+    executor = TaskExecutor(task_repo, Mock(), Mock(), handler_registry=registry)
+    service = SchedulerService(task_repository=task_repo, task_executor=executor,
+                               task_result_repo=Mock(), confluence_updater=Mock())
+    task = task_repo.add_from_dict({"name": "t", "task_type": TaskScheduleType.IMMEDIATE, "tags": ["SLOW"],
+                                    "timeout_seconds": 1, "retry_policy": RetryPolicy()})
+    task_repo.update_task_status(task.id, TaskStatus.QUEUED)
+    service.futures[task.id] = Mock()
+    return service, executor, task
+
+def test_late_completion_after_timeout_is_ignored(monkeypatch):
+    def handle(executor, task):
+        service._handle_task_timeout(task.id)  # the timer fires while the handler still runs
+        assert not executor.finish_task(task.id, TaskStatus.DONE)
+        return {"success": True}
+    service, executor, task = make_scheduler_with_handler(handle, monkeypatch)
+
+    service._execute_and_track(task.id)
+
+    assert task.status == TaskStatus.RETRY
+    assert task.retry_policy.current_retries == 1
+
+def test_timeout_after_completion_is_ignored(monkeypatch):
+    def handle(executor, task):
+        assert executor.finish_task(task.id, TaskStatus.DONE)
+        return {"success": True}
+    service, executor, task = make_scheduler_with_handler(handle, monkeypatch)
+    executor.execute_task(task.id)
+
+    service._handle_task_timeout(task.id)
+
+    assert task.status == TaskStatus.DONE
+    assert task.retry_policy.current_retries == 0
+
+def test_handler_exception_schedules_retry(monkeypatch):
+    def handle(executor, task):
+        raise RuntimeError("Jira unavailable")
+    service, executor, task = make_scheduler_with_handler(handle, monkeypatch)
+    result_repo = executor.task_result_repo
+
+    with pytest.raises(RuntimeError):
+        service._execute_and_track(task.id)
+
+    assert task.status == TaskStatus.RETRY
+    assert task.retry_policy.current_retries == 1
+    assert result_repo.add.call_args[0][0]["execution_details"]["error"] == "Jira unavailable"
+
+def test_failed_jira_export_is_retried_not_done():
+    processor = Mock()
+    processor.check_user_permission.return_value = True
+    processor.export_issues.return_value = {"success": False, "error": "所有JIRA环境获取失败或超时",
+                                            "timed_out_envs": [], "failed_envs": ["e1"]}
+    di_container = Mock()
+    di_container.get_jira_data_processor.return_value = processor
+    task_repo = TaskRepository()
+    executor = TaskExecutor(task_repo, Mock(), di_container)
+    service = SchedulerService(task_repository=task_repo, task_executor=executor,
+                               task_result_repo=Mock(), confluence_updater=Mock())
+    task = task_repo.add_from_dict({"name": "t", "task_type": TaskScheduleType.IMMEDIATE, "tags": ["JIRA_TASK_EXP"],
+                                    "parameters": {"jira_envs": ["e1"], "key_type": "project", "key_value": "P"},
+                                    "retry_policy": RetryPolicy()})
+    task_repo.update_task_status(task.id, TaskStatus.QUEUED)
+
+    with pytest.raises(IntegrationException):
+        service._execute_and_track(task.id)
+
+    assert task.status == TaskStatus.RETRY
+    assert executor.result_cache.get_stats()["entries"] == 0